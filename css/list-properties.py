@@ -1,22 +1,38 @@
 #!/usr/bin/env python3
 import argparse
+import csv
+import hashlib
+import json
 import os
-import re
 import sys
+import time
 from collections import Counter, defaultdict
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.css_colors import DEFAULT_DELTA_E, cluster_colors, format_color, normalize_color_counts
+from utils.css_duplicates import DuplicateDetector
+from utils.file_cache import FileResultCache
+from utils.file_scanner import DEFAULT_SKIP_DIRS, scan_files
 from utils.output_helpers import get_output_base_dir
+from utils.scss_symbols import SymbolIndex, extract_symbols, parse_map
+from utils.scss_tokenizer import tokenize_scss_file
 
-# Match a CSS/SCSS property name at the start of a line:
-# e.g. "color: red;" -> "color"
-PROPERTY_RE = re.compile(r'^\s*([-\w]+)\s*:')
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # inotify_simple is optional (Linux only)
+    INotify = None
 
 # File extensions to scan
 CSS_EXTENSIONS = {'.scss', '.css'}
 
+# Folders never scanned (dependencies such as node_modules, build output, VCS)
+SKIP_DIRS = DEFAULT_SKIP_DIRS
+
+# Bump when scan_file() output changes so stale per-file caches are discarded
+SCAN_CACHE_VERSION = 3
+
 
 # Family patterns: if a property == pattern OR starts with pattern + "-"
 # it will be classified under that family.
@@ -129,100 +145,374 @@ def is_css_file(filename):
     return ext.lower() in CSS_EXTENSIONS
 
 
-def extract_property_and_value(line):
+def build_family_index(family_patterns):
     """
-    Try to extract a CSS/SCSS property name and value from a single line.
-    Returns (prop, value) or (None, None) if not a declaration.
+    Precompute an exact-match lookup table from FAMILY_PATTERNS.
+
+    Maps every pattern to the position of the first family that lists it, so
+    the "first family wins" order of FAMILY_PATTERNS is preserved.
+    Returns (pattern -> family index, list of family names).
     """
-    stripped = line.strip()
-
-    # Skip obvious non-declaration lines
-    if not stripped:
-        return None, None
-    if stripped.startswith(("//", "/*", "*")):
-        return None, None  # comments
-    if stripped.startswith("@"):
-        return None, None  # @mixin, @include, @media, etc.
-    if stripped.startswith("$"):
-        return None, None  # SCSS variable definitions
-    if stripped.startswith("#{"):
-        return None, None  # SCSS interpolation edge cases in selectors
-
-    m = PROPERTY_RE.match(stripped)
-    if not m:
-        return None, None
-
-    prop = m.group(1)
-
-    # Filter out some obvious false positives (very basic)
-    if "(" in stripped.split(":", 1)[0]:
-        return None, None
-
-    # Extract value (everything after first ":" up to ";" if present)
-    rest = stripped[m.end():].lstrip()
-    if ";" in rest:
-        value = rest.split(";", 1)[0].strip()
-    else:
-        value = rest.strip()
+    families = list(family_patterns)
+    index = {}
+    for position, family in enumerate(families):
+        for pattern in family_patterns[family]:
+            index.setdefault(pattern, position)
+    return index, families
 
-    return prop, value
+
+FAMILY_INDEX, FAMILY_ORDER = build_family_index(FAMILY_PATTERNS)
+
+# Memoized family per observed property name (filled lazily by classify_family)
+_family_cache = {}
 
 
 def classify_family(prop):
     """
     Classify a property into a family based on FAMILY_PATTERNS.
     If none match, returns "other".
+
+    A property matches a pattern when it is equal to it or starts with
+    pattern + "-", so the candidate patterns are the property itself and each
+    of its "-"-delimited prefixes. Those are looked up in FAMILY_INDEX and the
+    earliest family wins; the result is cached per property name.
+    """
+    family = _family_cache.get(prop)
+    if family is not None:
+        return family
+
+    best = FAMILY_INDEX.get(prop)
+    dash = prop.find("-")
+    while dash != -1:
+        position = FAMILY_INDEX.get(prop[:dash])
+        if position is not None and (best is None or position < best):
+            best = position
+        dash = prop.find("-", dash + 1)
+
+    family = FAMILY_ORDER[best] if best is not None else "other"
+    _family_cache[prop] = family
+    return family
+
+
+def is_property_declaration(decl):
     """
-    for family, patterns in FAMILY_PATTERNS.items():
-        for pattern in patterns:
-            if prop == pattern or prop.startswith(pattern + "-"):
-                return family
-    return "other"
+    True for real CSS property declarations, False for SCSS variable
+    definitions, at-rule statements (@include, @use, ...) and property names
+    built with #{} interpolation.
+    """
+    return decl.prop[0] not in "$@" and "#{" not in decl.prop
 
 
-def scan_folder(root):
+def scan_file(full_path, on_declaration=None):
+    """
+    Parse one stylesheet and count its declarations.
+    If `on_declaration` is given it is called with every property
+    declaration record, in source order.
+    Returns a JSON-serializable dict:
+      - "props": property -> number of declarations
+      - "values": property -> value -> count (non-empty values only)
+      - "symbols": SCSS symbol table (see utils/scss_symbols.py)
+    """
+    props = Counter()
+    values = defaultdict(Counter)
+    records = list(tokenize_scss_file(full_path))
+    for decl in records:
+        if is_property_declaration(decl):
+            props[decl.prop] += 1
+            if decl.value:
+                values[decl.prop][decl.value] += 1
+            if on_declaration is not None:
+                on_declaration(decl)
+    return {
+        "props": dict(props),
+        "values": {p: dict(v) for p, v in values.items()},
+        "symbols": extract_symbols(records),
+    }
+
+
+class UsageTotals:
+    """
+    Aggregated property/value counts over every scanned file.
+
+    Files can be added and removed again, so a re-run only has to apply the
+    contributions of files that changed since the previous run.
+    """
+
+    def __init__(self):
+        self.props = Counter()
+        self.values = defaultdict(Counter)
+
+    def add_file(self, entry, sign=1):
+        """Add (or, with sign=-1, subtract) one file entry from scan_file()."""
+        for prop, count in entry["props"].items():
+            _bump(self.props, prop, sign * count)
+        for prop, value_counts in entry["values"].items():
+            counter = self.values[prop]
+            for value, count in value_counts.items():
+                _bump(counter, value, sign * count)
+            if not counter:
+                del self.values[prop]
+
+    def remove_file(self, entry):
+        """Subtract the contribution of a file entry."""
+        self.add_file(entry, sign=-1)
+
+    def to_dict(self):
+        return {"props": dict(self.props), "values": {p: dict(v) for p, v in self.values.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        totals = cls()
+        totals.props.update(data["props"])
+        for prop, value_counts in data["values"].items():
+            totals.values[prop].update(value_counts)
+        return totals
+
+    def family_counters(self):
+        """Return dict[family] -> Counter of properties in that family."""
+        family_counters = defaultdict(Counter)
+        for prop, count in self.props.items():
+            family_counters[classify_family(prop)][prop] = count
+        return family_counters
+
+    def family_value_counters(self):
+        """Return dict[family] -> dict[property] -> Counter of values."""
+        family_value_counters = defaultdict(dict)
+        for prop, value_counter in self.values.items():
+            family_value_counters[classify_family(prop)][prop] = value_counter
+        return family_value_counters
+
+    def color_counts(self, resolved=None):
+        """
+        Return a Counter of color values used by color-family properties.
+        A value only ever declared with !important is counted once.
+        If `resolved` (property -> raw value -> Counter of resolved values)
+        is given, variable references are counted as the colors they
+        resolve to.
+        """
+        color_counter = Counter()
+        important_seen = set()
+        for prop, value_counter in self.values.items():
+            if classify_family(prop) != "color":
+                continue
+            prop_resolved = resolved.get(prop, {}) if resolved else {}
+            for value, count in _expand_resolved(value_counter, prop_resolved):
+                clean_value = value.replace(" !important", "").strip()
+                if " !important" in value:
+                    if clean_value not in important_seen:
+                        color_counter[clean_value] += 1
+                        important_seen.add(clean_value)
+                else:
+                    color_counter[clean_value] += count
+        return color_counter
+
+
+def _expand_resolved(value_counter, prop_resolved):
+    """Yield (value, count) pairs, replacing raw values by their resolutions."""
+    for value, count in value_counter.items():
+        if value in prop_resolved:
+            yield from prop_resolved[value].items()
+        else:
+            yield value, count
+
+
+def _bump(counter, key, delta):
+    """Apply delta to counter[key], dropping keys that fall to zero."""
+    total = counter[key] + delta
+    if total > 0:
+        counter[key] = total
+    else:
+        del counter[key]
+
+
+class UsageExporter:
+    """
+    Streams machine-readable usage data next to the Markdown reports.
+
+    Declarations are written one record at a time while the folder is
+    scanned, so memory use does not grow with the size of the tree:
+      - declarations.{jsonl,csv}: file, line, property, value, family
+      - properties.{jsonl,csv}:   property, family, count
+      - values.{jsonl,csv}:       property, family, value, count
+    """
+
+    DECLARATION_FIELDS = ["file", "line", "property", "value", "family"]
+    PROPERTY_FIELDS = ["property", "family", "count"]
+    VALUE_FIELDS = ["property", "family", "value", "count"]
+
+    def __init__(self, out_base, formats, root):
+        """
+        Args:
+            out_base (str): Folder the export files are written to
+            formats (list): Export formats, "jsonl" and/or "csv"
+            root (str): Scanned root; record paths are relative to it
+        """
+        self.out_base = out_base
+        self.formats = formats
+        self.root = root
+        self.paths = []
+        self._writers = self._open("declarations", self.DECLARATION_FIELDS)
+
+    def _open(self, name, fields):
+        writers = []
+        for fmt in self.formats:
+            path = os.path.join(self.out_base, f"{name}.{fmt}")
+            f = open(path, "w", encoding="utf-8", newline="")
+            self.paths.append(path)
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(fields)
+                writers.append((f, writer.writerow))
+            else:
+                writers.append((f, lambda row, f=f, fields=fields: f.write(
+                    json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n"
+                )))
+        return writers
+
+    def declarations_for(self, full_path):
+        """Return an on_declaration callback for scan_file()."""
+        rel_path = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+        writers = [write for _, write in self._writers]
+
+        def write_declaration(decl):
+            row = (rel_path, decl.line, decl.prop, decl.value, classify_family(decl.prop))
+            for write in writers:
+                write(row)
+
+        return write_declaration
+
+    def write_aggregates(self, totals):
+        """Write the property and value tables and close every file."""
+        for f, _ in self._writers:
+            f.close()
+
+        writers = self._open("properties", self.PROPERTY_FIELDS)
+        for prop, count in sorted(totals.props.items(), key=lambda kv: (-kv[1], kv[0])):
+            row = (prop, classify_family(prop), count)
+            for _, write in writers:
+                write(row)
+        for f, _ in writers:
+            f.close()
+
+        writers = self._open("values", self.VALUE_FIELDS)
+        for prop in sorted(totals.values):
+            family = classify_family(prop)
+            for value, count in sorted(totals.values[prop].items(), key=lambda kv: (-kv[1], kv[0])):
+                row = (prop, family, value, count)
+                for _, write in writers:
+                    write(row)
+        for f, _ in writers:
+            f.close()
+
+
+def default_cache_path(root):
+    """Return the cache file used for a scanned root under _outputs/css/cache."""
+    root_hash = hashlib.sha1(root.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(get_output_base_dir(subdirectory="cache"), f"scan-{root_hash}.json")
+
+
+def _fan_out(callbacks):
+    """Combine per-declaration callbacks into one (or None if there are none)."""
+    callbacks = [c for c in callbacks if c is not None]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def call_all(decl):
+        for callback in callbacks:
+            callback(decl)
+
+    return call_all
+
+
+def scan_folder(root, cache=None, exporter=None, detector=None, sources=None):
     """
     Walk the folder recursively and count CSS/SCSS properties.
+    If a FileResultCache is given, files whose mtime and size are unchanged
+    reuse their cached counts; changed files are re-parsed and removed files
+    have their contributions subtracted from the cached totals.
+    If a UsageExporter is given, every file is parsed (the cache is still
+    updated) and each declaration is streamed to the export files.
+    Likewise, a DuplicateDetector is fed the declarations of every file.
+    `sources` may hold the SourceFile records of a shared walk
+    (refresh-docs.py); the folder is then not scanned again.
     Returns:
       - global Counter of all properties
       - dict[family] -> Counter of properties in that family
       - dict[family] -> dict[property] -> Counter of values
-      - Counter of colors
+      - Counter of colors (variable references counted by resolved value)
+      - SymbolIndex of SCSS variables, maps and mixins
     """
-    global_counter = Counter()
-    family_counters = defaultdict(Counter)
-    family_value_counters = defaultdict(lambda: defaultdict(Counter))
-    color_counter = Counter()
-    important_seen = set()
-
-    for dirpath, _, filenames in os.walk(root):
-        for filename in filenames:
-            if not is_css_file(filename):
+    if cache is not None and "totals" in cache.extra:
+        totals = UsageTotals.from_dict(cache.extra["totals"])
+    else:
+        totals = UsageTotals()
+        if cache is not None:
+            for _, entry in cache.results():
+                totals.add_file(entry)
+
+    seen = set()
+    parsed = 0
+    file_symbols = {}
+    if sources is None:
+        sources = scan_files(root, CSS_EXTENSIONS, SKIP_DIRS)
+    for source in sources:
+        full_path = source.path
+        try:
+            cached = None
+            if cache is not None and exporter is None and detector is None:
+                cached = cache.get(full_path, source.stat)
+            if cached is not None:
+                seen.add(full_path)
+                file_symbols[full_path] = cached["symbols"]
                 continue
+            file_decls = [] if detector is not None else None
+            on_declaration = _fan_out([
+                exporter.declarations_for(full_path) if exporter is not None else None,
+                file_decls.append if file_decls is not None else None,
+            ])
+            entry = scan_file(full_path, on_declaration)
+            if detector is not None:
+                detector.add_file(source.rel_path.replace(os.sep, "/"), file_decls)
+        except Exception as e:
+            print(f"[WARN] Failed to read {full_path}: {e}")
+            if cache is not None:
+                previous = cache.discard(full_path)
+                if previous is not None:
+                    totals.remove_file(previous)
+            continue
 
-            full_path = os.path.join(dirpath, filename)
-            try:
-                with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                    for line in f:
-                        prop, value = extract_property_and_value(line)
-                        if prop:
-                            global_counter[prop] += 1
-                            fam = classify_family(prop)
-                            family_counters[fam][prop] += 1
-                            if value:
-                                family_value_counters[fam][prop][value] += 1
-                                if fam == "color":
-                                    clean_value = value.replace(" !important", "").strip()
-                                    if " !important" in value:
-                                        if clean_value not in important_seen:
-                                            color_counter[clean_value] += 1
-                                            important_seen.add(clean_value)
-                                    else:
-                                        color_counter[clean_value] += 1
-            except Exception as e:
-                print(f"[WARN] Failed to read {full_path}: {e}")
+        seen.add(full_path)
+        parsed += 1
+        file_symbols[full_path] = entry["symbols"]
+        if cache is not None:
+            previous = cache.peek(full_path)
+            if previous is not None:
+                totals.remove_file(previous)
+            cache.put(full_path, entry, source.stat)
+        totals.add_file(entry)
+
+    if cache is not None:
+        for entry in cache.prune(seen).values():
+            totals.remove_file(entry)
+        if cache.dirty:
+            cache.extra["totals"] = totals.to_dict()
+            cache.save()
+        print(f"Parsed {parsed} changed file(s), reused {len(seen) - parsed} from cache.\n")
 
-    return global_counter, family_counters, family_value_counters, color_counter
+    if exporter is not None:
+        exporter.write_aggregates(totals)
+
+    symbols = SymbolIndex(file_symbols, root)
+    resolved = symbols.resolve_values()
+    return (
+        totals.props,
+        totals.family_counters(),
+        totals.family_value_counters(),
+        totals.color_counts(resolved),
+        symbols,
+    )
 
 
 def build_summary_markdown(global_counts, family_counts, scanned_path):
@@ -270,7 +560,7 @@ def build_summary_markdown(global_counts, family_counts, scanned_path):
     return "\n".join(lines)
 
 
-def build_family_details_markdown(family, prop_value_counters, scanned_path):
+def build_family_details_markdown(family, prop_value_counters, scanned_path, resolved=None):
     lines = []
     now = datetime.now()
     date_str = now.strftime("%Y-%m-%d %H:%M:%S")
@@ -291,45 +581,526 @@ def build_family_details_markdown(family, prop_value_counters, scanned_path):
         lines.append(f"## `{prop}`")
         lines.append(f"Total declarations: **{total}**")
         lines.append("")
-        lines.append("| Value | Count |")
-        lines.append("|-------|-------|")
+        prop_resolved = resolved.get(prop) if resolved else None
+        if prop_resolved:
+            lines.append("| Value | Count | Resolved |")
+            lines.append("|-------|-------|----------|")
+        else:
+            lines.append("| Value | Count |")
+            lines.append("|-------|-------|")
 
         for value, count in sorted(value_counter.items(), key=lambda kv: (-kv[1], kv[0])):
             # Show empty values clearly (should be rare)
             display_value = value if value else "<empty>"
-            lines.append(f"| `{display_value}` | {count} |")
+            if not prop_resolved:
+                lines.append(f"| `{display_value}` | {count} |")
+                continue
+            resolutions = prop_resolved.get(value)
+            if not resolutions:
+                resolved_cell = ""
+            elif len(resolutions) == 1:
+                resolved_cell = f"`{next(iter(resolutions))}`"
+            else:
+                resolved_cell = ", ".join(f"`{r}` ({n})" for r, n in resolutions.most_common())
+            lines.append(f"| `{display_value}` | {count} | {resolved_cell} |")
 
         lines.append("")
 
     return "\n".join(lines)
 
 
-def build_used_colors_markdown(color_counts, scanned_path):
+def build_used_colors_markdown(color_counts, scanned_path, threshold=DEFAULT_DELTA_E):
     lines = []
     now = datetime.now()
     date_str = now.strftime("%Y-%m-%d %H:%M:%S")
 
+    normalized, variants, unparsed = normalize_color_counts(color_counts)
+
     lines.append(f"# Used Colors\n")
     lines.append(f"- Generated on: **{date_str}**")
     lines.append(f"- Scanned path: `{scanned_path}`")
     lines.append("")
 
     lines.append(f"Total distinct colors: **{len(color_counts)}**")
+    lines.append(f"Distinct normalized colors: **{len(normalized)}**")
+    lines.append("")
+
+    lines.append("| Color | Count | Variants |")
+    lines.append("|-------|-------|----------|")
+
+    for rgba, count in sorted(normalized.items(), key=lambda kv: (-kv[1], format_color(kv[0]))):
+        spellings = ", ".join(
+            f"`{raw}` ({n})"
+            for raw, n in sorted(variants[rgba].items(), key=lambda kv: (-kv[1], kv[0]))
+        )
+        lines.append(f"| `{format_color(rgba)}` | {count} | {spellings} |")
+
+    lines.append("")
+
+    if unparsed:
+        lines.append("## Other color values")
+        lines.append("")
+        lines.append("Variables, functions and other values that are not plain colors.")
+        lines.append("")
+        lines.append("| Value | Count |")
+        lines.append("|-------|-------|")
+        for value, count in sorted(unparsed.items(), key=lambda kv: (-kv[1], kv[0])):
+            lines.append(f"| `{value}` | {count} |")
+        lines.append("")
+
+    clusters = cluster_colors(normalized, threshold)
+    if clusters:
+        lines.append(f"## Near-duplicate colors (ΔE ≤ {threshold:g})")
+        lines.append("")
+        lines.append(f"Found **{len(clusters)}** cluster(s) of perceptually similar colors.")
+        lines.append("")
+        for cluster in clusters:
+            lines.append(f"### `{format_color(cluster.representative)}` ({cluster.total} uses)")
+            lines.append("")
+            lines.append("| Color | Count | ΔE |")
+            lines.append("|-------|-------|----|")
+            for rgba, count, distance in cluster.members:
+                lines.append(f"| `{format_color(rgba)}` | {count} | {distance:.2f} |")
+            lines.append("")
+
+    return "\n".join(lines)
+
+
+def build_tokens_markdown(symbols, scanned_path):
+    lines = []
+    now = datetime.now()
+    date_str = now.strftime("%Y-%m-%d %H:%M:%S")
+
+    var_uses, mixin_uses, missing = symbols.usage()
+    variables = []
+    maps = []
+    for path, name, value in symbols.definitions("vars"):
+        entries = parse_map(value)
+        if entries is None:
+            variables.append((path, name, value))
+        else:
+            maps.append((path, name, entries))
+    mixins = list(symbols.definitions("mixins"))
+
+    def where(path):
+        return os.path.relpath(path, scanned_path).replace(os.sep, "/")
+
+    def by_uses(uses):
+        return lambda item: (-uses[(item[0], item[1])], item[1], item[0])
+
+    lines.append(f"# SCSS Tokens\n")
+    lines.append(f"- Generated on: **{date_str}**")
+    lines.append(f"- Scanned path: `{scanned_path}`")
+    lines.append("")
+
+    lines.append(f"Variables: **{len(variables)}**, maps: **{len(maps)}**, mixins: **{len(mixins)}**")
+    lines.append("")
+
+    lines.append("## Variables")
+    lines.append("")
+    lines.append("| Variable | Defined in | Value | Resolved | Uses |")
+    lines.append("|----------|------------|-------|----------|------|")
+    for path, name, value in sorted(variables, key=by_uses(var_uses)):
+        resolved_value = symbols.resolve(path, value)[0]
+        resolved_cell = f"`{resolved_value}`" if resolved_value != value else ""
+        lines.append(
+            f"| `${name}` | `{where(path)}` | `{value}` | {resolved_cell} | {var_uses[(path, name)]} |"
+        )
+    lines.append("")
+
+    if maps:
+        lines.append("## Maps")
+        lines.append("")
+        lines.append("| Map | Defined in | Keys | Uses |")
+        lines.append("|-----|------------|------|------|")
+        for path, name, entries in sorted(maps, key=by_uses(var_uses)):
+            keys = ", ".join(f"`{key}`" for key in entries)
+            lines.append(f"| `${name}` | `{where(path)}` | {keys} | {var_uses[(path, name)]} |")
+        lines.append("")
+
+    if mixins:
+        lines.append("## Mixins")
+        lines.append("")
+        lines.append("| Mixin | Defined in | Includes |")
+        lines.append("|-------|------------|----------|")
+        for path, name, line in sorted(mixins, key=by_uses(mixin_uses)):
+            lines.append(f"| `{name}` | `{where(path)}:{line}` | {mixin_uses[(path, name)]} |")
+        lines.append("")
+
+    if missing:
+        lines.append("## Unresolved references")
+        lines.append("")
+        lines.append("| Reference | Uses |")
+        lines.append("|-----------|------|")
+        for reference, count in sorted(missing.items(), key=lambda kv: (-kv[1], kv[0])):
+            lines.append(f"| `{reference}` | {count} |")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def build_duplicates_markdown(detector, scanned_path, limit=100):
+    lines = []
+    now = datetime.now()
+    date_str = now.strftime("%Y-%m-%d %H:%M:%S")
+
+    exact = detector.exact_groups()
+    near = detector.near_duplicates()
+    repeated = detector.repeated_declarations()
+    exact_savings = sum(g.savings for g in exact)
+    near_savings = sum(p.savings for p in near)
+    repeated_savings = sum(r.savings for r in repeated)
+
+    def where(location):
+        return f"`{location.path}:{location.line}` `{location.selector}`"
+
+    def locations(group):
+        shown = "<br>".join(where(location) for location in group.locations)
+        hidden = group.count - len(group.locations)
+        return f"{shown}<br>... and {hidden} more" if hidden > 0 else shown
+
+    def preview(declarations, width=80):
+        text = "; ".join(declarations)
+        return text if len(text) <= width else text[:width - 3] + "..."
+
+    lines.append(f"# Duplicate Rules\n")
+    lines.append(f"- Generated on: **{date_str}**")
+    lines.append(f"- Scanned path: `{scanned_path}`")
+    lines.append("")
+
+    lines.append(f"Rule blocks analysed: **{detector.blocks}** ({detector.unique_blocks} distinct)")
+    lines.append(
+        f"Estimated savings: **{exact_savings + near_savings + repeated_savings} bytes** "
+        f"(identical: {exact_savings}, near-identical: {near_savings}, "
+        f"repeated declarations: {repeated_savings})"
+    )
     lines.append("")
 
-    lines.append("| Color | Count |")
-    lines.append("|-------|-------|")
+    lines.append("## Identical rule blocks")
+    lines.append("")
+    lines.append("| Est. savings (bytes) | Copies | Declarations | Locations |")
+    lines.append("|----------------------|--------|--------------|-----------|")
+    for group in exact[:limit]:
+        lines.append(f"| {group.savings} | {group.count} | `{preview(group.declarations)}` | {locations(group)} |")
+    lines.append("")
 
-    for color, count in sorted(color_counts.items(), key=lambda kv: (-kv[1], kv[0])):
-        lines.append(f"| `{color}` | {count} |")
+    lines.append(f"## Near-identical rule blocks (similarity ≥ {detector.similarity:g})")
+    lines.append("")
+    lines.append("| Est. savings (bytes) | Similarity | Block A | Block B |")
+    lines.append("|----------------------|------------|---------|---------|")
+    for pair in near[:limit]:
+        lines.append(
+            f"| {pair.savings} | {pair.similarity:.2f} | {locations(pair.first)} | {locations(pair.second)} |"
+        )
+    lines.append("")
 
+    lines.append("## Repeated declarations within a rule")
+    lines.append("")
+    lines.append("| Est. savings (bytes) | Location | Declaration | Times |")
+    lines.append("|----------------------|----------|-------------|-------|")
+    for entry in repeated[:limit]:
+        lines.append(f"| {entry.savings} | {where(entry.location)} | `{entry.declaration}` | {entry.times} |")
     lines.append("")
 
     return "\n".join(lines)
 
 
-# Import shared output helpers (added at the top of file)
-# from utils.output_helpers import get_output_base_dir
+def poll_changes(root, cache, failed):
+    """
+    Compare the tree with the cached file signatures (one stat per file).
+
+    Args:
+        root (str): Scanned root folder
+        cache (FileResultCache): Cache holding the current per-file entries
+        failed (dict): path -> signature of files that could not be parsed;
+                       they are only retried once they change
+
+    Returns:
+        tuple: (changed or new paths, removed paths)
+    """
+    changed = []
+    current = set()
+    for source in scan_files(root, CSS_EXTENSIONS, SKIP_DIRS):
+        current.add(source.path)
+        if cache.get(source.path, source.stat) is None:
+            if failed.get(source.path) != FileResultCache.signature(source.stat):
+                changed.append(source.path)
+    removed = [path for path in cache.entries if path not in current]
+    return changed, removed
+
+
+class InotifyChanges:
+    """
+    Reports changed stylesheets from inotify events instead of walking the
+    tree (Linux, requires the optional inotify_simple package).
+    """
+
+    def __init__(self, root):
+        self.inotify = INotify()
+        self.mask = (
+            inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM
+            | inotify_flags.DELETE | inotify_flags.CREATE
+        )
+        self.dirs = {}
+        self._add_tree(root)
+
+    def _add_tree(self, top):
+        """Watch a directory tree; return the stylesheets found in it."""
+        found = []
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            try:
+                self.dirs[self.inotify.add_watch(dirpath, self.mask)] = dirpath
+            except OSError:
+                continue
+            found.extend(os.path.join(dirpath, f) for f in filenames if is_css_file(f))
+        return found
+
+    def wait(self, timeout):
+        """
+        Block until something changes (or `timeout` seconds pass).
+
+        Returns:
+            tuple: (changed or new paths, removed paths)
+        """
+        changed = set()
+        removed = set()
+        events = self.inotify.read(timeout=int(timeout * 1000))
+        while events:
+            for event in events:
+                dirpath = self.dirs.get(event.wd)
+                if dirpath is None or not event.name:
+                    continue
+                path = os.path.join(dirpath, event.name)
+                if event.mask & inotify_flags.ISDIR:
+                    if event.mask & (inotify_flags.CREATE | inotify_flags.MOVED_TO) and event.name not in SKIP_DIRS:
+                        changed.update(self._add_tree(path))
+                    continue
+                if not is_css_file(event.name):
+                    continue
+                if event.mask & (inotify_flags.DELETE | inotify_flags.MOVED_FROM):
+                    removed.add(path)
+                    changed.discard(path)
+                else:
+                    changed.add(path)
+                    removed.discard(path)
+            # Editors often save in several steps; collect them in one batch
+            events = self.inotify.read(timeout=50)
+        return sorted(changed), sorted(removed)
+
+
+class UsageWatcher:
+    """
+    Keeps the aggregated counters in memory and applies file changes as
+    deltas, rewriting only the reports they affect.
+    """
+
+    def __init__(self, root, cache, symbols, out_base, color_threshold):
+        self.root = root
+        self.cache = cache
+        self.symbols = symbols
+        self.out_base = out_base
+        self.color_threshold = color_threshold
+        self.failed = {}
+        self.totals = UsageTotals()
+        for _, entry in cache.results():
+            self.totals.add_file(entry)
+
+    def apply(self, changed, removed):
+        """
+        Re-parse changed files, drop removed ones and rewrite the affected
+        reports.
+
+        Returns:
+            list: Paths of the reports that were rewritten
+        """
+        families = set()
+        flags = {"summary": False, "tokens": False, "rebuild": False}
+        ref_updates = {}
+
+        for path in removed:
+            self.failed.pop(path, None)
+            previous = self.cache.discard(path)
+            if previous is not None:
+                self.totals.remove_file(previous)
+                self._compare(previous, None, families, flags, ref_updates, path)
+
+        for path in changed:
+            previous = self.cache.peek(path)
+            try:
+                stat_result = os.stat(path)
+                entry = scan_file(path)
+            except Exception as e:
+                print(f"[WARN] Failed to read {path}: {e}")
+                if os.path.exists(path):
+                    self.failed[path] = FileResultCache.signature(os.stat(path))
+                self.cache.discard(path)
+                entry = stat_result = None
+            else:
+                self.failed.pop(path, None)
+                self.cache.put(path, entry, stat_result)
+            if previous is not None:
+                self.totals.remove_file(previous)
+            if entry is not None:
+                self.totals.add_file(entry)
+            self._compare(previous, entry, families, flags, ref_updates, path)
+
+        if flags["rebuild"]:
+            file_symbols = {path: entry["symbols"] for path, entry in self.cache.results()}
+            self.symbols = SymbolIndex(file_symbols, self.root)
+            families.update(classify_family(prop) for prop in self.totals.props)
+        else:
+            for path, symbols in ref_updates.items():
+                self.symbols.update_refs(path, symbols)
+        resolved = self.symbols.resolve_values()
+
+        written = []
+        if flags["summary"]:
+            written.append(self._write(
+                "summary.md",
+                build_summary_markdown(self.totals.props, self.totals.family_counters(), self.root),
+            ))
+        family_values = self.totals.family_value_counters()
+        for family in sorted(families):
+            name = f"{family}-details.md"
+            if family in family_values:
+                written.append(self._write(
+                    name, build_family_details_markdown(family, family_values[family], self.root, resolved)
+                ))
+            elif os.path.exists(os.path.join(self.out_base, name)):
+                os.remove(os.path.join(self.out_base, name))
+        if "color" in families or flags["rebuild"]:
+            written.append(self._write(
+                "used-colors.md",
+                build_used_colors_markdown(self.totals.color_counts(resolved), self.root, self.color_threshold),
+            ))
+        if flags["tokens"]:
+            written.append(self._write("tokens.md", build_tokens_markdown(self.symbols, self.root)))
+        return written
+
+    def _compare(self, previous, entry, families, flags, ref_updates, path):
+        """Work out which reports a changed file entry affects."""
+        empty = {"props": {}, "values": {}, "symbols": None}
+        previous = previous or empty
+        entry = entry or empty
+
+        for prop in set(previous["props"]) | set(entry["props"]):
+            if previous["props"].get(prop) != entry["props"].get(prop):
+                flags["summary"] = True
+                families.add(classify_family(prop))
+        for prop in set(previous["values"]) | set(entry["values"]):
+            if previous["values"].get(prop) != entry["values"].get(prop):
+                families.add(classify_family(prop))
+
+        old_symbols, new_symbols = previous["symbols"], entry["symbols"]
+        if old_symbols == new_symbols:
+            return
+        flags["tokens"] = True
+        # New definitions or module edges can change any resolution
+        definitions = ("vars", "mixins", "uses")
+        if old_symbols is None or new_symbols is None:
+            rebuild = any((old_symbols or new_symbols)[key] for key in definitions)
+        else:
+            rebuild = any(old_symbols[key] != new_symbols[key] for key in definitions)
+        if rebuild:
+            flags["rebuild"] = True
+            return
+        for symbols in (old_symbols, new_symbols):
+            if symbols is not None:
+                families.update(classify_family(prop) for prop in symbols["refs"])
+        ref_updates[path] = new_symbols
+
+    def _write(self, name, text):
+        path = os.path.join(self.out_base, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+
+def watch(watcher, interval):
+    """Poll (or wait for inotify events) and apply changes until Ctrl+C."""
+    source = InotifyChanges(watcher.root) if INotify is not None else None
+    mode = "inotify" if source is not None else f"polling every {interval:g}s"
+    print(f"\nWatching {watcher.root} ({mode}). Press Ctrl+C to stop.")
+    try:
+        while True:
+            if source is not None:
+                changed, removed = source.wait(interval)
+            else:
+                time.sleep(interval)
+                changed, removed = poll_changes(watcher.root, watcher.cache, watcher.failed)
+            if not changed and not removed:
+                continue
+            started = time.perf_counter()
+            written = watcher.apply(changed, removed)
+            elapsed = (time.perf_counter() - started) * 1000
+            stamp = datetime.now().strftime("%H:%M:%S")
+            print(
+                f"[{stamp}] {len(changed)} changed, {len(removed)} removed file(s); "
+                f"rewrote {len(written)} report(s) in {elapsed:.0f} ms"
+            )
+            for path in written:
+                print(f"  {path}")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.cache.extra["totals"] = watcher.totals.to_dict()
+        watcher.cache.save()
+
+
+def write_reports(results, root, out_base, color_threshold=DEFAULT_DELTA_E, detector=None):
+    """
+    Write the Markdown reports of a scan.
+
+    Args:
+        results (tuple): Return value of scan_folder()
+        root (str): Scanned folder (shown in the reports)
+        out_base (str): Folder receiving the reports (created if needed)
+        color_threshold (float): Max ΔE for grouping near-duplicate colors
+        detector (DuplicateDetector): Optional detector fed during the scan;
+                                      duplicates.md is written from it
+    """
+    global_counts, family_counts, family_value_counters, color_counts, symbols = results
+    resolved = symbols.resolve_values()
+    os.makedirs(out_base, exist_ok=True)
+
+    # Summary
+    summary_md = build_summary_markdown(global_counts, family_counts, root)
+    summary_path = os.path.join(out_base, "summary.md")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(summary_md)
+
+    print(f"Summary written to:\n  {summary_path}")
+
+    # Per-family details
+    for family, prop_values in family_value_counters.items():
+        details_md = build_family_details_markdown(family, prop_values, root, resolved)
+        details_path = os.path.join(out_base, f"{family}-details.md")
+        with open(details_path, "w", encoding="utf-8") as f:
+            f.write(details_md)
+        print(f"Details for '{family}' written to:\n  {details_path}")
+
+    # Used colors
+    used_colors_md = build_used_colors_markdown(color_counts, root, color_threshold)
+    used_colors_path = os.path.join(out_base, "used-colors.md")
+    with open(used_colors_path, "w", encoding="utf-8") as f:
+        f.write(used_colors_md)
+    print(f"Used colors written to:\n  {used_colors_path}")
+
+    # SCSS tokens
+    tokens_md = build_tokens_markdown(symbols, root)
+    tokens_path = os.path.join(out_base, "tokens.md")
+    with open(tokens_path, "w", encoding="utf-8") as f:
+        f.write(tokens_md)
+    print(f"SCSS tokens written to:\n  {tokens_path}")
+
+    # Duplicate rules
+    if detector is not None:
+        duplicates_path = os.path.join(out_base, "duplicates.md")
+        with open(duplicates_path, "w", encoding="utf-8") as f:
+            f.write(build_duplicates_markdown(detector, root))
+        print(f"Duplicate rules written to:\n  {duplicates_path}")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -344,6 +1115,55 @@ def main():
         default=".",
         help="Root folder to scan (default: current directory).",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every file instead of reusing cached per-file counts.",
+    )
+    parser.add_argument(
+        "--cache-file",
+        help="Per-file cache location (default: _outputs/css/cache/scan-<hash>.json).",
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="Also report identical and near-identical rule blocks (duplicates.md). Forces a full parse.",
+    )
+    parser.add_argument(
+        "--similarity",
+        type=float,
+        default=0.8,
+        help="Minimum estimated similarity (0-1) for near-identical rule blocks (default: 0.8).",
+    )
+    parser.add_argument(
+        "--export",
+        action="append",
+        choices=["jsonl", "csv"],
+        help=(
+            "Also write per-declaration records and aggregate tables in this "
+            "format (repeatable). Forces a full parse."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "After the first run, keep watching the folder and update the "
+            "affected reports whenever a stylesheet changes."
+        ),
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between change checks in --watch mode (default: 1.0).",
+    )
+    parser.add_argument(
+        "--color-threshold",
+        type=float,
+        default=DEFAULT_DELTA_E,
+        help=f"Max ΔE (CIE76) for grouping near-duplicate colors; 0 disables (default: {DEFAULT_DELTA_E}).",
+    )
     args = parser.parse_args()
 
     root = os.path.abspath(args.path)
@@ -353,42 +1173,47 @@ def main():
         print("Error: path is not a directory.")
         return
 
-    global_counts, family_counts, family_value_counters, color_counts = scan_folder(root)
-
-    if not global_counts:
-        print("No properties found in .scss/.css files.")
+    if args.watch and (args.export or args.duplicates):
+        print("Error: --watch cannot be combined with --export or --duplicates.")
         return
 
+    cache = None
+    if not args.no_cache:
+        cache = FileResultCache(args.cache_file or default_cache_path(root), version=SCAN_CACHE_VERSION).load()
+    elif args.watch:
+        # Watch mode keeps the per-file entries; use an in-memory cache that is never saved
+        cache = FileResultCache(None, version=SCAN_CACHE_VERSION)
+
     date_folder = datetime.now().strftime("%m%d")
     out_base = os.path.join(get_output_base_dir(), "lists", date_folder)
-    os.makedirs(out_base, exist_ok=True)
 
-    # Summary
-    summary_md = build_summary_markdown(global_counts, family_counts, root)
-    summary_path = os.path.join(out_base, "summary.md")
-    with open(summary_path, "w", encoding="utf-8") as f:
-        f.write(summary_md)
+    exporter = None
+    if args.export:
+        os.makedirs(out_base, exist_ok=True)
+        exporter = UsageExporter(out_base, sorted(set(args.export)), root)
 
-    print(f"Summary written to:\n  {summary_path}")
+    detector = DuplicateDetector(similarity=args.similarity) if args.duplicates else None
 
-    # Per-family details
-    for family, prop_values in family_value_counters.items():
-        details_md = build_family_details_markdown(family, prop_values, root)
-        details_path = os.path.join(out_base, f"{family}-details.md")
-        with open(details_path, "w", encoding="utf-8") as f:
-            f.write(details_md)
-        print(f"Details for '{family}' written to:\n  {details_path}")
+    results = scan_folder(root, cache, exporter, detector)
+    global_counts, _, _, color_counts, symbols = results
 
-    # Used colors
-    used_colors_md = build_used_colors_markdown(color_counts, root)
-    used_colors_path = os.path.join(out_base, "used-colors.md")
-    with open(used_colors_path, "w", encoding="utf-8") as f:
-        f.write(used_colors_md)
-    print(f"Used colors written to:\n  {used_colors_path}")
+    if exporter is not None:
+        print("Exports written to:")
+        for path in exporter.paths:
+            print(f"  {path}")
+
+    if not global_counts:
+        print("No properties found in .scss/.css files.")
+        return
+
+    write_reports(results, root, out_base, args.color_threshold, detector)
 
     print(f"\nTotal distinct properties: {len(global_counts)}")
     print(f"Total distinct colors: {len(color_counts)}")
 
+    if args.watch:
+        watch(UsageWatcher(root, cache, symbols, out_base, args.color_threshold), args.interval)
+
 
 if __name__ == "__main__":
     main()
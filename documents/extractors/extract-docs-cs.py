@@ -6,73 +6,167 @@ CLI script to extract XML doc comments from C# files and save them as Markdown f
 import os
 import re
 import argparse
+from functools import partial
 from pathlib import Path
 import sys
-import importlib.util
 
-utils_dir = os.path.join(os.path.dirname(__file__), 'utils')
-cs_tags_path = os.path.join(utils_dir, 'handle-CsTags.py')
-spec = importlib.util.spec_from_file_location('handle_CsTags', cs_tags_path)
-cs_tags = importlib.util.module_from_spec(spec)
-sys.modules['handle_CsTags'] = cs_tags
-spec.loader.exec_module(cs_tags)
-parse_csdoc_content = cs_tags.parse_csdoc_content
-format_csdoc_as_markdown = cs_tags.format_csdoc_as_markdown
+# Add parent directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.doc_manifest import DocManifest
+from utils.doc_records import make_record, records_line_count
+from utils.file_scanner import DEFAULT_SKIP_DIRS, scan_files
+from utils.markdown_builder import MarkdownBuilder, group_records, report_written, write_markdown_file
+from utils.output_helpers import get_output_base_dir
+from utils.parallel import OrderedWriter, ordered_map, resolve_jobs
+from utils.symbol_index import DEFAULT_INDEX_NAME, SymbolIndex, records_to_symbols
 
-def extract_csdoc_comments(file_path):
+# Runs of consecutive /// lines, taken as one XML doc comment
+DOC_BLOCK_RE = re.compile(r'(?:^[ \t]*///.*\n)+', re.MULTILINE)
+
+# Leading /// (and one space) of each doc comment line
+DOC_LINE_PREFIX_RE = re.compile(r'^[ \t]*///[ \t]?', re.MULTILINE)
+
+# Whitespace, line comments, block comments and preprocessor directives
+TRIVIA_RE = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/|#[^\n]*)*', re.DOTALL)
+
+# Tokens that matter when skipping an attribute section: brackets, strings
+# and comments (which may contain unbalanced brackets)
+BRACKET_TOKEN_RE = re.compile(
+    r'[()\[\]{}]'
+    r'|@"(?:""|[^"])*"'
+    r'|"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])*'"
+    r'|//[^\n]*'
+    r'|/\*.*?\*/',
+    re.DOTALL
+)
+
+# The declaration an XML doc comment documents, matched right after the
+# comment and its attributes. Types are tried first, then a member name
+# followed by '(' (method, constructor) or by '{' / '=>' (property). A
+# method's type parameter list holds plain identifiers only, so generic
+# return types (`Task<T> Get<T>(`) are not taken for the method name.
+# The modifier run is possessive, so the namespace/delegate/event guard
+# cannot be bypassed by backtracking into it.
+DECLARATION_RE = re.compile(r'''
+    (?:(?:public|private|protected|internal|static|abstract|sealed|virtual|override|async|extern
+        |partial|readonly|unsafe|volatile|required|new|file|ref)\s+)*+
+    (?:
+        (?:struct|record\s+struct)\s+(?P<STRUCT>@?\w+)
+      | (?:class|record(?:\s+class)?)\s+(?P<CLASS>@?\w+)
+      | interface\s+(?P<INTERFACE>@?\w+)
+      | enum\s+(?P<ENUM>@?\w+)
+      | (?!namespace\b|delegate\b|event\b)
+        (?:
+            [^;{}=]*?(?<![\w.@])(?P<METHOD>@?\w+)\s*(?:<\s*@?\w+(?:\s*,\s*@?\w+)*\s*>\s*)?\(
+          | [^;{}=(]*?\s(?P<PROPERTY>@?\w+)\s*(?:\{|=>)
+        )
+    )
+''', re.VERBOSE)
+
+
+def skip_balanced(content, pos):
     """
-    Extract XML doc comments from a C# file.
+    Skip a bracketed expression starting at content[pos], honouring strings and comments.
+    Args:
+        content (str): Source text
+        pos (int): Index of the opening bracket
+    Returns:
+        int: Index just past the matching closing bracket (len(content) if unbalanced)
+    """
+    depth = 0
+    for token in BRACKET_TOKEN_RE.finditer(content, pos):
+        char = token.group()
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return len(content)
+
+
+def find_declaration(content, pos):
+    """
+    Identify the declaration that follows an XML doc comment.
+    Skips whitespace, comments, preprocessor lines and attribute sections
+    ([HttpPost], [Obsolete("...")], ...), then matches the declaration at
+    the first remaining token only.
+    Args:
+        content (str): Source text
+        pos (int): Index just past the doc comment
+    Returns:
+        tuple: (doc type, name), or (None, None) if the next token does not
+               start a class, interface, enum, struct, method or property
+    Examples:
+        >>> find_declaration('public List<Dictionary<string, int>> GetAll<T>(T x) {', 0)
+        ('METHOD', 'GetAll')
+        >>> find_declaration('public Task<T> GetAsync<T>(int id) {', 0)
+        ('METHOD', 'GetAsync')
+        >>> find_declaration('public Task<Order> GetAsync(int id) {', 0)
+        ('METHOD', 'GetAsync')
+        >>> find_declaration('public delegate void Handler(int x);', 0)
+        (None, None)
+        >>> find_declaration('public event EventHandler Changed { add { } remove { } }', 0)
+        (None, None)
+    """
+    while True:
+        pos = TRIVIA_RE.match(content, pos).end()
+        if not content.startswith('[', pos):
+            break
+        pos = skip_balanced(content, pos)
+
+    declaration = DECLARATION_RE.match(content, pos)
+    if not declaration:
+        return None, None
+    return declaration.lastgroup, declaration.group(declaration.lastgroup)
+
+
+def extract_csdoc_records(file_path):
+    """
+    Extract the XML doc comments of a C# file as records.
     Args:
         file_path (str): Path to the C# file
     Returns:
-        str: Combined XML doc comments content or empty string if none found
+        list: DocRecord objects in file order
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             content = file.read()
 
-        # Find all XML doc comments (/// ...)
-        # Group consecutive /// lines as a single doc comment
-        doc_pattern = r'(?:^[ \t]*///.*\n)+'
-        matches = re.finditer(doc_pattern, content, re.MULTILINE)
         docstrings = []
-        for match in matches:
-            doc_block = match.group(0)
+        line = 1
+        last_pos = 0
+        for match in DOC_BLOCK_RE.finditer(content):
+            line += content.count('\n', last_pos, match.start())
+            last_pos = match.start()
             # Remove leading /// and whitespace
-            lines = [re.sub(r'^\s*///\s?', '', l) for l in doc_block.split('\n') if l.strip()]
-            cleaned_doc = '\n'.join(lines).strip()
+            cleaned_doc = DOC_LINE_PREFIX_RE.sub('', match.group(0)).strip()
             if cleaned_doc:
-                # Try to find the next code element (class, method, property, etc.)
-                start_pos = match.end()
-                remaining_content = content[start_pos:start_pos + 1000]
-                patterns = [
-                    (r'^\s*public\s+class\s+(\w+)', 'CLASS'),
-                    (r'^\s*public\s+interface\s+(\w+)', 'INTERFACE'),
-                    (r'^\s*public\s+enum\s+(\w+)', 'ENUM'),
-                    (r'^\s*public\s+struct\s+(\w+)', 'STRUCT'),
-                    (r'^\s*public\s+(?:[\w<>\[\]]+\s+)+([\w_]+)\s*\(', 'METHOD'),
-                    (r'^\s*public\s+(?:[\w<>\[\]]+\s+)+([\w_]+)\s*{', 'PROPERTY'),
-                ]
-                name = None
-                doc_type = 'COMMENT'
-                for pattern, pattern_type in patterns:
-                    code_match = re.search(pattern, remaining_content, re.MULTILINE)
-                    if code_match:
-                        name = code_match.group(1)
-                        doc_type = pattern_type
-                        break
-                if not name and match.start() < 200:
+                # Match the code element right after this doc comment
+                doc_type, name = find_declaration(content, match.end())
+                # If nothing matched, check if it's the first doc comment at the beginning of file (module doc)
+                if not name and not docstrings and match.start() < 200:
                     doc_type = 'MODULE'
                     name = 'module'
                 if name:
-                    docstrings.append(f"{doc_type}:{name}:{cleaned_doc}")
+                    docstrings.append(make_record(doc_type, name, line, cleaned_doc))
                 else:
                     first_words = ' '.join(cleaned_doc.split()[:3])
-                    docstrings.append(f"COMMENT:{first_words}:{cleaned_doc}")
-        return "\n\n".join(docstrings) if docstrings else ""
+                    docstrings.append(make_record('COMMENT', first_words, line, cleaned_doc))
+        return docstrings
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
-        return ""
+        return []
+
+# Bump when the generated Markdown changes so incremental runs regenerate every file
+MANIFEST_VERSION = 6
+
+# File extensions to include
+CS_EXTENSIONS = {'.cs'}
+
+# Directories to skip
+SKIP_DIRS = DEFAULT_SKIP_DIRS | {'bin', 'obj', 'packages', 'TestResults'}
 
 def find_cs_files(directory):
     """
@@ -82,30 +176,23 @@ def find_cs_files(directory):
     Returns:
         list: List of C# file paths
     """
-    skip_dirs = {
-        'bin', 'obj', '.git', '.svn', '.hg',
-        'dist', 'build', 'node_modules',
-        '__pycache__', '.pytest_cache', '.mypy_cache',
-        '.tox', '.eggs', 'site-packages', 'packages', 'TestResults'
-    }
-    extensions = {'.cs'}
-    cs_files = []
-    for root, dirs, files in os.walk(directory):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for file in files:
-            if any(file.endswith(ext) for ext in extensions):
-                cs_files.append(os.path.join(root, file))
-    return cs_files
+    return [source.path for source in scan_files(directory, CS_EXTENSIONS, SKIP_DIRS)]
+
+def summarize_csdoc(parsed):
+    """Return the bullet-list summary of a parsed XML doc: the first line of its summary."""
+    return parsed.get('summary', '').split('\n')[0].strip()
 
-def create_markdown_file(cs_file_path, csdoc_content, output_dir, project_name, input_root=None):
+def render_markdown_file(cs_file_path, records, output_dir, project_name, input_root=None):
     """
-    Create a markdown file with the extracted XML doc content, mimicking the original folder structure.
+    Build the markdown for one file, mimicking the original folder structure.
     Args:
         cs_file_path (str): Original C# file path
-        csdoc_content (str): Extracted XML doc content
+        records (list): DocRecord objects from extract_csdoc_records()
         output_dir (str): Output directory for markdown files
         project_name (str): Name of the project (last part of folder path)
         input_root (str): Root input folder to calculate relative path (optional)
+    Returns:
+        tuple: (markdown file path, markdown content)
     """
     file_name = Path(cs_file_path).stem
     # Determine relative path from input_root (if provided)
@@ -115,180 +202,147 @@ def create_markdown_file(cs_file_path, csdoc_content, output_dir, project_name,
         target_dir = os.path.join(output_dir, rel_dir)
     else:
         target_dir = output_dir
-    os.makedirs(target_dir, exist_ok=True)
     md_file_path = os.path.join(target_dir, f"{file_name}.md")
     programming_language = 'C#'
-    md_content = f"# {file_name}\n\n"
-    md_content += "---\n"
-    md_content += f"Project: {project_name}\n"
-    md_content += f"Programming Language: {programming_language}\n"
+    md = MarkdownBuilder()
+    md.add(f"# {file_name}\n\n", "---\n", f"Project: {project_name}\n", f"Programming Language: {programming_language}\n")
+    groups = group_records(records)
     file_type = None
-    if 'CLASS:' in csdoc_content:
+    if 'CLASS' in groups:
         file_type = 'Class'
-    elif 'INTERFACE:' in csdoc_content:
+    elif 'INTERFACE' in groups:
         file_type = 'Interface'
-    elif 'ENUM:' in csdoc_content:
+    elif 'ENUM' in groups:
         file_type = 'Enum'
-    elif 'STRUCT:' in csdoc_content:
+    elif 'STRUCT' in groups:
         file_type = 'Struct'
-    elif 'METHOD:' in csdoc_content:
+    elif 'METHOD' in groups:
         file_type = 'Method'
-    elif 'PROPERTY:' in csdoc_content:
+    elif 'PROPERTY' in groups:
         file_type = 'Property'
-    elif 'MODULE:' in csdoc_content:
+    elif 'MODULE' in groups:
         file_type = 'Module'
     if file_type:
-        md_content += f"File Type: {file_type}\n"
-    md_content += "---\n\n"
-    if csdoc_content:
-        sections = []
-        current_section = ""
-        for line in csdoc_content.split('\n'):
-            if any(line.startswith(prefix) for prefix in ['MODULE:', 'CLASS:', 'INTERFACE:', 'ENUM:', 'STRUCT:', 'METHOD:', 'PROPERTY:', 'COMMENT:']):
-                if current_section:
-                    sections.append(current_section)
-                current_section = line
-            else:
-                if current_section:
-                    current_section += '\n' + line
-                else:
-                    current_section = line
-        if current_section:
-            sections.append(current_section)
-        module_doc = None
-        classes = []
-        interfaces = []
-        enums = []
-        structs = []
-        methods = []
-        properties = []
-        comments = []
-        for section in sections:
-            if section.startswith('MODULE:'):
-                module_doc = section.replace('MODULE:', '', 1).strip()
-            elif section.startswith('CLASS:'):
-                parts = section.replace('CLASS:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    class_name, class_doc = parts
-                    classes.append({'name': class_name.strip(), 'doc': class_doc.strip()})
-            elif section.startswith('INTERFACE:'):
-                parts = section.replace('INTERFACE:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    iface_name, iface_doc = parts
-                    interfaces.append({'name': iface_name.strip(), 'doc': iface_doc.strip()})
-            elif section.startswith('ENUM:'):
-                parts = section.replace('ENUM:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    enum_name, enum_doc = parts
-                    enums.append({'name': enum_name.strip(), 'doc': enum_doc.strip()})
-            elif section.startswith('STRUCT:'):
-                parts = section.replace('STRUCT:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    struct_name, struct_doc = parts
-                    structs.append({'name': struct_name.strip(), 'doc': struct_doc.strip()})
-            elif section.startswith('METHOD:'):
-                parts = section.replace('METHOD:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    method_name, method_doc = parts
-                    methods.append({'name': method_name.strip(), 'doc': method_doc.strip()})
-            elif section.startswith('PROPERTY:'):
-                parts = section.replace('PROPERTY:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    prop_name, prop_doc = parts
-                    properties.append({'name': prop_name.strip(), 'doc': prop_doc.strip()})
-            elif section.startswith('COMMENT:'):
-                parts = section.replace('COMMENT:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    comment_id, comment_doc = parts
-                    comments.append({'id': comment_id.strip(), 'doc': comment_doc.strip()})
-        md_content += "## Info\n\n"
-        if module_doc:
-            parsed_module = parse_csdoc_content(module_doc)
+        md.add(f"File Type: {file_type}\n")
+    md.add("---\n\n")
+    if records:
+        # The XML doc parser is only loaded once a file with /// comments is rendered
+        from utils.csdoc import format_csdoc_as_markdown, parse_csdoc_content
+        md.add("## Info\n\n")
+        if groups['MODULE']:
+            parsed_module = parse_csdoc_content(groups['MODULE'][-1].doc)
             if parsed_module.get('summary'):
-                md_content += f"{parsed_module['summary']}\n\n"
+                md.add(f"{parsed_module['summary']}\n\n")
             metadata = parsed_module.get('metadata', {})
             if metadata:
                 metadata_parts = [f"**{k.title()}**: {v}" for k, v in metadata.items()]
                 if metadata_parts:
-                    md_content += '\n'.join(metadata_parts) + "\n\n"
-        if classes:
-            if len(classes) == 1:
-                cls = classes[0]
-                md_content += f"**Class**: `{cls['name']}`\n\n"
-                parsed = parse_csdoc_content(cls['doc'])
-                formatted = format_csdoc_as_markdown(parsed)
-                md_content += f"{formatted}\n\n"
-            else:
-                md_content += "**Classes**:\n"
-                for cls in classes:
-                    parsed = parse_csdoc_content(cls['doc'])
-                    summary = parsed.get('summary', '').split('\n')[0].strip()
-                    md_content += f"- `{cls['name']}`: {summary}\n"
-                md_content += "\n"
-                for cls in classes:
-                    md_content += f"### `{cls['name']}`\n\n"
-                    parsed = parse_csdoc_content(cls['doc'])
-                    formatted = format_csdoc_as_markdown(parsed)
-                    md_content += f"{formatted}\n\n"
-        if interfaces:
-            if len(interfaces) == 1:
-                iface = interfaces[0]
-                md_content += f"**Interface**: `{iface['name']}`\n\n"
-                parsed = parse_csdoc_content(iface['doc'])
-                formatted = format_csdoc_as_markdown(parsed)
-                md_content += f"{formatted}\n\n"
+                    md.add('\n'.join(metadata_parts), "\n\n")
+        # Classes, interfaces and methods: each XML doc is parsed once for summary and details
+        for kind, label, plural in (('CLASS', 'Class', 'Classes'),
+                                    ('INTERFACE', 'Interface', 'Interfaces')):
+            if groups[kind]:
+                md.member_section(label, plural,
+                                  [(record.name, parse_csdoc_content(record.doc)) for record in groups[kind]],
+                                  summarize_csdoc, format_csdoc_as_markdown)
+        for record in groups['ENUM']:
+            md.add(f"**Enum**: `{record.name}`\n\n", record.doc, "\n\n")
+        for record in groups['STRUCT']:
+            md.add(f"**Struct**: `{record.name}`\n\n", record.doc, "\n\n")
+        if groups['METHOD']:
+            md.member_section('Method', 'Methods',
+                              [(record.name, parse_csdoc_content(record.doc)) for record in groups['METHOD']],
+                              summarize_csdoc, format_csdoc_as_markdown)
+        for record in groups['PROPERTY']:
+            md.add(f"**Property**: `{record.name}`\n\n", record.doc, "\n\n")
+        if groups['COMMENT']:
+            md.add("**Documentation**:\n\n")
+            for record in groups['COMMENT']:
+                md.add(record.doc, "\n\n")
+    else:
+        md.add("## Info\n\n*No XML doc comments found*\n")
+    return md_file_path, md.getvalue()
+
+def extract_file(cs_file, output_dir, project_name, input_root):
+    """
+    Extract and render one file. Runs in a worker process with --jobs.
+    Args:
+        cs_file (str): C# file path
+        output_dir (str): Output directory for markdown files
+        project_name (str): Name of the project (last part of folder path)
+        input_root (Path): Root input folder
+    Returns:
+        tuple: (cs_file, status, md_file_path, md_content, records) where
+               status is 'ok', 'short' (XML doc too short) or 'none' (no XML doc)
+    """
+    records = extract_csdoc_records(cs_file)
+    if records_line_count(records) > 3:
+        md_file_path, md_content = render_markdown_file(cs_file, records, output_dir, project_name, input_root)
+        return cs_file, 'ok', md_file_path, md_content, records
+    return cs_file, 'short' if records else 'none', None, None, records
+
+def process_cs_files(cs_files, output_dir, folder_path, jobs=1, manifest=None, index=None):
+    """
+    Extract the XML doc comments of each file and write a Markdown file for
+    every file with substantial documentation. With more than one job the
+    files are parsed in a process pool and the Markdown files are written by
+    a thread pool; messages are still printed in file order. With a
+    manifest, files unchanged since the last run are not parsed again and
+    the docs of removed files are deleted. With a symbol index, the
+    documented declarations of every parsed file are stored in it (files
+    missing from the index are always parsed).
+    Args:
+        cs_files (list): C# file paths
+        output_dir (str): Output directory for markdown files
+        folder_path (Path): Resolved input folder (project root)
+        jobs (int): Number of worker processes
+        manifest (DocManifest): Optional incremental build manifest
+        index (SymbolIndex): Optional symbol index
+    Returns:
+        tuple: (processed count, skipped count)
+    """
+    root = str(folder_path)
+    indexed = index.files('cs', root) if index is not None else None
+    processed = 0
+    skipped = 0
+    changed_files = cs_files
+    if manifest is not None:
+        changed_files = []
+        for cs_file in cs_files:
+            status = manifest.lookup(cs_file)
+            if status is not None and indexed is not None and os.path.relpath(os.path.abspath(cs_file), root) not in indexed:
+                status = None
+            if status is None:
+                changed_files.append(cs_file)
+            elif status == 'ok':
+                processed += 1
             else:
-                md_content += "**Interfaces**:\n"
-                for iface in interfaces:
-                    parsed = parse_csdoc_content(iface['doc'])
-                    summary = parsed.get('summary', '').split('\n')[0].strip()
-                    md_content += f"- `{iface['name']}`: {summary}\n"
-                md_content += "\n"
-                for iface in interfaces:
-                    md_content += f"### `{iface['name']}`\n\n"
-                    parsed = parse_csdoc_content(iface['doc'])
-                    formatted = format_csdoc_as_markdown(parsed)
-                    md_content += f"{formatted}\n\n"
-        if enums:
-            for enum in enums:
-                md_content += f"**Enum**: `{enum['name']}`\n\n{enum['doc']}\n\n"
-        if structs:
-            for struct in structs:
-                md_content += f"**Struct**: `{struct['name']}`\n\n{struct['doc']}\n\n"
-        if methods:
-            if len(methods) == 1:
-                m = methods[0]
-                md_content += f"**Method**: `{m['name']}`\n\n"
-                parsed = parse_csdoc_content(m['doc'])
-                formatted = format_csdoc_as_markdown(parsed)
-                md_content += f"{formatted}\n\n"
+                skipped += 1
+    unchanged = len(cs_files) - len(changed_files)
+    worker = partial(extract_file, output_dir=output_dir, project_name=folder_path.name, input_root=folder_path)
+    with OrderedWriter(jobs) as writer:
+        for cs_file, status, md_file_path, md_content, records in ordered_map(worker, changed_files, jobs):
+            if status == 'ok':
+                writer.submit(write_markdown_file, md_file_path, md_content, manifest, on_done=report_written)
+                processed += 1
             else:
-                md_content += "**Methods**:\n"
-                for m in methods:
-                    parsed = parse_csdoc_content(m['doc'])
-                    summary = parsed.get('summary', '').split('\n')[0].strip()
-                    md_content += f"- `{m['name']}`: {summary}\n"
-                md_content += "\n"
-                for m in methods:
-                    md_content += f"### `{m['name']}`\n\n"
-                    parsed = parse_csdoc_content(m['doc'])
-                    formatted = format_csdoc_as_markdown(parsed)
-                    md_content += f"{formatted}\n\n"
-        if properties:
-            for p in properties:
-                md_content += f"**Property**: `{p['name']}`\n\n{p['doc']}\n\n"
-        if comments:
-            md_content += "**Documentation**:\n\n"
-            for comment in comments:
-                md_content += f"{comment['doc']}\n\n"
-    else:
-        md_content += "## Info\n\n*No XML doc comments found*\n"
-    try:
-        with open(md_file_path, 'w', encoding='utf-8') as md_file:
-            md_file.write(md_content)
-        print(f"Created: {md_file_path}")
-    except Exception as e:
-        print(f"Error writing {md_file_path}: {e}")
+                skipped += 1
+                reason = 'XML doc too short' if status == 'short' else 'no XML doc'
+                writer.report(partial(print, f"Skipped ({reason}): {cs_file}"))
+            if manifest is not None:
+                manifest.record(cs_file, status, [md_file_path] if md_file_path else [])
+            if index is not None:
+                index.replace_file('cs', root, os.path.relpath(os.path.abspath(cs_file), root),
+                                   records_to_symbols(records, Path(cs_file).stem))
+    if index is not None:
+        index.prune('cs', root, {os.path.relpath(os.path.abspath(cs_file), root) for cs_file in cs_files})
+        index.commit()
+    if manifest is not None:
+        for md_file_path in manifest.finish():
+            print(f"Removed: {md_file_path}")
+        if unchanged:
+            print(f"Unchanged since last run (not parsed): {unchanged} files")
+    return processed, skipped
 
 def main():
     parser = argparse.ArgumentParser(
@@ -303,6 +357,26 @@ def main():
         default="./extracted",
         help="Output directory for markdown files (default: ./extracted)"
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Parse and rewrite every file instead of only files changed since the last run"
+    )
+    parser.add_argument(
+        "--index",
+        help=f"Symbol index database to update (default: {DEFAULT_INDEX_NAME} in the extractors' _outputs folder)"
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not update the symbol index"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, 0 = one per CPU)"
+    )
     args = parser.parse_args()
     if not os.path.isdir(args.folder):
         print(f"Error: '{args.folder}' is not a valid directory")
@@ -319,19 +393,11 @@ def main():
     print(f"Output directory: {output_dir}")
     print(f"Project: {project_name}")
     print("-" * 50)
-    processed = 0
-    skipped = 0
-    for cs_file in cs_files:
-        csdoc_content = extract_csdoc_comments(cs_file)
-        if csdoc_content.strip() and len(csdoc_content.strip().split('\n')) > 3:
-            create_markdown_file(cs_file, csdoc_content, output_dir, project_name, folder_path)
-            processed += 1
-        else:
-            skipped += 1
-            if csdoc_content.strip():
-                print(f"Skipped (XML doc too short): {cs_file}")
-            else:
-                print(f"Skipped (no XML doc): {cs_file}")
+    manifest = DocManifest(output_dir, folder_path, 'cs', MANIFEST_VERSION, full=args.full).load()
+    index = None if args.no_index else SymbolIndex(args.index or os.path.join(get_output_base_dir(), DEFAULT_INDEX_NAME))
+    processed, skipped = process_cs_files(cs_files, output_dir, folder_path, resolve_jobs(args.jobs), manifest, index)
+    if index is not None:
+        index.close()
     print("-" * 50)
     print(f"Processed {processed} files with substantial XML doc comments successfully!")
     print(f"Skipped {skipped} files (no XML doc or too short).")
@@ -4,203 +4,125 @@ CLI script to extract docstrings from Python files and save them as Markdown fil
 """
 
 import os
-import ast
 import argparse
+import sys
 from pathlib import Path
 
+# Add parent directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.doc_manifest import DocManifest
+from utils.doc_records import records_line_count
+from utils.markdown_builder import MarkdownBuilder, report_written, write_markdown_file
+from utils.output_helpers import get_output_base_dir
+from utils.py_docstrings import (DocstringCache, PYTHON_EXTENSIONS, SKIP_DIRS, add_docstring_sections, default_cache_path,
+                                 extract_docstring_records, find_python_files)
+from utils.symbol_index import DEFAULT_INDEX_NAME, SymbolIndex, records_to_symbols
 
-def extract_docstring(file_path):
-    """
-    Extract docstrings from a Python file (module, functions, and classes).
-    
-    Args:
-        file_path (str): Path to the Python file
-        
-    Returns:
-        str: Combined docstrings content or empty string if no docstrings found
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # Parse the Python file into an AST
-        tree = ast.parse(content)
-        
-        docstrings = []
-        
-        # Get module-level docstring
-        module_docstring = None
-        if (tree.body and 
-            isinstance(tree.body[0], ast.Expr) and 
-            isinstance(tree.body[0].value, ast.Constant) and 
-            isinstance(tree.body[0].value.value, str)):
-            module_docstring = tree.body[0].value.value.strip()
-            if module_docstring:
-                docstrings.append(f"MODULE:{module_docstring}")
-        
-        # Extract function and class docstrings
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                if (node.body and 
-                    isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant) and 
-                    isinstance(node.body[0].value.value, str)):
-                    func_doc = node.body[0].value.value.strip()
-                    if func_doc:
-                        docstrings.append(f"FUNCTION:{node.name}:{func_doc}")
-            
-            elif isinstance(node, ast.ClassDef):
-                if (node.body and 
-                    isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant) and 
-                    isinstance(node.body[0].value.value, str)):
-                    class_doc = node.body[0].value.value.strip()
-                    if class_doc:
-                        docstrings.append(f"CLASS:{node.name}:{class_doc}")
-        
-        return "\n\n".join(docstrings) if docstrings else ""
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return ""
 
-
-def find_python_files(directory):
-    """
-    Recursively find all Python files in a directory.
-    
-    Args:
-        directory (str): Directory to search in
-        
-    Returns:
-        list: List of Python file paths
-    """
-    # Directories to skip
-    skip_dirs = {
-        'venv', 'env', '.venv', '.env',
-        '__pycache__', '.git', '.svn', '.hg',
-        'node_modules', '.pytest_cache', '.mypy_cache',
-        'build', 'dist', '.tox', '.eggs',
-        'site-packages', 'lib', 'lib64'
-    }
-    
-    python_files = []
-    for root, dirs, files in os.walk(directory):
-        # Remove directories we want to skip from the dirs list
-        # This prevents os.walk from descending into them
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        
-        for file in files:
-            if file.endswith('.py'):
-                python_files.append(os.path.join(root, file))
-    return python_files
+# Bump when the generated Markdown changes so incremental runs regenerate every file
+MANIFEST_VERSION = 3
 
 
-def create_markdown_file(py_file_path, docstring, output_dir, project_name):
+def create_markdown_file(py_file_path, records, output_dir, project_name, manifest=None):
     """
     Create a markdown file with the extracted docstring.
     
     Args:
         py_file_path (str): Original Python file path
-        docstring (str): Extracted docstring
+        records (list): DocRecord objects from extract_docstring_records()
         output_dir (str): Output directory for markdown files
         project_name (str): Name of the project (last part of folder path)
+        manifest (DocManifest): Optional manifest; unchanged files are not rewritten
+        
+    Returns:
+        str: Path of the markdown file
     """
     # Get the filename without extension
     file_name = Path(py_file_path).stem
     md_file_path = os.path.join(output_dir, f"{file_name}.md")
     
     # Create markdown content with new header format
-    md_content = f"# {file_name}\n\n"
-    md_content += "---\n"
-    md_content += f"Project: {project_name}\n"
-    md_content += f"Programming Language: Python\n"
-    md_content += "---\n\n"
+    md = MarkdownBuilder()
+    md.add(f"# {file_name}\n\n", "---\n", f"Project: {project_name}\n", "Programming Language: Python\n", "---\n\n")
     
-    if docstring:
-        # Parse the structured docstring
-        sections = docstring.split('\n\n')
-        
-        module_doc = None
-        functions = []
-        classes = []
-        
-        for section in sections:
-            if section.startswith('MODULE:'):
-                module_doc = section.replace('MODULE:', '', 1).strip()
-            elif section.startswith('FUNCTION:'):
-                # Parse FUNCTION:name:docstring
-                parts = section.replace('FUNCTION:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    func_name, func_docstring = parts
-                    functions.append({
-                        'name': func_name.strip(),
-                        'docstring': func_docstring.strip()
-                    })
-            elif section.startswith('CLASS:'):
-                # Parse CLASS:name:docstring
-                parts = section.replace('CLASS:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    class_name, class_docstring = parts
-                    classes.append({
-                        'name': class_name.strip(),
-                        'docstring': class_docstring.strip()
-                    })
-        
-        # Add Info section
-        md_content += "## Info\n\n"
-        
-        # Add module documentation
-        if module_doc:
-            md_content += f"{module_doc}\n\n"
+    if records:
+        add_docstring_sections(md, records)
+    else:
+        md.add("## Info\n\n*No docstring found*\n")
+    
+    # Write the markdown file
+    report_written(write_markdown_file(md_file_path, md.getvalue(), manifest))
+    return md_file_path
+
+def process_python_files(python_files, output_dir, project_name, manifest=None, cache=None, index=None, root=None):
+    """
+    Extract the docstrings of each file and write a Markdown file for every
+    file with substantial documentation.
+    
+    With a manifest, files unchanged since the last run are not parsed again
+    and the docs of removed files are deleted. With a symbol index, the
+    documented definitions of every parsed file are stored in it (files
+    missing from the index are always parsed).
+    
+    Args:
+        python_files (list): Python file paths
+        output_dir (str): Output directory for markdown files
+        project_name (str): Name of the project (last part of folder path)
+        manifest (DocManifest): Optional incremental build manifest
+        cache (DocstringCache): Optional parse cache
+        index (SymbolIndex): Optional symbol index
+        root (str): Resolved project folder (required with an index)
         
-        # Add functions section
-        if functions:
-            if len(functions) == 1:
-                func = functions[0]
-                md_content += f"**Function**: `{func['name']}`\n\n"
-                md_content += f"{func['docstring']}\n\n"
+    Returns:
+        tuple: (processed count, skipped count)
+    """
+    processed = 0
+    skipped = 0
+    unchanged = 0
+    root = str(root) if root is not None else None
+    indexed = index.files('py', root) if index is not None else None
+    for py_file in python_files:
+        status = manifest.lookup(py_file) if manifest is not None else None
+        if status is not None and indexed is not None and os.path.relpath(os.path.abspath(py_file), root) not in indexed:
+            status = None
+        if status is not None:
+            unchanged += 1
+            if status == 'ok':
+                processed += 1
             else:
-                md_content += "**Functions**:\n"
-                for func in functions:
-                    # Extract first line as summary
-                    first_line = func['docstring'].split('\n')[0].strip()
-                    md_content += f"- `{func['name']}`: {first_line}\n"
-                md_content += "\n"
-                
-                # Add detailed docstrings for each function
-                for func in functions:
-                    md_content += f"### `{func['name']}`\n\n"
-                    md_content += f"{func['docstring']}\n\n"
+                skipped += 1
+            continue
         
-        # Add classes section
-        if classes:
-            if len(classes) == 1:
-                cls = classes[0]
-                md_content += f"**Class**: `{cls['name']}`\n\n"
-                md_content += f"{cls['docstring']}\n\n"
-            else:
-                md_content += "**Classes**:\n"
-                for cls in classes:
-                    # Extract first line as summary
-                    first_line = cls['docstring'].split('\n')[0].strip()
-                    md_content += f"- `{cls['name']}`: {first_line}\n"
-                md_content += "\n"
-                
-                # Add detailed docstrings for each class
-                for cls in classes:
-                    md_content += f"### `{cls['name']}`\n\n"
-                    md_content += f"{cls['docstring']}\n\n"
+        records = extract_docstring_records(py_file, cache)
+        if index is not None:
+            index.replace_file('py', root, os.path.relpath(os.path.abspath(py_file), root),
+                               records_to_symbols(records, Path(py_file).stem))
         
-    else:
-        md_content += "## Info\n\n*No docstring found*\n"
-    
-    # Write the markdown file
-    try:
-        with open(md_file_path, 'w', encoding='utf-8') as md_file:
-            md_file.write(md_content)
-        print(f"Created: {md_file_path}")
-    except Exception as e:
-        print(f"Error writing {md_file_path}: {e}")
+        if records_line_count(records) > 3:  # Only create file if docstring exists and is more than 3 lines
+            md_file_path = create_markdown_file(py_file, records, output_dir, project_name, manifest)
+            processed += 1
+            if manifest is not None:
+                manifest.record(py_file, 'ok', [md_file_path])
+        else:
+            skipped += 1
+            if records:
+                print(f"Skipped (docstring too short): {py_file}")
+            else:
+                print(f"Skipped (no docstring): {py_file}")
+            if manifest is not None:
+                manifest.record(py_file, 'skipped')
+    
+    if index is not None:
+        index.prune('py', root, {os.path.relpath(os.path.abspath(py_file), root) for py_file in python_files})
+        index.commit()
+    
+    if manifest is not None:
+        for md_file_path in manifest.finish():
+            print(f"Removed: {md_file_path}")
+        if unchanged:
+            print(f"Unchanged since last run (not parsed): {unchanged} files")
+    return processed, skipped
+
 
 def main():
     """Main function to handle CLI arguments and process files."""
@@ -216,6 +138,25 @@ def main():
         default="./extracted",
         help="Output directory for markdown files (default: ./extracted)"
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Parse and rewrite every file instead of only files changed since the last run"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not use the parse cache (always parse files again)"
+    )
+    parser.add_argument(
+        "--index",
+        help=f"Symbol index database to update (default: {DEFAULT_INDEX_NAME} in the extractors' _outputs folder)"
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not update the symbol index"
+    )
     
     args = parser.parse_args()
     
@@ -245,19 +186,15 @@ def main():
     print("-" * 50)
     
     # Process each Python file
-    processed = 0
-    skipped = 0
-    for py_file in python_files:
-        docstring = extract_docstring(py_file)
-        if docstring.strip() and len(docstring.strip().split('\n')) > 3:  # Only create file if docstring exists and is more than 3 lines
-            create_markdown_file(py_file, docstring, output_dir, project_name)
-            processed += 1
-        else:
-            skipped += 1
-            if docstring.strip():
-                print(f"Skipped (docstring too short): {py_file}")
-            else:
-                print(f"Skipped (no docstring): {py_file}")
+    manifest = DocManifest(output_dir, folder_path, 'py', MANIFEST_VERSION, full=args.full).load()
+    cache = DocstringCache(None if args.no_cache else default_cache_path(folder_path, __file__)).load()
+    index = None if args.no_index else SymbolIndex(args.index or os.path.join(get_output_base_dir(), DEFAULT_INDEX_NAME))
+    processed, skipped = process_python_files(
+        python_files, output_dir, project_name, manifest, cache, index, folder_path
+    )
+    cache.save()
+    if index is not None:
+        index.close()
     
     print("-" * 50)
     print(f"Processed {processed} files with substantial docstrings successfully!")
@@ -7,11 +7,18 @@ import os
 import re
 import argparse
 import sys
+from functools import partial
 from pathlib import Path
 
 # Add parent directories to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.doc_manifest import DocManifest
+from utils.doc_records import make_record, records_line_count
+from utils.file_scanner import DEFAULT_SKIP_DIRS, scan_files
+from utils.markdown_builder import MarkdownBuilder, as_is, first_line, group_records, report_written, write_markdown_file
 from utils.output_helpers import get_output_base_dir
+from utils.parallel import OrderedWriter, ordered_map, resolve_jobs
+from utils.symbol_index import DEFAULT_INDEX_NAME, SymbolIndex, records_to_symbols
 
 # Simple JSDoc parser implementation integrated directly
 def parse_jsdoc_content(jsdoc_text):
@@ -291,96 +298,169 @@ def format_jsdoc_as_markdown(parsed_jsdoc):
     return '\n\n'.join(md_parts)
 
 
-def extract_jsdoc_comments(file_path):
+# JSDoc block comments (/** ... */)
+JSDOC_RE = re.compile(r'/\*\*(.*?)\*/', re.DOTALL)
+
+# Leading "* " of each JSDoc line
+JSDOC_LINE_PREFIX_RE = re.compile(r'^[^\S\n]*\*[^\S\n]?', re.MULTILINE)
+
+# Whitespace, line comments and plain (non-JSDoc) block comments
+TRIVIA_RE = re.compile(r'(?:\s+|//[^\n]*|/\*(?!\*).*?\*/)*', re.DOTALL)
+
+# Decorator name (@Component, @Input, @core.Injectable, ...)
+DECORATOR_RE = re.compile(r'@\s*([\w$.]+)\s*')
+
+# Tokens that matter when skipping a decorator's arguments: brackets,
+# strings and comments (which may contain unbalanced brackets)
+BRACKET_TOKEN_RE = re.compile(
+    r'[()\[\]{}]'
+    r'|"(?:\\.|[^"\\])*"'
+    r"|'(?:\\.|[^'\\])*'"
+    r'|`(?:\\.|[^`\\])*`'
+    r'|//[^\n]*'
+    r'|/\*.*?\*/',
+    re.DOTALL
+)
+
+# The declaration a JSDoc comment documents, matched right after the comment
+DECLARATION_RE = re.compile(r'''
+    (?:export\s+(?:default\s+)?)?
+    (?:declare\s+)?
+    (?:(?:abstract|async)\s+)*
+    (?:
+        function\s*\*?\s*(?P<FUNCTION>[\w$]+)
+      | class\s+(?P<CLASS>[\w$]+)
+      | interface\s+(?P<INTERFACE>[\w$]+)
+      | (?:const|let|var)\s+(?P<VARIABLE>[\w$]+)\s*[:=]
+    )
+''', re.VERBOSE)
+
+
+def skip_balanced(content, pos):
     """
-    Extract JSDoc comments from a TypeScript/JavaScript file.
-    
+    Skip a bracketed expression starting at content[pos], honouring strings and comments.
+
+    Args:
+        content (str): Source text
+        pos (int): Index of the opening bracket
+
+    Returns:
+        int: Index just past the matching closing bracket (len(content) if unbalanced)
+    """
+    depth = 0
+    for token in BRACKET_TOKEN_RE.finditer(content, pos):
+        char = token.group()
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return len(content)
+
+
+def find_declaration(content, pos):
+    """
+    Identify the declaration that follows a JSDoc comment.
+
+    Skips whitespace, plain comments and decorators (with their arguments),
+    then matches the declaration at the first remaining token only.
+
+    Args:
+        content (str): Source text
+        pos (int): Index just past the JSDoc comment
+
+    Returns:
+        tuple: (doc type, name), or (None, None) if the next token does not
+               start a function, class, interface or variable declaration.
+               Classes decorated with @Component are reported as COMPONENT.
+    """
+    component = False
+    while True:
+        pos = TRIVIA_RE.match(content, pos).end()
+        decorator = DECORATOR_RE.match(content, pos)
+        if not decorator:
+            break
+        component = component or decorator.group(1).rsplit('.', 1)[-1] == 'Component'
+        pos = decorator.end()
+        if content.startswith('(', pos):
+            pos = skip_balanced(content, pos)
+
+    declaration = DECLARATION_RE.match(content, pos)
+    if not declaration:
+        return None, None
+    doc_type = declaration.lastgroup
+    if doc_type == 'CLASS' and component:
+        doc_type = 'COMPONENT'
+    return doc_type, declaration.group(declaration.lastgroup)
+
+
+def extract_jsdoc_records(file_path):
+    """
+    Extract the JSDoc comments of a TypeScript/JavaScript file as records.
+
     Args:
         file_path (str): Path to the TypeScript/JavaScript file
-        
+
     Returns:
-        str: Combined JSDoc comments content or empty string if none found
+        list: DocRecord objects in file order
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             content = file.read()
-        
-        # Find all JSDoc comments (/** ... */)
-        jsdoc_pattern = r'/\*\*(.*?)\*/'
-        matches = re.finditer(jsdoc_pattern, content, re.DOTALL)
-        
+
         docstrings = []
-        
-        for match in matches:
-            jsdoc_content = match.group(1).strip()
-            start_pos = match.end()
-            
-            # Clean up the JSDoc content
-            lines = jsdoc_content.split('\n')
-            cleaned_lines = []
-            
-            for line in lines:
-                # Remove leading * and whitespace
-                cleaned_line = re.sub(r'^\s*\*\s?', '', line)
-                cleaned_lines.append(cleaned_line)
-            
-            cleaned_jsdoc = '\n'.join(cleaned_lines).strip()
-            
+        line = 1
+        last_pos = 0
+
+        for match in JSDOC_RE.finditer(content):
+            line += content.count('\n', last_pos, match.start())
+            last_pos = match.start()
+
+            # Clean up the JSDoc content (remove leading * and whitespace)
+            cleaned_jsdoc = JSDOC_LINE_PREFIX_RE.sub('', match.group(1).strip()).strip()
+
             if cleaned_jsdoc:
                 # Check if this is file-level documentation first
                 if '@file' in cleaned_jsdoc or '@fileoverview' in cleaned_jsdoc:
                     doc_type = 'MODULE'
                     name = 'module'
                 else:
-                    # Look for the next code element after this JSDoc comment
-                    # Check for various declaration patterns
-                    remaining_content = content[start_pos:start_pos + 1000]  # Look ahead 1000 chars
-                    
-                    # Patterns for different code elements
-                    patterns = [
-                        (r'^\s*export\s+(?:default\s+)?(?:async\s+)?function\s+(\w+)', 'FUNCTION'),
-                        (r'^\s*(?:async\s+)?function\s+(\w+)', 'FUNCTION'),
-                        (r'^\s*export\s+(?:default\s+)?class\s+(\w+)', 'CLASS'),
-                        (r'^\s*class\s+(\w+)', 'CLASS'),
-                        (r'^\s*export\s+(?:default\s+)?interface\s+(\w+)', 'INTERFACE'),
-                        (r'^\s*interface\s+(\w+)', 'INTERFACE'),
-                        (r'^\s*export\s+const\s+(\w+)\s*[:=]', 'VARIABLE'),
-                        (r'^\s*const\s+(\w+)\s*[:=]', 'VARIABLE'),
-                        (r'^\s*export\s+let\s+(\w+)\s*[:=]', 'VARIABLE'),
-                        (r'^\s*let\s+(\w+)\s*[:=]', 'VARIABLE'),
-                        (r'^\s*export\s+var\s+(\w+)\s*[:=]', 'VARIABLE'),
-                        (r'^\s*var\s+(\w+)\s*[:=]', 'VARIABLE'),
-                    ]
-                    
-                    name = None
-                    doc_type = 'COMMENT'
-                    
-                    for pattern, pattern_type in patterns:
-                        code_match = re.search(pattern, remaining_content, re.MULTILINE)
-                        if code_match:
-                            name = code_match.group(1)
-                            doc_type = pattern_type
-                            break
-                    
-                    # If no specific pattern matched, check if it's at the beginning of file (module doc)
-                    if not name and match.start() < 200:  # If JSDoc is near the beginning of file
+                    # Match the code element right after this JSDoc comment
+                    doc_type, name = find_declaration(content, match.end())
+
+                    # If nothing matched, check if it's the first JSDoc at the beginning of file (module doc)
+                    if not name and not docstrings and match.start() < 200:
                         doc_type = 'MODULE'
                         name = 'module'
-                
+
                 # Add the docstring
                 if name:
-                    docstrings.append(f"{doc_type}:{name}:{cleaned_jsdoc}")
+                    docstrings.append(make_record(doc_type, name, line, cleaned_jsdoc))
                 else:
                     # If we can't identify what it documents, still include it as a general comment
                     # Extract first few words as identifier
                     first_words = ' '.join(cleaned_jsdoc.split()[:3])
-                    docstrings.append(f"COMMENT:{first_words}:{cleaned_jsdoc}")
-        
-        return "\n\n".join(docstrings) if docstrings else ""
-    
+                    docstrings.append(make_record('COMMENT', first_words, line, cleaned_jsdoc))
+
+        return docstrings
+
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
-        return ""
+        return []
+
+
+# Bump when the generated Markdown changes so incremental runs regenerate every file
+MANIFEST_VERSION = 2
+
+# File extensions to include
+TS_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
+
+# Directories to skip
+SKIP_DIRS = DEFAULT_SKIP_DIRS | {
+    '.next', '.nuxt', 'coverage', '.nyc_output', '.cache',
+    'venv', 'env', '.venv', '.env',
+}
 
 
 def find_typescript_files(directory):
@@ -393,40 +473,33 @@ def find_typescript_files(directory):
     Returns:
         list: List of TypeScript/JavaScript file paths
     """
-    # Directories to skip
-    skip_dirs = {
-        'node_modules', '.git', '.svn', '.hg',
-        'dist', 'build', '.next', '.nuxt',
-        'coverage', '.nyc_output', '.cache',
-        'venv', 'env', '.venv', '.env',
-        '__pycache__', '.pytest_cache', '.mypy_cache',
-        '.tox', '.eggs', 'site-packages'
-    }
-    
-    # File extensions to include
-    extensions = {'.ts', '.tsx', '.js', '.jsx'}
-    
-    typescript_files = []
-    for root, dirs, files in os.walk(directory):
-        # Remove directories we want to skip from the dirs list
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        
-        for file in files:
-            if any(file.endswith(ext) for ext in extensions):
-                typescript_files.append(os.path.join(root, file))
-    
-    return typescript_files
+    return [source.path for source in scan_files(directory, TS_EXTENSIONS, SKIP_DIRS)]
+
+
+def summarize_function(parsed_jsdoc):
+    """Return the bullet-list summary of a function: the first line of its description."""
+    description = parsed_jsdoc.get('description', '').strip()
+    if description:
+        # Get the first meaningful line of description
+        summary = description.split('\n')[0].strip()
+        # Remove any residual JSDoc tags that might have leaked through
+        summary = re.sub(r'^@\w+\s*', '', summary)
+        if summary:
+            return summary
+    return "Function documentation"
 
 
-def create_markdown_file(ts_file_path, jsdoc_content, output_dir, project_name, input_root=None):
+def render_markdown_file(ts_file_path, records, output_dir, project_name, input_root=None):
     """
-    Create a markdown file with the extracted JSDoc content, mimicking the original folder structure.
+    Build the markdown for one file, mimicking the original folder structure.
     Args:
         ts_file_path (str): Original TypeScript/JavaScript file path
-        jsdoc_content (str): Extracted JSDoc content
+        records (list): DocRecord objects from extract_jsdoc_records()
         output_dir (str): Output directory for markdown files
         project_name (str): Name of the project (last part of folder path)
         input_root (str): Root input folder to calculate relative path (optional)
+    Returns:
+        tuple: (markdown file path, markdown content)
     """
     file_name = Path(ts_file_path).stem
     # Determine relative path from input_root (if provided)
@@ -436,7 +509,6 @@ def create_markdown_file(ts_file_path, jsdoc_content, output_dir, project_name,
         target_dir = os.path.join(output_dir, rel_dir)
     else:
         target_dir = output_dir
-    os.makedirs(target_dir, exist_ok=True)
     md_file_path = os.path.join(target_dir, f"{file_name}.md")
     
     # Get file extension to determine programming language
@@ -449,269 +521,175 @@ def create_markdown_file(ts_file_path, jsdoc_content, output_dir, project_name,
         programming_language = file_ext[1:].upper() if file_ext else 'Unknown'
     
     # Create markdown content with new header format
-    md_content = f"# {file_name}\n\n"
-    md_content += "---\n"
-    md_content += f"Project: {project_name}\n"
-    md_content += f"Programming Language: {programming_language}\n"
+    md = MarkdownBuilder()
+    md.add(f"# {file_name}\n\n", "---\n", f"Project: {project_name}\n", f"Programming Language: {programming_language}\n")
+    
+    # Group the records by kind once; every section below reads its own group
+    groups = group_records(records)
     
-    # Detect file type from JSDoc content for header
+    # Detect file type from the JSDoc tags and declaration kinds for header
+    all_jsdoc = '\n'.join(record.doc for record in records)
     file_type = None
-    if '@component' in jsdoc_content or 'COMPONENT:' in jsdoc_content:
+    if '@component' in all_jsdoc or 'COMPONENT' in groups:
         file_type = 'Component'
-    elif '@function' in jsdoc_content or 'FUNCTION:' in jsdoc_content:
+    elif '@function' in all_jsdoc or 'FUNCTION' in groups:
         file_type = 'Function'
-    elif '@class' in jsdoc_content or 'CLASS:' in jsdoc_content:
+    elif '@class' in all_jsdoc or 'CLASS' in groups:
         file_type = 'Class'
-    elif '@interface' in jsdoc_content or 'INTERFACE:' in jsdoc_content:
+    elif '@interface' in all_jsdoc or 'INTERFACE' in groups:
         file_type = 'Interface'
-    elif '@module' in jsdoc_content or 'MODULE:' in jsdoc_content:
+    elif '@module' in all_jsdoc or 'MODULE' in groups:
         file_type = 'Module'
-    elif '@file' in jsdoc_content:
+    elif '@file' in all_jsdoc:
         file_type = 'File'
     
     if file_type:
-        md_content += f"File Type: {file_type}\n"
+        md.add(f"File Type: {file_type}\n")
     
-    md_content += "---\n\n"
+    md.add("---\n\n")
     
-    if jsdoc_content:
-        # Parse the structured JSDoc content
-        # Split on prefixes instead of double newlines to preserve JSDoc integrity
-        sections = []
-        current_section = ""
-        
-        for line in jsdoc_content.split('\n'):
-            if any(line.startswith(prefix) for prefix in ['MODULE:', 'FUNCTION:', 'CLASS:', 'INTERFACE:', 'VARIABLE:', 'COMPONENT:', 'COMMENT:']):
-                if current_section:
-                    sections.append(current_section)
-                current_section = line
-            else:
-                if current_section:
-                    current_section += '\n' + line
-                else:
-                    current_section = line
-        
-        if current_section:
-            sections.append(current_section)
-        
-        module_doc = None
-        functions = []
-        classes = []
-        interfaces = []
-        variables = []
-        components = []
-        comments = []
-        
-        for section in sections:
-            if section.startswith('MODULE:'):
-                module_doc = section.replace('MODULE:', '', 1).strip()
-            elif section.startswith('FUNCTION:'):
-                # Parse FUNCTION:name:jsdoc
-                parts = section.replace('FUNCTION:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    func_name, func_jsdoc = parts
-                    functions.append({
-                        'name': func_name.strip(),
-                        'jsdoc': func_jsdoc.strip()
-                    })
-            elif section.startswith('CLASS:'):
-                # Parse CLASS:name:jsdoc
-                parts = section.replace('CLASS:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    class_name, class_jsdoc = parts
-                    classes.append({
-                        'name': class_name.strip(),
-                        'jsdoc': class_jsdoc.strip()
-                    })
-            elif section.startswith('INTERFACE:'):
-                # Parse INTERFACE:name:jsdoc
-                parts = section.replace('INTERFACE:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    interface_name, interface_jsdoc = parts
-                    interfaces.append({
-                        'name': interface_name.strip(),
-                        'jsdoc': interface_jsdoc.strip()
-                    })
-            elif section.startswith('VARIABLE:'):
-                # Parse VARIABLE:name:jsdoc
-                parts = section.replace('VARIABLE:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    var_name, var_jsdoc = parts
-                    variables.append({
-                        'name': var_name.strip(),
-                        'jsdoc': var_jsdoc.strip()
-                    })
-            elif section.startswith('COMPONENT:'):
-                # Parse COMPONENT:name:jsdoc
-                parts = section.replace('COMPONENT:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    comp_name, comp_jsdoc = parts
-                    components.append({
-                        'name': comp_name.strip(),
-                        'jsdoc': comp_jsdoc.strip()
-                    })
-            elif section.startswith('COMMENT:'):
-                # Parse COMMENT:identifier:jsdoc
-                parts = section.replace('COMMENT:', '', 1).split(':', 1)
-                if len(parts) == 2:
-                    comment_id, comment_jsdoc = parts
-                    comments.append({
-                        'id': comment_id.strip(),
-                        'jsdoc': comment_jsdoc.strip()
-                    })
-        
-        # Add Info section
-        md_content += "## Info\n\n"
-        
-        # Add module documentation
-        if module_doc:
-            # Parse the module documentation properly
-            parsed_module = parse_jsdoc_content(module_doc)
-            if parsed_module.get('description'):
-                md_content += f"{parsed_module['description']}\n\n"
-            # Add file metadata if present
-            metadata = parsed_module.get('metadata', {})
-            if metadata:
-                metadata_parts = []
-                for key, value in metadata.items():
-                    if key == 'version':
-                        metadata_parts.append(f"**Version**: {value}")
-                    elif key == 'author':
-                        metadata_parts.append(f"**Author**: {value}")
-                    elif key == 'since':
-                        metadata_parts.append(f"**Since**: {value}")
-                    elif key == 'file':
-                        metadata_parts.append(f"**File**: {value}")
-                
-                if metadata_parts:
-                    md_content += '\n'.join(metadata_parts) + "\n\n"
-        
-        # Add functions section
-        if functions:
-            if len(functions) == 1:
-                func = functions[0]
-                md_content += f"**Function**: `{func['name']}`\n\n"
-                # Parse and format the JSDoc
-                parsed_jsdoc = parse_jsdoc_content(func['jsdoc'])
-                formatted_jsdoc = format_jsdoc_as_markdown(parsed_jsdoc)
-                md_content += f"{formatted_jsdoc}\n\n"
-            else:
-                md_content += "**Functions**:\n"
-                for func in functions:
-                    # Extract first line as summary - make sure to get the description, not tag content
-                    parsed_jsdoc = parse_jsdoc_content(func['jsdoc'])
-                    description = parsed_jsdoc.get('description', '').strip()
-                    if description:
-                        # Get the first meaningful line of description
-                        first_line = description.split('\n')[0].strip()
-                        # Remove any residual JSDoc tags that might have leaked through
-                        first_line = re.sub(r'^@\w+\s*', '', first_line)
-                        if not first_line:
-                            first_line = "Function documentation"
-                    else:
-                        first_line = "Function documentation"
-                    md_content += f"- `{func['name']}`: {first_line}\n"
-                md_content += "\n"
-                
-                # Add detailed JSDoc for each function
-                for func in functions:
-                    md_content += f"### `{func['name']}`\n\n"
-                    parsed_jsdoc = parse_jsdoc_content(func['jsdoc'])
-                    formatted_jsdoc = format_jsdoc_as_markdown(parsed_jsdoc)
-                    md_content += f"{formatted_jsdoc}\n\n"
-        
-        # Add classes section
-        if classes:
-            if len(classes) == 1:
-                cls = classes[0]
-                md_content += f"**Class**: `{cls['name']}`\n\n"
-                md_content += f"{cls['jsdoc']}\n\n"
-            else:
-                md_content += "**Classes**:\n"
-                for cls in classes:
-                    # Extract first line as summary
-                    first_line = cls['jsdoc'].split('\n')[0].strip()
-                    md_content += f"- `{cls['name']}`: {first_line}\n"
-                md_content += "\n"
-                
-                # Add detailed JSDoc for each class
-                for cls in classes:
-                    md_content += f"### `{cls['name']}`\n\n"
-                    md_content += f"{cls['jsdoc']}\n\n"
-        
-        # Add interfaces section
-        if interfaces:
-            if len(interfaces) == 1:
-                iface = interfaces[0]
-                md_content += f"**Interface**: `{iface['name']}`\n\n"
-                md_content += f"{iface['jsdoc']}\n\n"
-            else:
-                md_content += "**Interfaces**:\n"
-                for iface in interfaces:
-                    # Extract first line as summary
-                    first_line = iface['jsdoc'].split('\n')[0].strip()
-                    md_content += f"- `{iface['name']}`: {first_line}\n"
-                md_content += "\n"
-                
-                # Add detailed JSDoc for each interface
-                for iface in interfaces:
-                    md_content += f"### `{iface['name']}`\n\n"
-                    md_content += f"{iface['jsdoc']}\n\n"
-        
-        # Add variables section
-        if variables:
-            if len(variables) == 1:
-                var = variables[0]
-                md_content += f"**Variable**: `{var['name']}`\n\n"
-                md_content += f"{var['jsdoc']}\n\n"
+    if not records:
+        md.add("## Info\n\n*No JSDoc comments found*\n")
+        return md_file_path, md.getvalue()
+    
+    # Add Info section
+    md.add("## Info\n\n")
+    
+    # Add module documentation (the last module comment wins)
+    if groups['MODULE']:
+        # Parse the module documentation properly
+        parsed_module = parse_jsdoc_content(groups['MODULE'][-1].doc)
+        if parsed_module.get('description'):
+            md.add(f"{parsed_module['description']}\n\n")
+        # Add file metadata if present
+        metadata = parsed_module.get('metadata', {})
+        if metadata:
+            metadata_parts = []
+            for key, value in metadata.items():
+                if key == 'version':
+                    metadata_parts.append(f"**Version**: {value}")
+                elif key == 'author':
+                    metadata_parts.append(f"**Author**: {value}")
+                elif key == 'since':
+                    metadata_parts.append(f"**Since**: {value}")
+                elif key == 'file':
+                    metadata_parts.append(f"**File**: {value}")
+            
+            if metadata_parts:
+                md.add('\n'.join(metadata_parts), "\n\n")
+    
+    # Add functions section (each JSDoc is parsed once for summary and details)
+    if groups['FUNCTION']:
+        md.member_section(
+            'Function', 'Functions',
+            [(record.name, parse_jsdoc_content(record.doc)) for record in groups['FUNCTION']],
+            summarize_function, format_jsdoc_as_markdown
+        )
+    
+    # Add classes, interfaces, variables and components sections
+    for kind, label, plural in (('CLASS', 'Class', 'Classes'),
+                                ('INTERFACE', 'Interface', 'Interfaces'),
+                                ('VARIABLE', 'Variable', 'Variables'),
+                                ('COMPONENT', 'Component', 'Components')):
+        if groups[kind]:
+            md.member_section(label, plural, [(record.name, record.doc) for record in groups[kind]], first_line, as_is)
+    
+    # Add comments section (for JSDoc that couldn't be associated with specific code)
+    if groups['COMMENT']:
+        md.add("**Documentation**:\n\n")
+        for record in groups['COMMENT']:
+            md.add(record.doc, "\n\n")
+    
+    return md_file_path, md.getvalue()
+
+
+def extract_file(ts_file, output_dir, project_name, input_root):
+    """
+    Extract and render one file. Runs in a worker process with --jobs.
+    Args:
+        ts_file (str): TypeScript/JavaScript file path
+        output_dir (str): Output directory for markdown files
+        project_name (str): Name of the project (last part of folder path)
+        input_root (Path): Root input folder
+    Returns:
+        tuple: (ts_file, status, md_file_path, md_content, records) where
+               status is 'ok', 'short' (JSDoc too short) or 'none' (no JSDoc)
+    """
+    records = extract_jsdoc_records(ts_file)
+    if records_line_count(records) > 3:
+        md_file_path, md_content = render_markdown_file(ts_file, records, output_dir, project_name, input_root)
+        return ts_file, 'ok', md_file_path, md_content, records
+    return ts_file, 'short' if records else 'none', None, None, records
+
+
+def process_typescript_files(typescript_files, output_dir, folder_path, jobs=1, manifest=None, index=None):
+    """
+    Extract the JSDoc of each file and write a Markdown file for every file
+    with substantial documentation.
+
+    With more than one job the files are parsed in a process pool and the
+    Markdown files are written by a thread pool; messages are still printed
+    in file order. With a manifest, files unchanged since the last run are
+    not parsed again and the docs of removed files are deleted. With a
+    symbol index, the documented declarations of every parsed file are
+    stored in it (files missing from the index are always parsed).
+
+    Args:
+        typescript_files (list): TypeScript/JavaScript file paths
+        output_dir (str): Output directory for markdown files
+        folder_path (Path): Resolved input folder (project root)
+        jobs (int): Number of worker processes
+        manifest (DocManifest): Optional incremental build manifest
+        index (SymbolIndex): Optional symbol index
+
+    Returns:
+        tuple: (processed count, skipped count)
+    """
+    processed = 0
+    skipped = 0
+    root = str(folder_path)
+    indexed = index.files('ts', root) if index is not None else None
+    changed_files = typescript_files
+    if manifest is not None:
+        changed_files = []
+        for ts_file in typescript_files:
+            status = manifest.lookup(ts_file)
+            if status is not None and indexed is not None and os.path.relpath(os.path.abspath(ts_file), root) not in indexed:
+                status = None
+            if status is None:
+                changed_files.append(ts_file)
+            elif status == 'ok':
+                processed += 1
             else:
-                md_content += "**Variables**:\n"
-                for var in variables:
-                    # Extract first line as summary
-                    first_line = var['jsdoc'].split('\n')[0].strip()
-                    md_content += f"- `{var['name']}`: {first_line}\n"
-                md_content += "\n"
-                
-                # Add detailed JSDoc for each variable
-                for var in variables:
-                    md_content += f"### `{var['name']}`\n\n"
-                    md_content += f"{var['jsdoc']}\n\n"
-        
-        # Add components section
-        if components:
-            if len(components) == 1:
-                comp = components[0]
-                md_content += f"**Component**: `{comp['name']}`\n\n"
-                md_content += f"{comp['jsdoc']}\n\n"
+                skipped += 1
+    unchanged = len(typescript_files) - len(changed_files)
+
+    worker = partial(extract_file, output_dir=output_dir, project_name=folder_path.name, input_root=folder_path)
+    with OrderedWriter(jobs) as writer:
+        for ts_file, status, md_file_path, md_content, records in ordered_map(worker, changed_files, jobs):
+            if status == 'ok':
+                writer.submit(write_markdown_file, md_file_path, md_content, manifest, on_done=report_written)
+                processed += 1
             else:
-                md_content += "**Components**:\n"
-                for comp in components:
-                    # Extract first line as summary
-                    first_line = comp['jsdoc'].split('\n')[0].strip()
-                    md_content += f"- `{comp['name']}`: {first_line}\n"
-                md_content += "\n"
-                
-                # Add detailed JSDoc for each component
-                for comp in components:
-                    md_content += f"### `{comp['name']}`\n\n"
-                    md_content += f"{comp['jsdoc']}\n\n"
-        
-        # Add comments section (for JSDoc that couldn't be associated with specific code)
-        if comments:
-            md_content += "**Documentation**:\n\n"
-            for comment in comments:
-                md_content += f"{comment['jsdoc']}\n\n"
-        
-    else:
-        md_content += "## Info\n\n*No JSDoc comments found*\n"
-    
-    # Write the markdown file
-    try:
-        with open(md_file_path, 'w', encoding='utf-8') as md_file:
-            md_file.write(md_content)
-        print(f"Created: {md_file_path}")
-    except Exception as e:
-        print(f"Error writing {md_file_path}: {e}")
+                skipped += 1
+                reason = 'JSDoc too short' if status == 'short' else 'no JSDoc'
+                writer.report(partial(print, f"Skipped ({reason}): {ts_file}"))
+            if manifest is not None:
+                manifest.record(ts_file, status, [md_file_path] if md_file_path else [])
+            if index is not None:
+                index.replace_file('ts', root, os.path.relpath(os.path.abspath(ts_file), root),
+                                   records_to_symbols(records, Path(ts_file).stem))
+
+    if index is not None:
+        index.prune('ts', root, {os.path.relpath(os.path.abspath(ts_file), root) for ts_file in typescript_files})
+        index.commit()
+
+    if manifest is not None:
+        for md_file_path in manifest.finish():
+            print(f"Removed: {md_file_path}")
+        if unchanged:
+            print(f"Unchanged since last run (not parsed): {unchanged} files")
+    return processed, skipped
 
 
 def main():
@@ -727,6 +705,26 @@ def main():
         "-o", "--output", 
         help="Output directory for markdown files (default: auto-generated)"
     )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, 0 = one per CPU)"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Parse and rewrite every file instead of only files changed since the last run"
+    )
+    parser.add_argument(
+        "--index",
+        help=f"Symbol index database to update (default: {DEFAULT_INDEX_NAME} in the extractors' _outputs folder)"
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not update the symbol index"
+    )
     args = parser.parse_args()
     if not os.path.isdir(args.folder):
         print(f"Error: '{args.folder}' is not a valid directory")
@@ -743,19 +741,13 @@ def main():
     print(f"Output directory: {output_dir}")
     print(f"Project: {project_name}")
     print("-" * 50)
-    processed = 0
-    skipped = 0
-    for ts_file in typescript_files:
-        jsdoc_content = extract_jsdoc_comments(ts_file)
-        if jsdoc_content.strip() and len(jsdoc_content.strip().split('\n')) > 3:
-            create_markdown_file(ts_file, jsdoc_content, output_dir, project_name, folder_path)
-            processed += 1
-        else:
-            skipped += 1
-            if jsdoc_content.strip():
-                print(f"Skipped (JSDoc too short): {ts_file}")
-            else:
-                print(f"Skipped (no JSDoc): {ts_file}")
+    manifest = DocManifest(output_dir, folder_path, 'ts', MANIFEST_VERSION, full=args.full).load()
+    index = None if args.no_index else SymbolIndex(args.index or os.path.join(get_output_base_dir(), DEFAULT_INDEX_NAME))
+    processed, skipped = process_typescript_files(
+        typescript_files, output_dir, folder_path, resolve_jobs(args.jobs), manifest, index
+    )
+    if index is not None:
+        index.close()
     print("-" * 50)
     print(f"Processed {processed} files with substantial JSDoc comments successfully!")
     print(f"Skipped {skipped} files (no JSDoc or too short).")
@@ -5,10 +5,23 @@ import sys
 import argparse
 import time
 import json
+import hashlib
 
 # Add parent directories to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.endpoint_graph import EndpointEdge, write_graph
+from utils.file_cache import FileResultCache
+from utils.file_scanner import scan_files
 from utils.output_helpers import get_output_base_dir
+from utils.parallel import ordered_map, resolve_jobs
+from utils.route_templates import split_path
+
+# Bump when scan_ts_file() output changes so stale per-file caches are discarded
+ENDPOINT_CACHE_VERSION = 2
+
+# Files scanned for references, and the folders left out
+TS_EXTENSIONS = {'.ts'}
+SKIP_DIRS = {'node_modules'}
 
 def normalize_endpoint(endpoint: str) -> str:
     """Normalize endpoint string by removing query strings and trailing slashes."""
@@ -18,123 +31,200 @@ def normalize_endpoint(endpoint: str) -> str:
     endpoint = endpoint.rstrip('/')
     return endpoint
 
-def strip_string_literals(s: str) -> str:
-    """Replace string literal contents with spaces, preserving length and indices.
-    Handles single, double and backtick-quoted strings with simple escape handling."""
-    string_re = re.compile(r"('(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"|`(?:\\.|[^`\\])*`)", re.DOTALL)
-    def _repl(m):
-        return ' ' * (m.end() - m.start())
-    return string_re.sub(_repl, s)
-
-def build_comment_ranges(s: str):
-    """Return list of (start, end) ranges for comments in the source string.
-    Single-line comments (//...) and multi-line (/* ... */) are detected. Assumes strings are removed."""
-    ranges = []
-    # Single-line comments
-    for m in re.finditer(r'//.*?$' , s, flags=re.MULTILINE):
-        ranges.append((m.start(), m.end()))
-    # Multi-line comments
-    for m in re.finditer(r'/\*[\s\S]*?\*/', s):
-        ranges.append((m.start(), m.end()))
-    return ranges
-
-def is_pos_in_ranges(pos: int, ranges) -> bool:
-    for a, b in ranges:
-        if a <= pos < b:
-            return True
-    return False
-
-def find_api_references(root_dir, debug=False, debug_output=None):
-    # We'll extract '/Api/...' occurrences that appear inside string literals
-    string_re = re.compile(r"""(?:(?:\"(?:\\.|[^\"\\])*\")|(?:'(?:\\.|[^'\\])*)|(?:`(?:\\.|[^`\\])*) )""", re.DOTALL)
+API_MARKER = '/Api/'
+
+# One lexer pass per file: comments, string literals and bare /Api/ markers,
+# whichever starts first. Quoted strings end at the line end (as in
+# TypeScript); template literals may span lines. An unterminated quote or
+# block comment is not a token, so scanning resumes right after it.
+API_TOKEN_RE = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\])*`)
+  | (?P<api>/Api/)
+""", re.VERBOSE | re.DOTALL)
+
+# Text following /Api/: the endpoint stops at quotes, whitespace, closing
+# brackets, ',' and ';' (raw), and also at concatenation or interpolation
+# ('+', '{', '(') (captured)
+API_TAIL_RE = re.compile(r"""([^"'`\s)\];,+{(]*)([^"'`\s)\];,]*)""")
+
+# Template path following /Api/: like the captured endpoint, but `${...}`
+# interpolations (one level of nested braces) are kept whole, so
+# `/Api/Orders/${id}/items` gives 'Orders/${id}/items'
+API_TEMPLATE_TAIL_RE = re.compile(r"""(?:[^"'`\s)\];,+{($]|\$(?!\{)|\$\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\})*""")
+
+
+def scan_api_references(content, include_comments=False):
+    """
+    Find the /Api/ occurrences of a TypeScript source in one pass.
+
+    Comments, string literals and line numbers are tracked while scanning,
+    so no stripped copy of the file or list of comment ranges is built.
+
+    Args:
+        content (str): File content
+        include_comments (bool): Also yield occurrences inside comments
+                                 (for the debug log)
+
+    Yields:
+        tuple: (line, method, in_comment, raw, captured, template) where
+               method is 'string' inside a string literal and 'regex'
+               elsewhere, raw is the text after /Api/, captured the endpoint
+               cut from it and template the path with its `${...}`
+               interpolations
+    """
+    if API_MARKER not in content:
+        return
+    line = 1
+    line_pos = 0
+    for token in API_TOKEN_RE.finditer(content):
+        kind = token.lastgroup
+        if kind == 'api':
+            positions = (token.start(),)
+        else:
+            if kind == 'comment' and not include_comments:
+                continue
+            text = token.group()
+            if API_MARKER not in text:
+                continue
+            positions = []
+            p = text.find(API_MARKER)
+            while p != -1:
+                positions.append(token.start() + p)
+                p = text.find(API_MARKER, p + len(API_MARKER))
+        for pos in positions:
+            line += content.count('\n', line_pos, pos)
+            line_pos = pos
+            tail = API_TAIL_RE.match(content, pos + len(API_MARKER))
+            method = 'string' if kind == 'string' else 'regex'
+            template = API_TEMPLATE_TAIL_RE.match(content, pos + len(API_MARKER)).group()
+            yield line, method, kind == 'comment', tail.group(1) + tail.group(2), tail.group(1), template
+
+
+def scan_ts_file(path):
+    """
+    Read one TypeScript file and collect its /Api/ occurrences, including
+    those inside comments. Runs in a worker process with --jobs.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        tuple: (path, list of [line, method, in_comment, raw, captured, template] or
+               None, error message or None)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        return path, None, str(e)
+    return path, [list(ref) for ref in scan_api_references(content, include_comments=True)], None
+
+
+def default_cache_path(root):
+    """Return the cache file used for a scanned root under _outputs/.../cache."""
+    root_hash = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(get_output_base_dir(subdirectory="cache"), f"endpoints-{root_hash}.json")
+
+
+def has_src_folder(root_dir):
+    """Return True if the tree has a 'src' folder, the only part scanned then."""
+    src_dir = Path(root_dir) / 'src'
+    return src_dir.exists() and src_dir.is_dir()
+
+
+def find_api_references(root_dir, debug=False, debug_output=None, cache=None, jobs=1, edges=None, sources=None):
+    """
+    Collect the /Api/ endpoints referenced by the TypeScript files of a tree.
+
+    With a FileResultCache, files whose mtime and size are unchanged reuse
+    their cached occurrences and only changed files are read. With more than
+    one job the changed files are scanned in a process pool.
+
+    Args:
+        root_dir (str): Root directory (its 'src' folder is preferred)
+        debug (bool): Collect a debug entry for every occurrence
+        debug_output (str): Path of the JSON lines debug log
+        cache (FileResultCache): Optional per-file result cache
+        jobs (int): Number of worker processes
+        edges (list): Optional list receiving an EndpointEdge (template path,
+                      file relative to root_dir, line, 'string' or 'regex')
+                      per reference
+        sources (list): SourceFile records already found by a shared walk
+                        (see refresh-docs.py); the tree is not scanned again
+
+    Returns:
+        dict: endpoint -> set of file names referencing it
+    """
     endpoints = {}
     debug_entries = []  # Collect debug info here
 
     # Prefer the 'src' folder under the root if present
     src_dir = Path(root_dir) / 'src'
-    if src_dir.exists() and src_dir.is_dir():
-        ts_files = [p for p in src_dir.rglob("*.ts") if 'node_modules' not in p.parts]
+    if sources is not None:
+        ts_sources = sources
+    elif has_src_folder(root_dir):
+        ts_sources = list(scan_files(str(src_dir), TS_EXTENSIONS, skip_dirs=SKIP_DIRS))
         print(f"Scanning only under {src_dir} (excluding node_modules)")
     else:
         print(f"Warning: no 'src' folder found under {root_dir}; falling back to entire tree (excluding node_modules)")
-        ts_files = [p for p in Path(root_dir).rglob("*.ts") if 'node_modules' not in p.parts]
-    total_files = len(ts_files)
+        ts_sources = list(scan_files(str(root_dir), TS_EXTENSIONS, skip_dirs=SKIP_DIRS))
+    total_files = len(ts_sources)
     print(f"Found {total_files} TypeScript files to scan.")
 
-    for idx, ts_file in enumerate(ts_files, start=1):
+    # Reuse the occurrences of unchanged files; scan the others
+    file_refs = {}
+    changed = []
+    for source in ts_sources:
+        cached = cache.get(source.path, source.stat) if cache is not None else None
+        if cached is not None:
+            file_refs[source.path] = cached
+        else:
+            changed.append(source)
+
+    stats = {source.path: source.stat for source in changed}
+    for idx, (path, refs, error) in enumerate(ordered_map(scan_ts_file, list(stats), jobs), start=1):
         # Visual feedback: show progress line
-        print(f"Processing {idx}/{total_files}: {ts_file}", end='\r', flush=True)
-        try:
-            with open(ts_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-                # Prepare a version with string literals stripped so comment detection is robust
-                stripped = strip_string_literals(content)
-                comment_ranges = build_comment_ranges(stripped)
-
-                # Iterate string literals and pick those containing /Api/
-                for m in string_re.finditer(content):
-                    # If string literal itself is inside a comment, skip
-                    in_comment = is_pos_in_ranges(m.start(), comment_ranges)
-                    s = m.group(0)
-                    if len(s) < 3:
-                        continue
-                    inner = s[1:-1]
-                    start_search = 0
-                    while True:
-                        p = inner.find('/Api/', start_search)
-                        if p == -1:
-                            break
-                        raw = inner[p + len('/Api/'):]
-                        # conservative trimming: stop at common concatenation or interpolation
-                        cleaned = re.split(r"""[\s+\"'`{(,)]""", raw)[0]
-                        cleaned = cleaned.strip()
-                        captured = cleaned if cleaned else ''
-                        entry = {
-                            'file': str(ts_file),
-                            'line': content.count('\n', 0, m.start()) + 1,
-                            'method': 'string',
-                            'in_comment': in_comment,
-                            'raw': raw,
-                            'captured': captured,
-                            'action': 'captured' if captured and not in_comment else ('ignored_comment' if in_comment else 'trimmed')
-                        }
-                        if debug:
-                            debug_entries.append(entry)
-
-                        if captured and not in_comment:
-                            endpoint_norm = normalize_endpoint(captured)
-                            endpoints.setdefault(endpoint_norm, set()).add(Path(ts_file).name)
-
-                        start_search = p + len('/Api/')
-
-                # Also perform a loose regex scan for /Api/ occurrences outside strings
-                loose_re = re.compile(r"/Api/([^\"'`\s)\];,]*)")
-                for m in loose_re.finditer(content):
-                    in_comment = is_pos_in_ranges(m.start(), comment_ranges)
-                    raw = m.group(1)
-                    # trim further conservative separators
-                    cleaned = re.split(r"""[\s+\"'`{(,)]""", raw)[0].strip()
-                    entry = {
-                        'file': str(ts_file),
-                        'line': content.count('\n', 0, m.start()) + 1,
-                        'method': 'regex',
-                        'in_comment': in_comment,
-                        'raw': raw,
-                        'captured': cleaned,
-                        'action': 'captured' if cleaned and not in_comment else ('ignored_comment' if in_comment else 'trimmed')
-                    }
-                    if debug:
-                        debug_entries.append(entry)
-                    if cleaned and not in_comment:
-                        endpoint_norm = normalize_endpoint(cleaned)
-                        endpoints.setdefault(endpoint_norm, set()).add(Path(ts_file).name)
-        except Exception as e:
+        print(f"Processing {idx}/{len(changed)}: {path}", end='\r', flush=True)
+        if error is not None:
             # Print the error on its own line so it doesn't break the progress line
-            print(f"\nError reading {ts_file}: {e}")
+            print(f"\nError reading {path}: {error}")
+            if cache is not None:
+                cache.discard(path)
+            continue
+        file_refs[path] = refs
+        if cache is not None:
+            cache.put(path, refs, stats[path])
+
+    for source in ts_sources:
+        refs = file_refs.get(source.path, ())
+        if edges is not None and refs:
+            rel_file = os.path.relpath(source.path, root_dir).replace(os.sep, '/')
+        for line, method, in_comment, raw, captured, template in refs:
+            if debug:
+                debug_entries.append({
+                    'file': source.path,
+                    'line': line,
+                    'method': method,
+                    'in_comment': in_comment,
+                    'raw': raw,
+                    'captured': captured,
+                    'template': template,
+                    'action': 'captured' if captured and not in_comment else ('ignored_comment' if in_comment else 'trimmed')
+                })
+            if captured and not in_comment:
+                endpoint = normalize_endpoint(captured)
+                endpoints.setdefault(endpoint, set()).add(source.name)
+                if edges is not None:
+                    # The graph keeps the interpolated segments, so they can be matched as route parameters
+                    edges.append(EndpointEdge('/'.join(split_path(template)), rel_file, line, method))
 
     # End the progress line
     print('\nScan complete.')
+    if cache is not None:
+        cache.prune(set(file_refs))
+        cache.save()
+        print(f"Scanned {len(changed)} changed file(s), reused {total_files - len(changed)} from cache.")
     # Write debug information if requested
     if debug and debug_output:
         try:
@@ -164,6 +254,11 @@ if __name__ == "__main__":
     parser.add_argument('--quiet', action='store_true', help='suppress progress output')
     parser.add_argument('--debug', action='store_true', help='log debug info for every /Api/ occurrence')
     parser.add_argument('--debug-output', default='api_references_debug.log', help='Path to write debug log (JSON lines)')
+    parser.add_argument('--no-cache', action='store_true', help='rescan every file instead of reusing cached per-file results')
+    parser.add_argument('--cache-file', help='per-file cache location (default: _outputs/documents/extractors/cache/endpoints-<hash>.json)')
+    parser.add_argument('--graph', help='endpoint graph file (JSON lines, default: the output path with a .jsonl extension)')
+    parser.add_argument('--no-graph', action='store_true', help='do not write the endpoint graph file')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes for changed files (default: 1, 0 = one per CPU)')
     args = parser.parse_args()
 
     root_directory = args.root_directory
@@ -174,10 +269,13 @@ if __name__ == "__main__":
         sys.exit(1)
 
     try:
-        if args.quiet:
-            endpoints = find_api_references(root_directory, debug=args.debug, debug_output=args.debug_output)
-        else:
-            endpoints = find_api_references(root_directory, debug=args.debug, debug_output=args.debug_output)
+        cache = None
+        if not args.no_cache:
+            cache_path = args.cache_file or default_cache_path(Path(root_directory).resolve())
+            cache = FileResultCache(cache_path, version=ENDPOINT_CACHE_VERSION).load()
+        edges = None if args.no_graph else []
+        endpoints = find_api_references(root_directory, debug=args.debug, debug_output=args.debug_output,
+                                        cache=cache, jobs=resolve_jobs(args.jobs), edges=edges)
 
         # Compute summary statistics for CLI
         unique_endpoints = len(endpoints)
@@ -191,6 +289,10 @@ if __name__ == "__main__":
 
         generate_markdown(endpoints, output_md)
         print(f"Markdown file generated: {output_md}")
+        if edges is not None:
+            graph_path = args.graph or os.path.splitext(output_md)[0] + '.jsonl'
+            write_graph(graph_path, edges)
+            print(f"Endpoint graph written: {graph_path} ({len(edges)} references)")
     except Exception as e:
         print(f"Fatal error: {e}")
         sys.exit(1)
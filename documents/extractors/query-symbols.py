@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+CLI script to query the symbol index written by the documentation extractors.
+
+Looks symbols up by exact name or qualified name, or searches their names,
+docstrings and parameters with SQLite full-text search.
+"""
+
+import os
+import argparse
+import inspect
+import sys
+import time
+
+# Add parent directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.output_helpers import get_output_base_dir
+from utils.symbol_index import DEFAULT_INDEX_NAME, SymbolIndex
+
+
+def print_match(match, show_doc):
+    """
+    Print one index match.
+
+    Args:
+        match (SymbolMatch): Match returned by the index
+        show_doc (bool): Also print the docstring and parameters
+    """
+    location = os.path.join(match.root, match.file)
+    print(f"{match.kind:<10} {match.qualname}  [{match.language}] {location}:{match.line}")
+    if show_doc:
+        if match.docstring:
+            for line in inspect.cleandoc(match.docstring).split('\n'):
+                print(f"    {line}")
+        if match.params:
+            print("    Parameters:")
+            for line in match.params.split('\n'):
+                print(f"      {line}")
+        print()
+
+
+def main():
+    """Main function to handle CLI arguments and query the index."""
+    parser = argparse.ArgumentParser(
+        description="Look up or search the symbols recorded by the documentation extractors"
+    )
+    parser.add_argument(
+        "name",
+        nargs="?",
+        help="Exact symbol name or qualified name (e.g. save or FooService.save)"
+    )
+    parser.add_argument(
+        "-s", "--search",
+        help="Full-text search over names, docstrings and parameters"
+    )
+    parser.add_argument(
+        "-k", "--kind",
+        help="Only return symbols of this kind (e.g. class, function, method)"
+    )
+    parser.add_argument(
+        "-n", "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of results (default: 20)"
+    )
+    parser.add_argument(
+        "-d", "--doc",
+        action="store_true",
+        help="Print the docstring and parameters of each result"
+    )
+    parser.add_argument(
+        "--index",
+        help=f"Symbol index database (default: {DEFAULT_INDEX_NAME} in the extractors' _outputs folder)"
+    )
+    args = parser.parse_args()
+
+    if not args.name and not args.search:
+        parser.error("give a symbol name or --search TEXT")
+
+    db_path = args.index or os.path.join(get_output_base_dir(), DEFAULT_INDEX_NAME)
+    if not os.path.exists(db_path):
+        print(f"Error: symbol index '{db_path}' not found (run one of the extractors first)")
+        return
+
+    with SymbolIndex(db_path) as index:
+        start = time.perf_counter()
+        if args.search:
+            matches = index.search(args.search, args.kind, args.limit)
+        else:
+            matches = index.lookup(args.name, args.kind, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+
+    for match in matches:
+        print_match(match, args.doc)
+    print(f"{len(matches)} result(s) in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
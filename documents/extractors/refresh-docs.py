@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+CLI script to refresh the documentation of a mixed-language project in one go.
+
+Runs the TypeScript/JavaScript, Python and C# extractors, and the other
+scanning scripts (mirrored Python docs, endpoint references, controller
+endpoints, not-documented list, CSS/SCSS reports), over a single walk of
+the project tree (utils/file_scanner.py) instead of letting each script
+crawl the tree on its own, then writes each one's output to its own
+subfolder of the output directory.
+"""
+
+import os
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+
+# Add parent directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.doc_manifest import DocManifest
+from utils.endpoint_graph import write_graph
+from utils.file_cache import FileResultCache
+from utils.file_scanner import FileScanner
+from utils.output_helpers import get_output_base_dir
+from utils.py_docstrings import PYTHON_EXTENSIONS, SKIP_DIRS as PYTHON_SKIP_DIRS, DocstringCache, default_cache_path
+from utils.symbol_index import DEFAULT_INDEX_NAME, SymbolIndex
+
+EXTRACTORS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (extractor script, file description, extensions constant)
+LANGUAGES = {
+    'ts': ('extract-docs-ts.py', 'TypeScript/JavaScript', 'TS_EXTENSIONS'),
+    'py': ('extract-docs-py.py', 'Python', 'PYTHON_EXTENSIONS'),
+    'cs': ('extract-docs-cs.py', 'C#', 'CS_EXTENSIONS'),
+}
+
+# name -> (script, relative to this folder, description) of the other scripts
+# fed by the same walk; 'endpoints' runs before 'unused-endpoints', whose
+# report then uses the references it found
+TOOLS = {
+    'docs': ('extract-docs.py', 'Python (mirrored)'),
+    'endpoints': ('extract-endpoints.py', 'TypeScript endpoint reference'),
+    'unused-endpoints': (os.path.join('..', 'generators', 'list-unused-endpoints.py'), 'C# controller'),
+    'md-files': (os.path.join('..', 'generators', 'make-md-files.py'), 'TypeScript (not documented)'),
+    'css': (os.path.join('..', '..', 'css', 'list-properties.py'), 'CSS/SCSS'),
+}
+
+
+def load_extractor(script_name):
+    """
+    Load one of the hyphen-named extractor scripts as a module.
+
+    Args:
+        script_name (str): Path of the script, relative to this folder
+
+    Returns:
+        module: The loaded module, or None if it could not be loaded
+    """
+    module_name = os.path.basename(script_name)[:-3].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(EXTRACTORS_DIR, script_name))
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        print(f"Warning: could not load {script_name}: {e}")
+        return None
+    return module
+
+
+def process_files(name, module, files, output_dir, folder_path, manifest, index=None):
+    """
+    Hand the files of one language to its extractor.
+
+    Args:
+        name (str): Language key from LANGUAGES
+        module (module): Loaded extractor script
+        files (list): File paths found by the scanner
+        output_dir (str): Output directory for this language
+        folder_path (Path): Resolved project root
+        manifest (DocManifest): Incremental build manifest of this language
+        index (SymbolIndex): Optional symbol index shared by all languages
+
+    Returns:
+        tuple: (processed count, skipped count)
+    """
+    if name == 'ts':
+        return module.process_typescript_files(files, output_dir, folder_path, manifest=manifest, index=index)
+    if name == 'py':
+        cache = module.DocstringCache(module.default_cache_path(folder_path, module.__file__)).load()
+        result = module.process_python_files(files, output_dir, folder_path.name, manifest, cache, index, folder_path)
+        cache.save()
+        return result
+    return module.process_cs_files(files, output_dir, folder_path, manifest=manifest, index=index)
+
+
+def register_tool(scanner, name, module, folder_path):
+    """
+    Register one of the TOOLS with the shared scanner, with the files and
+    the skip list it uses on its own.
+
+    Args:
+        scanner (FileScanner): Shared scanner
+        name (str): Tool key from TOOLS
+        module (module): Loaded script
+        folder_path (Path): Resolved project root
+    """
+    # Scripts limited to the project's 'src' folder when it has one
+    def under_src(source):
+        return source.dirs[:1] == ('src',)
+
+    in_src = under_src if (folder_path / 'src').is_dir() else None
+    if name == 'docs':
+        scanner.register(name, PYTHON_EXTENSIONS, skip_dirs=PYTHON_SKIP_DIRS)
+    elif name == 'endpoints':
+        scanner.register(name, module.TS_EXTENSIONS, skip_dirs=module.SKIP_DIRS, match=in_src)
+    elif name == 'unused-endpoints':
+        scanner.register(name, {'.cs'}, skip_dirs=module.SKIP_DIRS, match=module.is_controller_file)
+    elif name == 'md-files':
+        scanner.register(name, {'.ts'}, skip_dirs=module.SKIP_DIRS, match=in_src)
+    else:
+        scanner.register(name, module.CSS_EXTENSIONS, skip_dirs=module.SKIP_DIRS)
+
+
+def run_tool(name, module, sources, output_dir, folder_path, full=False):
+    """
+    Run one of the TOOLS on the files the shared scanner found for it.
+
+    Args:
+        name (str): Tool key from TOOLS
+        module (module): Loaded script
+        sources (list): SourceFile records found by the scanner
+        output_dir (str): Output directory for this tool (exists)
+        folder_path (Path): Resolved project root
+        full (bool): Ignore the per-file result caches (endpoints, css) and
+                     parse every file again; the caches are rebuilt
+    """
+    if name == 'docs':
+        cache = DocstringCache(default_cache_path(folder_path, module.__file__)).load()
+        processed, skipped = module.process_python_files([source.path for source in sources], output_dir, cache,
+                                                         input_root=str(folder_path))
+        cache.save()
+        print(f"Processed {processed} files, skipped {skipped} files.")
+    elif name == 'endpoints':
+        cache = FileResultCache(module.default_cache_path(folder_path), version=module.ENDPOINT_CACHE_VERSION)
+        if not full:
+            cache.load()
+        edges = []
+        endpoints = module.find_api_references(str(folder_path), cache=cache, edges=edges, sources=sources)
+        module.generate_markdown(endpoints, os.path.join(output_dir, 'api_references.md'))
+        write_graph(os.path.join(output_dir, 'api_references.jsonl'), edges)
+    elif name == 'unused-endpoints':
+        edges = []
+        endpoints = module.find_endpoints(str(folder_path), edges=edges, sources=sources)
+        write_graph(os.path.join(output_dir, 'post_endpoints.jsonl'), edges)
+        references = os.path.join(os.path.dirname(output_dir), 'endpoints', 'api_references.jsonl')
+        output_file = os.path.join(output_dir, 'post_endpoints.md')
+        if os.path.exists(references):
+            module.generate_combined_report(endpoints, module.load_ts_references(references), output_file)
+        else:
+            module.generate_markdown(endpoints, output_file)
+    elif name == 'md-files':
+        source_root = folder_path / 'src' if (folder_path / 'src').is_dir() else folder_path
+        module.process_folder(source_root, Path(output_dir) / 'not-documented.md', sources)
+    else:
+        root = str(folder_path)
+        cache = FileResultCache(module.default_cache_path(root), version=module.SCAN_CACHE_VERSION)
+        if not full:
+            cache.load()
+        results = module.scan_folder(root, cache, sources=sources)
+        if results[0]:
+            module.write_reports(results, root, output_dir)
+        else:
+            print("No properties found in .scss/.css files.")
+
+
+def main():
+    """Main function to handle CLI arguments and process files."""
+    parser = argparse.ArgumentParser(
+        description=("Extract TypeScript/JavaScript, Python and C# documentation, endpoint, not-documented "
+                     "and CSS/SCSS reports with one scan of the project")
+    )
+    parser.add_argument(
+        "folder",
+        help="Project folder to scan"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output directory; each language gets a subfolder (default: auto-generated)"
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted(list(LANGUAGES) + list(TOOLS)),
+        help="Only run these extractors (can be repeated; default: all)"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Parse and rewrite every file instead of only files changed since the last run"
+    )
+    parser.add_argument(
+        "--index",
+        help=f"Symbol index database to update (default: {DEFAULT_INDEX_NAME} in the output base folder)"
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not update the symbol index"
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"Error: '{args.folder}' is not a valid directory")
+        return
+
+    output_base = args.output or get_output_base_dir()
+    folder_path = Path(args.folder).resolve()
+
+    # Register every extractor that loads with the shared scanner
+    scanner = FileScanner(str(folder_path))
+    modules = {}
+    tools = {}
+    selected = args.only or list(LANGUAGES) + list(TOOLS)
+    for name in LANGUAGES:
+        if name not in selected:
+            continue
+        script_name, _, extensions_name = LANGUAGES[name]
+        module = load_extractor(script_name)
+        if module is None:
+            continue
+        modules[name] = module
+        scanner.register(name, getattr(module, extensions_name), skip_dirs=module.SKIP_DIRS)
+    for name in TOOLS:
+        if name not in selected:
+            continue
+        module = load_extractor(TOOLS[name][0])
+        if module is None:
+            continue
+        tools[name] = module
+        register_tool(scanner, name, module, folder_path)
+
+    if not modules and not tools:
+        print("Error: no extractor could be loaded")
+        return
+
+    found = scanner.run()
+    index = None if args.no_index or not modules else SymbolIndex(args.index or os.path.join(output_base, DEFAULT_INDEX_NAME))
+    print(f"Project: {folder_path.name}")
+    for name, module in modules.items():
+        description = LANGUAGES[name][1]
+        files = [source.path for source in found[name]]
+        print("=" * 50)
+        if not files:
+            print(f"No {description} files found in '{args.folder}'")
+            continue
+        output_dir = os.path.join(output_base, name)
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"Found {len(files)} {description} files")
+        print(f"Output directory: {output_dir}")
+        print("-" * 50)
+        manifest = DocManifest(output_dir, folder_path, name, module.MANIFEST_VERSION, full=args.full).load()
+        processed, skipped = process_files(name, module, files, output_dir, folder_path, manifest, index)
+        print("-" * 50)
+        print(f"{description}: processed {processed} files, skipped {skipped} files.")
+    if index is not None:
+        index.close()
+    for name, module in tools.items():
+        description = TOOLS[name][1]
+        print("=" * 50)
+        if not found[name]:
+            print(f"No {description} files found in '{args.folder}'")
+            continue
+        output_dir = os.path.join(output_base, name)
+        os.makedirs(output_dir, exist_ok=True)
+        print(f"Found {len(found[name])} {description} files")
+        print(f"Output directory: {output_dir}")
+        print("-" * 50)
+        run_tool(name, module, found[name], output_dir, folder_path, args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,175 +3,394 @@ import re
 from pathlib import Path
 import sys
 import argparse
+from collections import namedtuple
 
 # Add parent directories to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.endpoint_graph import EndpointEdge, edge_location, index_by_endpoint, read_graph, write_graph
+from utils.file_scanner import DEFAULT_SKIP_DIRS, scan_files
 from utils.output_helpers import get_output_base_dir
-
-# Utilities copied/adapted from extract-endpoints.py to handle comments and strings
-def strip_string_literals(s: str) -> str:
-    string_re = re.compile(r"('(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"|`(?:\\.|[^`\\])*`)", re.DOTALL)
-    def _repl(m):
-        return ' ' * (m.end() - m.start())
-    return string_re.sub(_repl, s)
-
-def build_comment_ranges(s: str):
-    ranges = []
-    for m in re.finditer(r'//.*?$' , s, flags=re.MULTILINE):
-        ranges.append((m.start(), m.end()))
-    for m in re.finditer(r'/\*[\s\S]*?\*/', s):
-        ranges.append((m.start(), m.end()))
-    return ranges
-
-def is_pos_in_ranges(pos: int, ranges) -> bool:
-    for a, b in ranges:
-        if a <= pos < b:
-            return True
-    return False
+from utils.parallel import ordered_map, resolve_jobs
+from utils.route_templates import RouteTrie, split_path
+from utils.source_ranges import csharp_ranges
 
 def normalize_endpoint(endpoint: str) -> str:
-    endpoint = endpoint.split('?', 1)[0]
-    endpoint = endpoint.rstrip('/')
-    return endpoint
-
-def extract_controller_info(content: str):
-    # Find class name (Controller) and class-level Route attribute (if any)
-    # We search for pattern: [Route("...")] optionally before class
-    class_route = None
-    class_name = None
-
-    # Remove strings for safer detection
-    stripped = strip_string_literals(content)
-    # Find class name
-    class_match = re.search(r'class\s+([A-Za-z0-9_]*Controller)\b', stripped)
-    if class_match:
-        class_name = class_match.group(1)
-    # Find the nearest Route attribute before the class definition
-    if class_match:
-        upto = class_match.start()
-        before = stripped[max(0, upto-800):upto]
-        route_match = re.search(r'\[Route\s*\(\s*"([^"]+)"\s*\)\]', before, re.IGNORECASE)
-        if route_match:
-            class_route = route_match.group(1)
-    # Detect class-level AllowAnonymous
-    class_allowanonymous = False
-    if class_match:
-        before_lower = before.lower() if 'before' in locals() and before is not None else ''
-        if re.search(r'\[allowanonymous\]', before_lower, re.IGNORECASE):
-            class_allowanonymous = True
-    return class_name, class_route, class_allowanonymous
-
-def find_post_endpoints(root_dir, anonymous_only=False):
-    # Find Controller.cs files (case-insensitive) excluding bin/obj
-    cs_files = [p for p in Path(root_dir).rglob("*.cs") if p.name.lower().endswith('controller.cs') and 'bin' not in p.parts and 'obj' not in p.parts]
-    total = len(cs_files)
-    print(f"Found {total} controller files to scan.")
+    # The query string is cut at a '?' outside braces, so optional parameters ({id?}) survive
+    return '/'.join(split_path(endpoint))
+
+# Directories pruned while looking for controllers (build output and IDE state)
+SKIP_DIRS = DEFAULT_SKIP_DIRS | {'bin', 'obj', '.vs'}
+
+# HTTP method attributes (lower-cased, without the 'Attribute' suffix) and their verbs
+HTTP_VERB_ATTRIBUTES = {
+    'httpget': 'GET',
+    'httppost': 'POST',
+    'httpput': 'PUT',
+    'httpdelete': 'DELETE',
+    'httppatch': 'PATCH',
+    'httphead': 'HEAD',
+    'httpoptions': 'OPTIONS',
+}
+
+# Verb of actions routed with [Route] only (they answer every method)
+ANY_VERB = 'ANY'
+
+# Patterns, compiled once. They run on the text with comments blanked out;
+# the declaration patterns also need the string literals blanked out.
+ATTRIBUTE_SECTION_RE = re.compile(r'\[(?:@"(?:""|[^"])*"|"(?:\\.|[^"\\])*"|[^\]"])*\]')
+# Attribute target of a section, e.g. [return: ...]
+ATTRIBUTE_TARGET_RE = re.compile(r'\s*\w+\s*:(?!:)')
+ATTRIBUTE_RE = re.compile(
+    r'([A-Za-z_][\w.]*)\s*'
+    r'(?:\(((?:@"(?:""|[^"])*"|"(?:\\.|[^"\\])*"|[^()"]|\((?:"(?:\\.|[^"\\])*"|[^()"])*\))*)\))?'
+)
+STRING_ARG_RE = re.compile(r'(?:\b(\w+)\s*=\s*)?(?:@"((?:""|[^"])*)"|"((?:\\.|[^"\\])*)")')
+CLASS_DECL_RE = re.compile(
+    r'\b((?:(?:public|internal|private|protected|abstract|sealed|static|partial)\s+)*)'
+    r'class\s+(\w+)(?:\s*<[^>{]*>)?\s*(?::\s*([\w.]+))?'
+)
+METHOD_DECL_RE = re.compile(
+    r'\b(?:public|private|protected|internal)\s+'
+    r'(?:(?:static|async|virtual|override|new|sealed|abstract|extern|unsafe)\s+)*'
+    r'[\w<>\[\],.?\s]+?\s+([A-Za-z_]\w*)\s*(?:<[^<>()]*>)?\s*\('
+)
+BRACE_RE = re.compile(r'[{}]')
+ROUTE_TOKEN_RE = re.compile(r'\[(controller|action|area)\]', re.IGNORECASE)
+
+# One action (controller method with routing attributes)
+#   name:      method name
+#   line:      line of its first attribute
+#   routes:    tuple of (verbs, template or None) pairs
+#   anonymous: the method has [AllowAnonymous]
+ControllerAction = namedtuple('ControllerAction', ['name', 'line', 'routes', 'anonymous'])
+
+# One class of a controller file
+#   name, base: class name and first base type (without namespace or generics)
+#   file:       path of the file
+#   abstract:   declared abstract (base controllers are not endpoints themselves)
+#   routes:     class-level [Route]/[RoutePrefix] templates
+#   area:       [Area("...")] name or None
+#   anonymous:  the class has [AllowAnonymous]
+#   actions:    ControllerAction objects
+ControllerModel = namedtuple('ControllerModel', ['name', 'base', 'file', 'abstract', 'routes', 'area', 'anonymous', 'actions'])
+
+# One endpoint of the API: a normalized route answered by an action for one verb
+EndpointDef = namedtuple('EndpointDef', ['route', 'verb', 'controller', 'action', 'file', 'line', 'anonymous'])
+
+
+def parse_attributes(text):
+    """
+    Parse the attribute sections in front of a declaration.
+
+    Args:
+        text (str): Source between the previous declaration and this one
+                    (comments blanked out, string literals intact)
+
+    Returns:
+        list: (name, positional string args, named string args) per
+              attribute; names are lower-cased, without namespace and
+              'Attribute' suffix
+    """
+    attributes = []
+    for section in ATTRIBUTE_SECTION_RE.finditer(text):
+        body = section.group(0)[1:-1]
+        # Attribute targets such as [return: ...] do not apply to routing
+        if ATTRIBUTE_TARGET_RE.match(body):
+            continue
+        for attribute in ATTRIBUTE_RE.finditer(body):
+            name = attribute.group(1).rsplit('.', 1)[-1].lower()
+            if name.endswith('attribute'):
+                name = name[:-len('attribute')]
+            positional = []
+            named = {}
+            for arg in STRING_ARG_RE.finditer(attribute.group(2) or ''):
+                value = arg.group(2).replace('""', '"') if arg.group(2) is not None else arg.group(3)
+                if arg.group(1):
+                    named[arg.group(1).lower()] = value
+                else:
+                    positional.append(value)
+            attributes.append((name, positional, named))
+    return attributes
+
+
+def attributes_before(code, clean, pos, floor=0):
+    """Parse the attributes between the previous declaration (or floor) and pos."""
+    start = max(code.rfind(';', floor, pos), code.rfind('{', floor, pos), code.rfind('}', floor, pos), floor - 1) + 1
+    return parse_attributes(clean[start:pos]), start
+
+
+def action_routes(attributes):
+    """
+    Return the (verbs, template) pairs of an action's routing attributes.
+
+    [HttpGet("x")] gives (('GET',), 'x'). [Route("x")] applies to the verbs
+    of the Http* attributes without a template (every verb if there are
+    none), like ASP.NET does.
+    """
+    routes = []
+    untemplated_verbs = []
+    route_templates = []
+    for name, positional, named in attributes:
+        if name in HTTP_VERB_ATTRIBUTES:
+            template = positional[0] if positional else named.get('template')
+            if template is None:
+                untemplated_verbs.append(HTTP_VERB_ATTRIBUTES[name])
+            else:
+                routes.append(((HTTP_VERB_ATTRIBUTES[name],), template))
+        elif name == 'acceptverbs':
+            verbs = tuple(verb.upper() for verb in positional) or (ANY_VERB,)
+            routes.append((verbs, named.get('route')))
+        elif name == 'route':
+            template = positional[0] if positional else named.get('template')
+            if template is not None:
+                route_templates.append(template)
+    verbs = tuple(untemplated_verbs) or (ANY_VERB,)
+    routes.extend((verbs, template) for template in route_templates)
+    if not route_templates and untemplated_verbs:
+        routes.append((tuple(untemplated_verbs), None))
+    return tuple(routes)
+
+
+def scan_controller(cs_file):
+    """
+    Build the models of the classes declared in one controller file. Runs in a
+    worker process with --jobs.
+
+    Args:
+        cs_file (str): Controller file path
+
+    Returns:
+        tuple: (cs_file, list of ControllerModel or None, error message or None)
+    """
+    try:
+        with open(cs_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        return cs_file, None, str(e)
+
+    # Comments are blanked out of both copies; `code` also loses the string
+    # and char literals, so braces, semicolons and keywords inside them are ignored
+    comments, literals = csharp_ranges(content)
+    clean = comments.blank(content)
+    code = literals.blank(clean)
+
+    # Matching braces, to know which class body each method belongs to
+    closing = {}
+    open_braces = []
+    for brace in BRACE_RE.finditer(code):
+        if brace.group() == '{':
+            open_braces.append(brace.start())
+        elif open_braces:
+            closing[open_braces.pop()] = brace.start()
+
+    classes = []
+    for declaration in CLASS_DECL_RE.finditer(code):
+        body_start = code.find('{', declaration.end())
+        if body_start == -1:
+            continue
+        attributes, _ = attributes_before(code, clean, declaration.start())
+        base = declaration.group(3).rsplit('.', 1)[-1] if declaration.group(3) else None
+        classes.append({
+            'name': declaration.group(2),
+            'base': base,
+            'abstract': 'abstract' in declaration.group(1).split(),
+            'routes': [args[0] if args else named.get('template', '')
+                       for name, args, named in attributes if name in ('route', 'routeprefix')],
+            'area': next((args[0] for name, args, _ in attributes if name == 'area' and args), None),
+            'anonymous': any(name == 'allowanonymous' for name, _, _ in attributes),
+            'body': (body_start, closing.get(body_start, len(code))),
+            'actions': [],
+        })
+
+    line = 1
+    line_pos = 0
+    for declaration in METHOD_DECL_RE.finditer(code):
+        owner = None
+        for cls in classes:
+            body_start, body_end = cls['body']
+            if body_start < declaration.start() < body_end and (owner is None or body_start > owner['body'][0]):
+                owner = cls
+        if owner is None:
+            continue
+        attributes, attributes_start = attributes_before(code, clean, declaration.start(), owner['body'][0] + 1)
+        if any(name == 'nonaction' for name, _, _ in attributes):
+            continue
+        routes = action_routes(attributes)
+        if not routes:
+            continue
+        # Line of the first attribute section
+        first = ATTRIBUTE_SECTION_RE.search(clean, attributes_start, declaration.start())
+        pos = first.start() if first else declaration.start()
+        line += content.count('\n', line_pos, pos)
+        line_pos = pos
+        anonymous = any(name == 'allowanonymous' for name, _, _ in attributes)
+        owner['actions'].append(ControllerAction(declaration.group(1), line, routes, anonymous))
+
+    models = [
+        ControllerModel(cls['name'], cls['base'], cs_file, cls['abstract'], tuple(cls['routes']),
+                        cls['area'], cls['anonymous'], tuple(cls['actions']))
+        for cls in classes
+    ]
+    return cs_file, models, None
+
+
+def _join_route(*parts):
+    return '/'.join(part.strip('/') for part in parts if part and part.strip('/'))
+
+
+def build_route(template, class_route, controller_base, area, action_name, route_prefix):
+    """
+    Combine a class-level and an action-level template into a normalized route.
+
+    As in ASP.NET, templates starting with '/' or '~/' ignore the class
+    route, and so does every action template of a controller without a
+    class route. Actions without any template there use the conventional
+    route `[area/]Controller/Action`.
+
+    Args:
+        template (str): Action template or None
+        class_route (str): Class-level template or None
+        controller_base (str): Controller name without the 'Controller' suffix
+        area (str): Area name or None
+        action_name (str): Method name
+        route_prefix (str): Leading segment dropped from the route (e.g. 'api'),
+                            matching the '/Api/' prefix the TypeScript side strips
+
+    Returns:
+        str: The route (e.g. 'Orders/{id:int}')
+    """
+    if template is not None and (class_route is None or template.startswith(('/', '~/'))):
+        route = template.lstrip('~')
+    elif class_route is not None:
+        route = _join_route(class_route, template)
+    else:
+        route = _join_route(area, controller_base, action_name)
+    tokens = {'controller': controller_base, 'action': action_name, 'area': area or ''}
+    route = ROUTE_TOKEN_RE.sub(lambda m: tokens[m.group(1).lower()], route)
+    route = normalize_endpoint(route)
+    if route_prefix:
+        first, _, rest = route.partition('/')
+        if first.lower() == route_prefix.lower():
+            route = rest
+    return route
+
+
+def resolve_endpoints(models, root_dir, route_prefix='api'):
+    """
+    Turn controller models into endpoints.
+
+    Class routes, areas, [AllowAnonymous] and actions are inherited from
+    base controllers declared in the scanned files; actions redeclared in a
+    derived controller replace the inherited ones. Abstract classes and
+    classes whose name does not end in 'Controller' produce no endpoints.
+
+    Args:
+        models (list): ControllerModel objects of every scanned file
+        root_dir (str): Scanned root (file paths are made relative to it)
+        route_prefix (str): Leading route segment to drop (see build_route)
+
+    Returns:
+        list: EndpointDef objects
+    """
+    by_name = {}
+    for model in models:
+        by_name.setdefault(model.name, model)
+
+    def lineage(model):
+        chain = [model]
+        seen = {model.name}
+        while chain[-1].base in by_name and chain[-1].base not in seen:
+            seen.add(chain[-1].base)
+            chain.append(by_name[chain[-1].base])
+        return chain
+
+    # Report paths, once per file rather than once per action
+    rel_files = {model.file: os.path.relpath(model.file, root_dir).replace(os.sep, '/') for model in models}
+
+    endpoints = []
+    for model in models:
+        if model.abstract or not model.name.lower().endswith('controller'):
+            continue
+        chain = lineage(model)
+        class_routes = next((m.routes for m in chain if m.routes), ())
+        area = next((m.area for m in chain if m.area), None)
+        class_anonymous = any(m.anonymous for m in chain)
+        actions = []
+        declared = set()
+        for m in chain:
+            for action in m.actions:
+                if action.name not in declared:
+                    actions.append((m, action))
+            declared.update(action.name for action in m.actions)
+
+        controller_base = model.name[:-len('controller')]
+        for owner, action in actions:
+            rel_file = rel_files[owner.file]
+            for verbs, template in action.routes:
+                for class_route in class_routes or (None,):
+                    route = build_route(template, class_route, controller_base, area, action.name, route_prefix)
+                    for verb in verbs:
+                        endpoints.append(EndpointDef(route, verb, controller_base, action.name, rel_file,
+                                                     action.line, action.anonymous or class_anonymous))
+    return endpoints
 
-    endpoints = {}
 
-    # Patterns
-    http_post_attr_block_re = re.compile(r'\[(?:[^\]]*?HttpPost[^\]]*?)\]', re.IGNORECASE | re.DOTALL)
-    route_attr_re = re.compile(r'\[Route\s*\(\s*"([^"]+)"\s*\)\]', re.IGNORECASE)
-    allowanonymous_attr_re = re.compile(r'\[AllowAnonymous\]', re.IGNORECASE)
-    # method signature capture: access modifiers + return type + name(
-    method_sig_re = re.compile(r'\b(?:public|private|protected|internal)\s+(?:static\s+)?(?:async\s+)?[\w<>,\s\[\]]+\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(', re.MULTILINE)
+def is_controller_file(source):
+    """Return True for *Controller.cs files (case-insensitive)."""
+    return source.name.lower().endswith('controller.cs')
+
+
+def find_endpoints(root_dir, anonymous_only=False, edges=None, jobs=1, methods=None, route_prefix='api',
+                   sources=None):
+    """
+    Collect the endpoints of every *Controller.cs file of a tree.
+
+    Build output (bin, obj) and the other skipped directories are pruned
+    during the walk. With more than one job the controllers are parsed in
+    a process pool; results are merged in file order.
+
+    Args:
+        root_dir (str): Root directory to scan
+        anonymous_only (bool): Only keep endpoints with [AllowAnonymous]
+        edges (list): Optional list receiving an EndpointEdge per endpoint and verb
+        jobs (int): Number of worker processes
+        methods (set): Only keep these verbs (upper case); None keeps all.
+                       Actions routed with [Route] only are always kept.
+        route_prefix (str): Leading route segment to drop (see build_route)
+        sources (list): Controller SourceFile records already found by a
+                        shared walk (see refresh-docs.py); the tree is not
+                        scanned again
+
+    Returns:
+        dict: route -> {'controller': name, 'verbs': set, 'files': set of file names}
+    """
+    # Find Controller.cs files (case-insensitive)
+    if sources is None:
+        sources = scan_files(str(root_dir), {'.cs'}, skip_dirs=SKIP_DIRS, match=is_controller_file)
+    cs_files = [source.path for source in sources]
+    total = len(cs_files)
+    print(f"Found {total} controller files to scan.")
 
-    for idx, cs_file in enumerate(cs_files, start=1):
+    models = []
+    for idx, (cs_file, file_models, error) in enumerate(ordered_map(scan_controller, cs_files, jobs), start=1):
         print(f"Processing {idx}/{total}: {cs_file}", end='\r', flush=True)
-        try:
-            content = cs_file.read_text(encoding='utf-8')
-            stripped = strip_string_literals(content)
-            comment_ranges = build_comment_ranges(stripped)
-
-            class_name, class_route, class_allowanonymous = extract_controller_info(content)
-            controller_base = None
-            if class_name:
-                controller_base = class_name
-                if controller_base.lower().endswith('controller'):
-                    controller_base = controller_base[:-10]  # remove 'Controller'
-
-            for m in http_post_attr_block_re.finditer(content):
-                # Ignore if attribute inside comment
-                if is_pos_in_ranges(m.start(), comment_ranges):
-                    continue
-
-                attr_text = m.group(0)
-                # Try to extract route from the attribute itself
-                route_in_attr = None
-                q = re.search(r'"([^"]+)"', attr_text)
-                if q:
-                    route_in_attr = q.group(1)
-
-                # Look ahead for method signature to get method name
-                after_pos = m.end()
-                method_match = method_sig_re.search(content, after_pos)
-                method_name = method_match.group(1) if method_match else None
-
-                # Also check for Route attribute between attribute and method (or right before attribute)
-                method_route = route_in_attr
-                if not method_route:
-                    # search small window around attribute for Route attribute
-                    window_start = max(0, m.start() - 200)
-                    window_end = min(len(content), m.end() + 200)
-                    window = content[window_start:window_end]
-                    rm = route_attr_re.search(window)
-                    if rm:
-                        method_route = rm.group(1)
-                if not method_route and method_name:
-                    method_route = method_name
-
-                # Build the full route string. Always prefix with the controller base so
-                # we get ControllerName/Action form even if method has a route.
-                combined_parts = []
-                if class_route:
-                    # class-level route wins as the base
-                    combined_parts.append(class_route)
-                elif controller_base:
-                    combined_parts.append(controller_base)
-
-                # Prefer the explicit method-level route if present, otherwise method name
-                if method_route:
-                    combined_parts.append(method_route)
-                elif method_name:
-                    combined_parts.append(method_name)
-
-                combined = '/'.join([p for p in combined_parts if p])
-
-                # Replace tokens
-                if controller_base:
-                    combined = combined.replace('[controller]', controller_base)
-                if method_name:
-                    combined = combined.replace('[action]', method_name)
-
-                combined = normalize_endpoint(combined)
-
-                # Detect AllowAnonymous for this method: in the attribute block itself or nearby,
-                # or inherited from the class-level AllowAnonymous
-                method_allowanonymous = False
-                # Check attribute block text
-                if allowanonymous_attr_re.search(attr_text):
-                    method_allowanonymous = True
-                # Check the same small window for a Route or AllowAnonymous
-                if not method_allowanonymous:
-                    window_aa = re.search(r'\[AllowAnonymous\]', window, re.IGNORECASE) if 'window' in locals() else None
-                    if window_aa:
-                        method_allowanonymous = True
-                # If not found at method, inherit from class
-                if not method_allowanonymous and class_allowanonymous:
-                    method_allowanonymous = True
-
-                # If caller requested only anonymous endpoints and this one isn't anonymous, skip it
-                if anonymous_only and not method_allowanonymous:
-                    continue
-
-                if combined not in endpoints:
-                    endpoints[combined] = set()
-                endpoints[combined].add(Path(cs_file).name)
-
-        except Exception as e:
-            print(f"\nError reading {cs_file}: {e}")
-
+        if error is not None:
+            print(f"\nError reading {cs_file}: {error}")
+            continue
+        models.extend(file_models)
     print('\nScan complete.')
+
+    endpoints = {}
+    for endpoint in resolve_endpoints(models, root_dir, route_prefix):
+        if anonymous_only and not endpoint.anonymous:
+            continue
+        if methods and endpoint.verb not in methods and endpoint.verb != ANY_VERB:
+            continue
+        info = endpoints.setdefault(endpoint.route, {'controller': endpoint.controller, 'verbs': set(), 'files': set()})
+        info['verbs'].add(endpoint.verb)
+        info['files'].add(os.path.basename(endpoint.file))
+        if edges is not None:
+            edges.append(EndpointEdge(endpoint.route, endpoint.file, endpoint.line, endpoint.verb))
     return endpoints
 
 
@@ -179,20 +398,33 @@ def generate_markdown(endpoints, output_file):
     with open(output_file, 'w', encoding='utf-8') as f:
         for endpoint in sorted(endpoints.keys()):
             f.write(f"### {endpoint}\n")
-            for filename in sorted(endpoints[endpoint]):
+            f.write(f"Methods: {', '.join(sorted(endpoints[endpoint]['verbs']))}\n")
+            for filename in sorted(endpoints[endpoint]['files']):
                 f.write(f"- `{filename}`\n")
             f.write("\n")
-    print(f"Wrote {len(endpoints)} unique POST endpoints to {output_file}.")
+    print(f"Wrote {len(endpoints)} unique endpoints to {output_file}.")
+
 
+def load_ts_references(path: str):
+    """Load the TypeScript references written by extract-endpoints.py and return a
+    mapping of lower-cased endpoint -> set of locations that reference it.
+
+    An endpoint graph (.jsonl) gives 'file:line' locations; the Markdown list
+    (.md) only gives file names and is parsed line by line."""
+    if path.endswith('.jsonl'):
+        try:
+            edges = read_graph(path)
+        except Exception as e:
+            print(f"Error reading endpoint graph {path}: {e}")
+            return {}
+        return {key: {edge_location(edge) for edge in group}
+                for key, group in index_by_endpoint(edges).items()}
 
-def load_ts_references(md_path: str):
-    """Parse a markdown file produced by extract-endpoints.py and return a mapping
-    of endpoint (string) -> set of filenames that reference it."""
     refs = {}
     try:
-        text = Path(md_path).read_text(encoding='utf-8')
+        text = Path(path).read_text(encoding='utf-8')
     except Exception as e:
-        print(f"Error reading references markdown {md_path}: {e}")
+        print(f"Error reading references markdown {path}: {e}")
         return refs
 
     current = None
@@ -208,78 +440,101 @@ def load_ts_references(md_path: str):
     return refs
 
 
+def is_placeholder_segment(segment):
+    """Return True for path segments built from a TypeScript template expression (`${id}`)."""
+    return '${' in segment
+
+
+def match_references(endpoints, ts_refs):
+    """
+    Match TypeScript references against the C# route templates.
+
+    The routes are stored in a RouteTrie, so `Orders/5` matches
+    `Orders/{id:int}` and segments holding a template expression
+    (`Orders/${id}`) match any route parameter, but not a literal segment
+    such as `Orders/ping`.
+
+    Args:
+        endpoints (dict): Result of find_endpoints()
+        ts_refs (dict): Result of load_ts_references()
+
+    Returns:
+        dict: route -> set of locations referencing it
+    """
+    trie = RouteTrie()
+    for route in endpoints:
+        trie.add(route, route)
+    used = {}
+    for path, locations in ts_refs.items():
+        if not locations:
+            continue
+        for route in trie.match(path, wildcard=is_placeholder_segment):
+            used.setdefault(route, set()).update(locations)
+    return used
+
+
 def generate_combined_report(endpoints, ts_refs, output_file, title='WSpace API Reference'):
-    """Write a markdown report grouping C# POST endpoints by controller and splitting
+    """Write a markdown report grouping C# endpoints by controller and splitting
     them into Referenced and Unreferenced according to ts_refs (case-insensitive keys)."""
-    # Build controller -> list of (endpoint, filenames from TS or empty)
-    controllers = {}
-    for endpoint, filenames in endpoints.items():
-        # endpoint expected like 'ControllerBase/Action'
-        parts = endpoint.split('/', 1)
-        controller = parts[0]
-        action = parts[1] if len(parts) > 1 else ''
-        controllers.setdefault(controller, []).append((endpoint, filenames))
+    used = match_references(endpoints, ts_refs)
 
     referenced = {}
     unreferenced = {}
-
-    for controller, items in controllers.items():
-        for endpoint, filenames in items:
-            endpoint_key = endpoint.lower()
-            if endpoint_key in ts_refs and ts_refs[endpoint_key]:
-                referenced.setdefault(controller, []).append((endpoint, ts_refs[endpoint_key]))
-            else:
-                unreferenced.setdefault(controller, []).append((endpoint, filenames))
+    for endpoint, info in endpoints.items():
+        if endpoint in used:
+            referenced.setdefault(info['controller'], []).append((endpoint, info['verbs'], used[endpoint]))
+        else:
+            unreferenced.setdefault(info['controller'], []).append((endpoint, info['verbs'], info['files']))
 
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(f"# {title}\n\n")
-        # Referenced
-        f.write("## Referenced\n\n")
-        if referenced:
-            for controller in sorted(referenced.keys()):
+        for heading, groups, label in (('Referenced', referenced, 'used in'),
+                                       ('Unreferenced', unreferenced, 'Defined in')):
+            f.write(f"## {heading}\n\n")
+            if not groups:
+                f.write(f"_No {heading.lower()} endpoints found._\n\n")
+                continue
+            for controller in sorted(groups.keys()):
                 f.write(f"### {controller}\n\n")
-                for endpoint, used_in in sorted(referenced[controller], key=lambda x: x[0]):
+                for endpoint, verbs, locations in sorted(groups[controller], key=lambda x: x[0]):
                     f.write(f"#### {endpoint}\n\n")
-                    f.write("used in\n\n")
-                    for filename in sorted(used_in):
-                        f.write(f"- `{filename}`\n")
+                    f.write(f"Methods: {', '.join(sorted(verbs))}\n\n")
+                    f.write(f"{label}\n\n")
+                    for location in sorted(locations):
+                        f.write(f"- `{location}`\n")
                     f.write("\n")
-        else:
-            f.write("_No referenced POST endpoints found._\n\n")
-
-        # Unreferenced
-        f.write("## Unreferenced\n\n")
-        if unreferenced:
-            for controller in sorted(unreferenced.keys()):
-                f.write(f"### {controller}\n\n")
-                for endpoint, filenames in sorted(unreferenced[controller], key=lambda x: x[0]):
-                    f.write(f"#### {endpoint}\n\n")
-                    f.write("Defined in\n\n")
-                    for filename in sorted(filenames):
-                        f.write(f"- `{filename}`\n")
-                    f.write("\n")
-        else:
-            f.write("_No unreferenced POST endpoints found._\n\n")
 
     print(f"Wrote combined report to {output_file}.")
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='Extract [HttpPost] endpoints from Controller.cs files and output Markdown or combined report with TS references.')
+    parser = argparse.ArgumentParser(description='Extract the endpoints of Controller.cs files ([Http*], [AcceptVerbs] and [Route] actions) and output Markdown or combined report with TS references.')
     parser.add_argument('root_directory', nargs='?', default='.', help='Root directory to scan')
     parser.add_argument('-o', '--output', default='post_endpoints.md', help='Output markdown file')
-    parser.add_argument('--references', help='Path to TypeScript endpoints markdown (from extract-endpoints.py) to compare against')
+    parser.add_argument('--references', help='TypeScript endpoint graph (.jsonl) or markdown (.md) from extract-endpoints.py to compare against')
+    parser.add_argument('--graph', help='Endpoint graph file for the endpoints (JSON lines, default: the output path with a .jsonl extension)')
+    parser.add_argument('--no-graph', action='store_true', help='Do not write the endpoint graph file')
     parser.add_argument('--title', default='WSpace API Reference', help='Title for combined report H1')
     parser.add_argument('--quiet', action='store_true', help='suppress progress output')
     parser.add_argument('--anonymousOnly', action='store_true', help='Only show endpoints with [AllowAnonymous]')
+    parser.add_argument('--methods', help='Comma-separated HTTP verbs to keep (e.g. POST,PUT; default: all)')
+    parser.add_argument('--route-prefix', default='api', help="Leading route segment to drop so routes line up with the TypeScript references (default: api, '' keeps it)")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of worker processes (default: 1, 0 = one per CPU)')
     args = parser.parse_args()
 
     if not os.path.isdir(args.root_directory):
         print(f"Error: Invalid directory path: {args.root_directory}")
         sys.exit(1)
 
-    endpoints = find_post_endpoints(args.root_directory, anonymous_only=args.anonymousOnly)
+    edges = None if args.no_graph else []
+    methods = {verb.strip().upper() for verb in args.methods.split(',') if verb.strip()} if args.methods else None
+    endpoints = find_endpoints(args.root_directory, anonymous_only=args.anonymousOnly, edges=edges,
+                               jobs=resolve_jobs(args.jobs), methods=methods, route_prefix=args.route_prefix)
     output_file = args.output or os.path.join(get_output_base_dir(), "post_endpoints.md")
+    if edges is not None:
+        graph_path = args.graph or os.path.splitext(output_file)[0] + '.jsonl'
+        write_graph(graph_path, edges)
+        print(f"Endpoint graph written: {graph_path} ({len(edges)} endpoints)")
     if args.references:
         ts_refs = load_ts_references(args.references)
         generate_combined_report(endpoints, ts_refs, output_file, title=args.title)
@@ -14,23 +14,37 @@ Usage
 """
 
 import argparse
+import os
 from pathlib import Path
 import sys
 
+# Add parent directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.file_scanner import DEFAULT_SKIP_DIRS, scan_files
+
+# Folders never scanned (dependencies such as node_modules, build output, VCS)
+SKIP_DIRS = DEFAULT_SKIP_DIRS
+
 # Patterns to exclude (files we don't want to document)
 EXCLUDED_PATTERNS = [
     'routing.module.ts',
     '.module.ts'
 ]
 
-def process_folder(source_root: Path, not_documented_file: Path) -> None:
+def process_folder(source_root: Path, not_documented_file: Path, sources=None) -> None:
     """
     Walk *source_root* recursively, locate *.ts files and add them to the
     not-documented list, skipping excluded patterns.
+
+    *sources* may hold the SourceFile records of a shared walk
+    (refresh-docs.py); the folder is then not scanned again.
     """
+    if sources is None:
+        sources = scan_files(str(source_root), {'.ts'}, SKIP_DIRS)
     with not_documented_file.open("w", encoding="utf-8") as f:
         f.write("# File non documentati\n\n")
-        for ts_file in source_root.rglob("*.ts"):
+        for source in sources:
+            ts_file = Path(source.path)
             # Skip excluded files
             if any(pattern in ts_file.name for pattern in EXCLUDED_PATTERNS):
                 print(f"Skipped: {ts_file} (excluded pattern)")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+C# XML documentation comment parser for extract-docs-cs.py.
+
+The text of a `///` block (with the slashes removed) is read in one pass by
+a small streaming tokenizer that yields text, start, end and empty-element
+tokens. It tolerates what real doc comments contain: missing closing tags,
+stray `<` and `&`, unknown tags. Top-level elements (`<summary>`,
+`<param>`, `<returns>`, `<exception>`, `<remarks>`, `<example>`,
+`<seealso>`, ...) become sections. Inline elements (`<see cref>`,
+`<paramref>`, `<c>`, `<code>`, `<para>`, `<list>`) are turned into Markdown
+while their section is read.
+"""
+
+import re
+import textwrap
+from html import unescape
+
+# Comments, CDATA sections and start/end/empty tags; everything else is text
+_TOKEN_RE = re.compile(r'''
+    <!--.*?-->
+  | <!\[CDATA\[(?P<cdata>.*?)\]\]>
+  | <(?P<close>/)?(?P<tag>[A-Za-z_][\w.:-]*)
+    (?P<attrs>(?:\s+[^\s=/>]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>/]+))?)*)
+    \s*(?P<empty>/)?>
+''', re.VERBOSE | re.DOTALL)
+
+_ATTR_RE = re.compile(r'''([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>/]+)))?''')
+
+# Whitespace around line breaks in ordinary (non-code) text
+_LINE_BREAK_RE = re.compile(r'[ \t]*\n[ \t]*')
+
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+# Top-level elements with a name attribute, collected as lists
+_NAMED_SECTIONS = {'param': 'params', 'typeparam': 'typeparams'}
+
+# Top-level elements kept as a single text section
+_TEXT_SECTIONS = {'summary', 'remarks', 'returns', 'value'}
+
+
+def tokenize(text):
+    """
+    Split XML doc text into tokens.
+
+    Args:
+        text (str): Doc comment text without the leading slashes
+
+    Yields:
+        tuple: ('text', str), ('start', tag, attrs), ('end', tag) or
+               ('empty', tag, attrs); tags are lower-cased and attrs is a dict
+    """
+    pos = 0
+    for match in _TOKEN_RE.finditer(text):
+        if match.start() > pos:
+            yield 'text', unescape(text[pos:match.start()])
+        pos = match.end()
+        if match.group('tag') is None:
+            if match.group('cdata') is not None:
+                yield 'text', match.group('cdata')
+            continue
+        tag = match.group('tag').lower()
+        if match.group('close'):
+            yield 'end', tag
+            continue
+        attrs = {}
+        for name, double, single, bare in _ATTR_RE.findall(match.group('attrs')):
+            attrs[name.lower()] = unescape(double or single or bare)
+        yield ('empty' if match.group('empty') else 'start'), tag, attrs
+    if pos < len(text):
+        yield 'text', unescape(text[pos:])
+
+
+def _code(text):
+    """Format text as inline code (with double backticks if it contains one, e.g. generic crefs)."""
+    if '`' in text:
+        return f"`` {text} ``"
+    return f"`{text}`"
+
+
+def _cref_name(cref):
+    """Turn a cref such as 'M:Ns.Type.Method(System.Int32)' into 'Ns.Type.Method(System.Int32)'."""
+    if len(cref) > 2 and cref[1] == ':':
+        return cref[2:]
+    return cref
+
+
+def _render_empty(tag, attrs):
+    """Markdown for an inline element without content (<see cref="X"/>, <paramref name="x"/>)."""
+    if tag in ('see', 'seealso'):
+        if 'cref' in attrs:
+            return _code(_cref_name(attrs['cref']))
+        if 'langword' in attrs:
+            return _code(attrs['langword'])
+        if 'href' in attrs:
+            return f"<{attrs['href']}>"
+        return ''
+    if tag in ('paramref', 'typeparamref'):
+        return _code(attrs.get('name', ''))
+    if tag == 'br':
+        return '\n'
+    if tag == 'para':
+        return '\n\n'
+    return ''
+
+
+def _render_inline(tag, attrs, content):
+    """Markdown for an inline element with its rendered content."""
+    if tag == 'c':
+        return _code(content.strip())
+    if tag == 'code':
+        return f"\n\n```\n{textwrap.dedent(content).strip(chr(10))}\n```\n\n"
+    if tag == 'para':
+        return f"\n\n{content.strip()}\n\n"
+    if tag in ('see', 'seealso'):
+        label = content.strip()
+        if 'href' in attrs:
+            return f"[{label or attrs['href']}]({attrs['href']})"
+        return _code(label) if label else _render_empty(tag, attrs)
+    if tag == 'list':
+        # One bullet per line, without the line breaks between the <item> elements
+        return '\n' + '\n'.join(line for line in content.split('\n') if line.strip()) + '\n'
+    if tag in ('item', 'listheader'):
+        return f"\n- {content.strip()}"
+    if tag == 'term':
+        return f"**{content.strip()}**: "
+    if tag in ('b', 'strong'):
+        return f"**{content.strip()}**"
+    if tag in ('i', 'em'):
+        return f"*{content.strip()}*"
+    return content
+
+
+def _clean(text):
+    """Strip a section and collapse runs of blank lines."""
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
+
+def parse_csdoc_content(csdoc_text):
+    """
+    Parse the text of a C# XML doc comment.
+
+    Args:
+        csdoc_text (str): Doc comment text without the leading slashes
+
+    Returns:
+        dict: Parsed sections:
+              summary, remarks, returns, value (str),
+              params, typeparams (list of {'name', 'description'}),
+              exceptions (list of {'type', 'description'}),
+              examples, see_also (list of str),
+              inheritdoc (str: cref or '' when inherited, None otherwise),
+              metadata (dict: other top-level elements such as <author>)
+    """
+    result = {
+        'summary': '',
+        'remarks': '',
+        'returns': '',
+        'value': '',
+        'params': [],
+        'typeparams': [],
+        'exceptions': [],
+        'examples': [],
+        'see_also': [],
+        'inheritdoc': None,
+        'metadata': {},
+    }
+    loose_text = []
+    # Open elements: (tag, attrs, rendered content parts)
+    stack = []
+
+    def close_top():
+        tag, attrs, parts = stack.pop()
+        content = ''.join(parts)
+        if stack:
+            stack[-1][2].append(_render_inline(tag, attrs, content))
+        else:
+            add_section(tag, attrs, content)
+
+    def add_section(tag, attrs, content):
+        if tag == 'example':
+            text = _clean(content)
+            if text:
+                result['examples'].append(text)
+        elif tag in _TEXT_SECTIONS:
+            text = _clean(content)
+            result[tag] = f"{result[tag]}\n\n{text}".strip() if result[tag] else text
+        elif tag in _NAMED_SECTIONS:
+            result[_NAMED_SECTIONS[tag]].append({'name': attrs.get('name', ''), 'description': _clean(content)})
+        elif tag == 'exception':
+            result['exceptions'].append({'type': _cref_name(attrs.get('cref', 'Exception')), 'description': _clean(content)})
+        elif tag == 'seealso':
+            result['see_also'].append(_render_inline(tag, attrs, content))
+        elif tag == 'inheritdoc':
+            result['inheritdoc'] = _cref_name(attrs.get('cref', ''))
+        else:
+            text = _clean(content)
+            if text:
+                result['metadata'][tag] = text
+
+    for token in tokenize(csdoc_text):
+        kind = token[0]
+        if kind == 'text':
+            text = token[1]
+            if not any(tag == 'code' for tag, _, _ in stack):
+                text = _LINE_BREAK_RE.sub('\n', text)
+            (stack[-1][2] if stack else loose_text).append(text)
+        elif kind == 'start':
+            stack.append((token[1], token[2], []))
+        elif kind == 'empty':
+            tag, attrs = token[1], token[2]
+            if stack:
+                stack[-1][2].append(_render_empty(tag, attrs))
+            elif tag in ('seealso', 'inheritdoc'):
+                add_section(tag, attrs, '')
+            else:
+                loose_text.append(_render_empty(tag, attrs))
+        elif any(tag == token[1] for tag, _, _ in stack):
+            # Close the matching element, and any unclosed ones inside it
+            while stack[-1][0] != token[1]:
+                close_top()
+            close_top()
+        # End tags without a matching start tag are ignored
+    while stack:
+        close_top()
+
+    # Plain `///` comments without tags document the member as well
+    if not result['summary']:
+        result['summary'] = _clean(''.join(loose_text))
+    return result
+
+
+def format_csdoc_as_markdown(parsed_csdoc):
+    """
+    Format a parsed XML doc comment as Markdown sections.
+
+    Args:
+        parsed_csdoc (dict): Result of parse_csdoc_content()
+
+    Returns:
+        str: Markdown text
+    """
+    md_parts = []
+
+    if parsed_csdoc.get('summary'):
+        md_parts.append(parsed_csdoc['summary'])
+    if parsed_csdoc.get('inheritdoc') is not None:
+        source = parsed_csdoc['inheritdoc']
+        md_parts.append(f"*Documentation inherited from `{source}`.*" if source else "*Documentation inherited.*")
+
+    metadata = parsed_csdoc.get('metadata', {})
+    if metadata:
+        md_parts.append('\n'.join(f"**{key.title()}**: {value}" for key, value in metadata.items()))
+
+    for key, title in (('typeparams', 'Type Parameters'), ('params', 'Parameters')):
+        entries = parsed_csdoc.get(key, [])
+        if entries:
+            md_parts.append(f"## {title}")
+            for entry in entries:
+                line = f"- **{entry['name']}**"
+                if entry['description']:
+                    line += f": {entry['description']}"
+                md_parts.append(line)
+
+    if parsed_csdoc.get('returns'):
+        md_parts.append("## Returns")
+        md_parts.append(parsed_csdoc['returns'])
+    if parsed_csdoc.get('value'):
+        md_parts.append("## Value")
+        md_parts.append(parsed_csdoc['value'])
+
+    exceptions = parsed_csdoc.get('exceptions', [])
+    if exceptions:
+        md_parts.append("## Exceptions")
+        for exception in exceptions:
+            line = f"- **{exception['type']}**"
+            if exception['description']:
+                line += f": {exception['description']}"
+            md_parts.append(line)
+
+    if parsed_csdoc.get('remarks'):
+        md_parts.append("## Remarks")
+        md_parts.append(parsed_csdoc['remarks'])
+
+    examples = parsed_csdoc.get('examples', [])
+    if examples:
+        md_parts.append("## Examples")
+        md_parts.extend(examples)
+
+    see_also = parsed_csdoc.get('see_also', [])
+    if see_also:
+        md_parts.append("## See Also")
+        md_parts.extend(f"- {see}" for see in see_also)
+
+    return '\n\n'.join(md_parts)
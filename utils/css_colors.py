@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+CSS color normalization and perceptual clustering.
+
+Color values are parsed from hex, rgb()/rgba(), hsl()/hsla() and named-color
+notation into canonical RGBA tuples, so `#FFF`, `#ffffff`, `white` and
+`rgb(255,255,255)` are recognized as the same color. Near-duplicates are then
+grouped by their CIELAB distance (CIE76 delta E). Distances are computed with
+NumPy when it is installed and with a grid index in pure Python otherwise.
+"""
+
+import colorsys
+import math
+import re
+from collections import Counter, defaultdict, namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Default clustering threshold: a delta E of about 2.3 is the
+# "just noticeable difference" for CIE76
+DEFAULT_DELTA_E = 2.3
+
+# Alpha differences are weighted like this many delta E units per full step
+# (0 -> 1), so fully opaque and half transparent variants are kept apart
+ALPHA_WEIGHT = 100.0
+
+NAMED_COLORS = {
+    'aliceblue': 'f0f8ff', 'antiquewhite': 'faebd7', 'aqua': '00ffff',
+    'aquamarine': '7fffd4', 'azure': 'f0ffff', 'beige': 'f5f5dc',
+    'bisque': 'ffe4c4', 'black': '000000', 'blanchedalmond': 'ffebcd',
+    'blue': '0000ff', 'blueviolet': '8a2be2', 'brown': 'a52a2a',
+    'burlywood': 'deb887', 'cadetblue': '5f9ea0', 'chartreuse': '7fff00',
+    'chocolate': 'd2691e', 'coral': 'ff7f50', 'cornflowerblue': '6495ed',
+    'cornsilk': 'fff8dc', 'crimson': 'dc143c', 'cyan': '00ffff',
+    'darkblue': '00008b', 'darkcyan': '008b8b', 'darkgoldenrod': 'b8860b',
+    'darkgray': 'a9a9a9', 'darkgreen': '006400', 'darkgrey': 'a9a9a9',
+    'darkkhaki': 'bdb76b', 'darkmagenta': '8b008b', 'darkolivegreen': '556b2f',
+    'darkorange': 'ff8c00', 'darkorchid': '9932cc', 'darkred': '8b0000',
+    'darksalmon': 'e9967a', 'darkseagreen': '8fbc8f', 'darkslateblue': '483d8b',
+    'darkslategray': '2f4f4f', 'darkslategrey': '2f4f4f', 'darkturquoise': '00ced1',
+    'darkviolet': '9400d3', 'deeppink': 'ff1493', 'deepskyblue': '00bfff',
+    'dimgray': '696969', 'dimgrey': '696969', 'dodgerblue': '1e90ff',
+    'firebrick': 'b22222', 'floralwhite': 'fffaf0', 'forestgreen': '228b22',
+    'fuchsia': 'ff00ff', 'gainsboro': 'dcdcdc', 'ghostwhite': 'f8f8ff',
+    'gold': 'ffd700', 'goldenrod': 'daa520', 'gray': '808080',
+    'green': '008000', 'greenyellow': 'adff2f', 'grey': '808080',
+    'honeydew': 'f0fff0', 'hotpink': 'ff69b4', 'indianred': 'cd5c5c',
+    'indigo': '4b0082', 'ivory': 'fffff0', 'khaki': 'f0e68c',
+    'lavender': 'e6e6fa', 'lavenderblush': 'fff0f5', 'lawngreen': '7cfc00',
+    'lemonchiffon': 'fffacd', 'lightblue': 'add8e6', 'lightcoral': 'f08080',
+    'lightcyan': 'e0ffff', 'lightgoldenrodyellow': 'fafad2', 'lightgray': 'd3d3d3',
+    'lightgreen': '90ee90', 'lightgrey': 'd3d3d3', 'lightpink': 'ffb6c1',
+    'lightsalmon': 'ffa07a', 'lightseagreen': '20b2aa', 'lightskyblue': '87cefa',
+    'lightslategray': '778899', 'lightslategrey': '778899', 'lightsteelblue': 'b0c4de',
+    'lightyellow': 'ffffe0', 'lime': '00ff00', 'limegreen': '32cd32',
+    'linen': 'faf0e6', 'magenta': 'ff00ff', 'maroon': '800000',
+    'mediumaquamarine': '66cdaa', 'mediumblue': '0000cd', 'mediumorchid': 'ba55d3',
+    'mediumpurple': '9370db', 'mediumseagreen': '3cb371', 'mediumslateblue': '7b68ee',
+    'mediumspringgreen': '00fa9a', 'mediumturquoise': '48d1cc', 'mediumvioletred': 'c71585',
+    'midnightblue': '191970', 'mintcream': 'f5fffa', 'mistyrose': 'ffe4e1',
+    'moccasin': 'ffe4b5', 'navajowhite': 'ffdead', 'navy': '000080',
+    'oldlace': 'fdf5e6', 'olive': '808000', 'olivedrab': '6b8e23',
+    'orange': 'ffa500', 'orangered': 'ff4500', 'orchid': 'da70d6',
+    'palegoldenrod': 'eee8aa', 'palegreen': '98fb98', 'paleturquoise': 'afeeee',
+    'palevioletred': 'db7093', 'papayawhip': 'ffefd5', 'peachpuff': 'ffdab9',
+    'peru': 'cd853f', 'pink': 'ffc0cb', 'plum': 'dda0dd',
+    'powderblue': 'b0e0e6', 'purple': '800080', 'rebeccapurple': '663399',
+    'red': 'ff0000', 'rosybrown': 'bc8f8f', 'royalblue': '4169e1',
+    'saddlebrown': '8b4513', 'salmon': 'fa8072', 'sandybrown': 'f4a460',
+    'seagreen': '2e8b57', 'seashell': 'fff5ee', 'sienna': 'a0522d',
+    'silver': 'c0c0c0', 'skyblue': '87ceeb', 'slateblue': '6a5acd',
+    'slategray': '708090', 'slategrey': '708090', 'snow': 'fffafa',
+    'springgreen': '00ff7f', 'steelblue': '4682b4', 'tan': 'd2b48c',
+    'teal': '008080', 'thistle': 'd8bfd8', 'tomato': 'ff6347',
+    'turquoise': '40e0d0', 'violet': 'ee82ee', 'wheat': 'f5deb3',
+    'white': 'ffffff', 'whitesmoke': 'f5f5f5', 'yellow': 'ffff00',
+    'yellowgreen': '9acd32',
+}
+
+_HEX_RE = re.compile(r'#([0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})')
+_FUNC_RE = re.compile(r'(rgba?|hsla?)\(\s*([^()]*?)\s*\)', re.IGNORECASE)
+_ARG_SPLIT_RE = re.compile(r'\s*,\s*|\s*/\s*|\s+')
+_HUE_UNITS = {'deg': 1.0, 'grad': 0.9, 'rad': 180.0 / math.pi, 'turn': 360.0}
+
+# A cluster of near-duplicate colors.
+#   representative: the most used color of the cluster (canonical RGBA)
+#   members:        list of (rgba, count, delta_e to the representative),
+#                   representative first
+#   total:          total uses of all members
+ColorCluster = namedtuple('ColorCluster', ['representative', 'members', 'total'])
+
+
+def parse_color(value):
+    """
+    Parse a CSS color value into a canonical RGBA tuple.
+
+    Args:
+        value (str): A color value such as `#FFF`, `rgb(0 0 0 / 50%)`,
+                     `hsla(120, 50%, 50%, .3)` or `white`. A trailing
+                     `!important` is ignored.
+
+    Returns:
+        tuple: (r, g, b, a) with r, g, b ints in 0-255 and a float in 0-1
+               rounded to 3 decimals, or None if the value is not a color
+    """
+    text = value.replace('!important', '').strip()
+    if not text:
+        return None
+
+    if text[0] == '#':
+        m = _HEX_RE.fullmatch(text)
+        if not m:
+            return None
+        digits = m.group(1)
+        if len(digits) <= 4:
+            digits = ''.join(c * 2 for c in digits)
+        r, g, b = (int(digits[i:i + 2], 16) for i in (0, 2, 4))
+        a = int(digits[6:8], 16) / 255 if len(digits) == 8 else 1.0
+        return r, g, b, round(a, 3)
+
+    lower = text.lower()
+    if lower in NAMED_COLORS:
+        hex_value = NAMED_COLORS[lower]
+        return int(hex_value[0:2], 16), int(hex_value[2:4], 16), int(hex_value[4:6], 16), 1.0
+    if lower == 'transparent':
+        return 0, 0, 0, 0.0
+
+    m = _FUNC_RE.fullmatch(text)
+    if not m:
+        return None
+    args = [a for a in _ARG_SPLIT_RE.split(m.group(2)) if a]
+    if len(args) not in (3, 4):
+        return None
+    try:
+        alpha = _parse_alpha(args[3]) if len(args) == 4 else 1.0
+        if m.group(1).lower().startswith('rgb'):
+            r, g, b = (_parse_channel(a) for a in args[:3])
+        else:
+            h = _parse_hue(args[0]) / 360.0
+            s = _parse_percent(args[1])
+            l = _parse_percent(args[2])
+            r, g, b = (round(c * 255) for c in colorsys.hls_to_rgb(h % 1.0, l, s))
+    except ValueError:
+        return None
+    return r, g, b, round(alpha, 3)
+
+
+def _parse_channel(arg):
+    if arg.endswith('%'):
+        number = float(arg[:-1]) * 255 / 100
+    else:
+        number = float(arg)
+    return max(0, min(255, round(number)))
+
+
+def _parse_alpha(arg):
+    number = float(arg[:-1]) / 100 if arg.endswith('%') else float(arg)
+    return max(0.0, min(1.0, number))
+
+
+def _parse_percent(arg):
+    number = float(arg[:-1]) if arg.endswith('%') else float(arg)
+    return max(0.0, min(1.0, number / 100))
+
+
+def _parse_hue(arg):
+    for unit, factor in _HUE_UNITS.items():
+        if arg.lower().endswith(unit):
+            return float(arg[:-len(unit)]) * factor
+    return float(arg)
+
+
+def format_color(rgba):
+    """
+    Format a canonical RGBA tuple: `#rrggbb` for opaque colors,
+    `rgba(r, g, b, a)` otherwise.
+    """
+    r, g, b, a = rgba
+    if a >= 1.0:
+        return f"#{r:02x}{g:02x}{b:02x}"
+    return f"rgba({r}, {g}, {b}, {a:g})"
+
+
+def normalize_color_counts(color_counts):
+    """
+    Merge raw color values that denote the same color.
+
+    Args:
+        color_counts (Counter): raw color value -> number of uses
+
+    Returns:
+        tuple:
+          - Counter: canonical RGBA tuple -> number of uses
+          - dict: canonical RGBA tuple -> Counter of raw spellings
+          - Counter: values that are not plain colors (variables, var(),
+            gradients, ...) -> number of uses
+    """
+    normalized = Counter()
+    variants = defaultdict(Counter)
+    unparsed = Counter()
+    for raw, count in color_counts.items():
+        rgba = parse_color(raw)
+        if rgba is None:
+            unparsed[raw] += count
+        else:
+            normalized[rgba] += count
+            variants[rgba][raw] += count
+    return normalized, variants, unparsed
+
+
+def _srgb_to_linear(c):
+    c = c / 255.0
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _lab_f(t):
+    return t ** (1.0 / 3.0) if t > 216.0 / 24389.0 else (24389.0 / 27.0 * t + 16.0) / 116.0
+
+
+def rgba_to_point(rgba):
+    """
+    Convert an RGBA tuple into the clustering space: CIELAB (D65) plus the
+    weighted alpha channel.
+    """
+    r, g, b = (_srgb_to_linear(c) for c in rgba[:3])
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047
+    y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883
+    fx, fy, fz = _lab_f(x), _lab_f(y), _lab_f(z)
+    return (116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz), rgba[3] * ALPHA_WEIGHT)
+
+
+def _points_numpy(colors):
+    """Vectorized rgba_to_point() over a list of RGBA tuples."""
+    data = np.asarray(colors, dtype=np.float64)
+    rgb = data[:, :3] / 255.0
+    rgb = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    matrix = np.array([
+        [0.4124564 / 0.95047, 0.3575761 / 0.95047, 0.1804375 / 0.95047],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339 / 1.08883, 0.1191920 / 1.08883, 0.9503041 / 1.08883],
+    ])
+    xyz = rgb @ matrix.T
+    f = np.where(xyz > 216.0 / 24389.0, np.cbrt(xyz), (24389.0 / 27.0 * xyz + 16.0) / 116.0)
+    points = np.empty((len(colors), 4))
+    points[:, 0] = 116.0 * f[:, 1] - 16.0
+    points[:, 1] = 500.0 * (f[:, 0] - f[:, 1])
+    points[:, 2] = 200.0 * (f[:, 1] - f[:, 2])
+    points[:, 3] = data[:, 3] * ALPHA_WEIGHT
+    return points
+
+
+def cluster_colors(normalized_counts, threshold=DEFAULT_DELTA_E, use_numpy=None):
+    """
+    Group near-duplicate colors.
+
+    Colors are visited from most to least used. Each color joins the nearest
+    already chosen representative within `threshold` delta E; otherwise it
+    becomes the representative of a new cluster. The result only depends on
+    the input, not on whether NumPy is used.
+
+    Args:
+        normalized_counts (Counter): canonical RGBA tuple -> number of uses
+        threshold (float): maximum delta E between a color and its
+                           representative
+        use_numpy (bool): force (True) or disable (False) the NumPy path;
+                          by default NumPy is used when installed
+
+    Returns:
+        list: ColorCluster objects with at least two members, sorted by
+              total uses
+    """
+    colors = sorted(normalized_counts, key=lambda c: (-normalized_counts[c], format_color(c)))
+    if threshold <= 0 or len(colors) < 2:
+        return []
+    if use_numpy is None:
+        use_numpy = np is not None
+
+    if use_numpy:
+        assignment = _assign_numpy(colors, threshold)
+    else:
+        assignment = _assign_grid(colors, threshold)
+
+    members = defaultdict(list)
+    for index, (leader, distance) in enumerate(assignment):
+        members[leader].append((colors[index], normalized_counts[colors[index]], distance))
+
+    clusters = []
+    for leader, items in members.items():
+        if len(items) < 2:
+            continue
+        total = sum(count for _, count, _ in items)
+        clusters.append(ColorCluster(colors[leader], items, total))
+    clusters.sort(key=lambda c: (-c.total, format_color(c.representative)))
+    return clusters
+
+
+def _assign_grid(colors, threshold):
+    """
+    Pure Python leader assignment. Representatives are bucketed in a grid of
+    `threshold`-sized cells, so only the neighbouring cells are searched.
+    Returns a list of (leader index, delta E) per color.
+    """
+    points = [rgba_to_point(c) for c in colors]
+    limit = threshold * threshold
+    cells = defaultdict(list)
+    offsets = [(a, b, c, d) for a in (-1, 0, 1) for b in (-1, 0, 1)
+               for c in (-1, 0, 1) for d in (-1, 0, 1)]
+    assignment = []
+    for index, point in enumerate(points):
+        key = tuple(int(math.floor(v / threshold)) for v in point)
+        best, best_dist = None, None
+        for offset in offsets:
+            cell = cells.get((key[0] + offset[0], key[1] + offset[1],
+                              key[2] + offset[2], key[3] + offset[3]))
+            if not cell:
+                continue
+            for leader in cell:
+                other = points[leader]
+                dist = ((point[0] - other[0]) ** 2 + (point[1] - other[1]) ** 2 +
+                        (point[2] - other[2]) ** 2 + (point[3] - other[3]) ** 2)
+                if dist <= limit and (best is None or (dist, leader) < (best_dist, best)):
+                    best, best_dist = leader, dist
+        if best is None:
+            cells[key].append(index)
+            assignment.append((index, 0.0))
+        else:
+            assignment.append((best, math.sqrt(best_dist)))
+    return assignment
+
+
+def _assign_numpy(colors, threshold):
+    """
+    NumPy leader assignment. Uses the same `threshold`-sized grid as
+    _assign_grid(), but finds every pair of colors close enough to be
+    clustered with array operations (one pass per neighbouring cell offset),
+    so the greedy pass only walks those pairs.
+    Returns a list of (leader index, delta E) per color.
+    """
+    points = _points_numpy(colors)
+    limit = threshold * threshold
+    count = len(colors)
+
+    # One integer code per grid cell; the +1 margin keeps neighbour codes valid
+    cells = np.floor(points / threshold).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    sizes = cells.max(axis=0) + 2
+    strides = np.array([sizes[1] * sizes[2] * sizes[3], sizes[2] * sizes[3], sizes[3], 1])
+    codes = cells @ strides
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+
+    pair_rows, pair_cols, pair_dist = [], [], []
+    for offset in np.array(np.meshgrid(*[(-1, 0, 1)] * 4)).reshape(4, -1).T:
+        # Searching with sorted targets keeps searchsorted cache friendly
+        target = sorted_codes + offset @ strides
+        low = np.searchsorted(sorted_codes, target, side='left')
+        hits = np.searchsorted(sorted_codes, target, side='right') - low
+        total = int(hits.sum())
+        if not total:
+            continue
+        rows = np.repeat(order, hits)
+        skip = np.repeat(np.cumsum(hits) - hits, hits)
+        cols = order[np.repeat(low, hits) + np.arange(total) - skip]
+        # Only pairs where the other color comes first in visiting order
+        keep = cols < rows
+        rows, cols = rows[keep], cols[keep]
+        diff = points[rows] - points[cols]
+        dist = np.einsum('ij,ij->i', diff, diff)
+        keep = dist <= limit
+        pair_rows.append(rows[keep])
+        pair_cols.append(cols[keep])
+        pair_dist.append(dist[keep])
+
+    rows = np.concatenate(pair_rows) if pair_rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(pair_cols) if pair_cols else np.empty(0, dtype=np.int64)
+    dist = np.concatenate(pair_dist) if pair_dist else np.empty(0)
+    ranking = np.lexsort((cols, dist, rows))
+    rows, cols, dist = rows[ranking].tolist(), cols[ranking].tolist(), dist[ranking].tolist()
+
+    is_leader = [False] * count
+    assignment = []
+    pos = 0
+    for index in range(count):
+        best = None
+        while pos < len(rows) and rows[pos] == index:
+            if best is None and is_leader[cols[pos]]:
+                best = pos
+            pos += 1
+        if best is None:
+            is_leader[index] = True
+            assignment.append((index, 0.0))
+        else:
+            assignment.append((cols[best], math.sqrt(dist[best])))
+    return assignment
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Duplicate rule detection for CSS/SCSS stylesheets.
+
+Every rule block (the declarations of one selector in one file) is reduced
+to a fingerprint: its normalized set of `property: value` declarations.
+Identical blocks share an exact hash. Near-identical blocks are found with
+MinHash signatures and locality-sensitive hashing (LSH): blocks are only
+compared with the few blocks that share a band of their signature, never
+with every other block, so the work stays linear in the number of blocks.
+
+Only one entry per distinct fingerprint is kept (with a capped list of
+locations), which bounds memory on very large trees.
+"""
+
+import hashlib
+import operator
+import random
+from collections import namedtuple
+
+# Mersenne prime used by the MinHash permutations
+_PRIME = (1 << 61) - 1
+
+# One place a rule block was seen: file path, first line and selector text
+Location = namedtuple('Location', ['path', 'line', 'selector'])
+
+# Blocks sharing one fingerprint
+#   declarations: normalized `prop: value` strings, sorted
+#   size:         bytes of the declarations as written out
+#   locations:    first `max_locations` places the block was seen
+#   count:        total number of copies
+DuplicateGroup = namedtuple('DuplicateGroup', ['declarations', 'size', 'locations', 'count', 'savings'])
+
+# Two distinct fingerprints with an estimated Jaccard similarity
+NearDuplicate = namedtuple('NearDuplicate', ['first', 'second', 'similarity', 'savings'])
+
+# A property/value declared more than once in the same rule
+RepeatedDeclaration = namedtuple('RepeatedDeclaration', ['location', 'declaration', 'times', 'savings'])
+
+
+class _Fingerprint:
+    __slots__ = ('declarations', 'size', 'locations', 'count', 'signature')
+
+    def __init__(self, declarations, size, signature):
+        self.declarations = declarations
+        self.size = size
+        self.locations = []
+        self.count = 0
+        self.signature = signature
+
+
+def normalize_declaration(prop, value):
+    """Normalize one declaration for comparison: `prop: value`."""
+    value = ' '.join(value.split())
+    if '"' not in value and "'" not in value and 'url(' not in value:
+        value = value.lower()
+    return f"{prop.lower()}: {value}"
+
+
+class DuplicateDetector:
+    """
+    Single-pass detector of identical and near-identical rule blocks.
+
+    Feed it one file at a time with add_file(), then read exact_groups(),
+    near_duplicates() and repeated_declarations().
+    """
+
+    def __init__(self, similarity=0.8, num_perm=32, bands=8, min_declarations=2,
+                 max_locations=5, bucket_size=32, memo_size=200000):
+        """
+        Args:
+            similarity (float): Minimum estimated Jaccard similarity reported
+                                as a near-duplicate
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands (num_perm must be a multiple of it)
+            min_declarations (int): Smaller blocks are ignored
+            max_locations (int): Locations remembered per fingerprint
+            bucket_size (int): Fingerprints compared per LSH bucket
+            memo_size (int): Cached per-declaration hashes before the cache
+                             is reset
+        """
+        self.similarity = similarity
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_declarations = min_declarations
+        self.max_locations = max_locations
+        self.bucket_size = bucket_size
+        self.memo_size = memo_size
+
+        rng = random.Random(1)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._memo = {}
+        self._fingerprints = {}
+        self._buckets = {}
+        self._pairs = {}
+        self._repeated = []
+        self.blocks = 0
+
+    def add_file(self, path, records):
+        """
+        Add the property declarations of one file.
+
+        Args:
+            path (str): File path used in the reported locations
+            records (iterable): Declaration records (scss_tokenizer) of
+                                property declarations, in source order
+        """
+        blocks = {}
+        for decl in records:
+            if not decl.selectors or decl.selectors[0].startswith(('@mixin', '@function')):
+                continue
+            key = (decl.selectors, decl.media)
+            block = blocks.get(key)
+            if block is None:
+                block = blocks[key] = (decl.line, {}, {})
+            normalized = normalize_declaration(decl.prop, decl.value)
+            block[1][decl.prop.lower()] = normalized
+            block[2][normalized] = block[2].get(normalized, 0) + 1
+
+        for (selectors, media), (line, by_prop, seen) in blocks.items():
+            selector = ' '.join(selectors)
+            if media:
+                selector = f"{selector} @media {media}"
+            location = Location(path, line, selector)
+            for declaration, times in seen.items():
+                if times > 1:
+                    self._repeated.append(RepeatedDeclaration(
+                        location, declaration, times, (times - 1) * (len(declaration) + 1)
+                    ))
+            if len(by_prop) >= self.min_declarations:
+                self._add_block(location, sorted(by_prop.values()))
+
+    def _add_block(self, location, declarations):
+        self.blocks += 1
+        key = hashlib.blake2b('\n'.join(declarations).encode('utf-8'), digest_size=16).digest()
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            size = sum(len(d) + 1 for d in declarations)
+            fingerprint = _Fingerprint(tuple(declarations), size, self._signature(declarations))
+            self._fingerprints[key] = fingerprint
+            self._index(key, fingerprint)
+        fingerprint.count += 1
+        if len(fingerprint.locations) < self.max_locations:
+            fingerprint.locations.append(location)
+
+    def _signature(self, declarations):
+        """MinHash signature: element-wise minimum of the declaration hashes."""
+        memo = self._memo
+        vectors = []
+        for declaration in declarations:
+            vector = memo.get(declaration)
+            if vector is None:
+                if len(memo) >= self.memo_size:
+                    memo.clear()
+                base = int.from_bytes(
+                    hashlib.blake2b(declaration.encode('utf-8'), digest_size=8).digest(), 'little'
+                )
+                vector = memo[declaration] = tuple((a * base + b) % _PRIME for a, b in self._perms)
+            vectors.append(vector)
+        return tuple(map(min, zip(*vectors)))
+
+    def _index(self, key, fingerprint):
+        """Compare a new fingerprint with those sharing an LSH band, then file it."""
+        signature = fingerprint.signature
+        compared = set()
+        for band in range(self.bands):
+            band_key = (band, signature[band * self.rows:(band + 1) * self.rows])
+            bucket = self._buckets.get(band_key)
+            if bucket is None:
+                self._buckets[band_key] = [key]
+                continue
+            for other_key in bucket:
+                if other_key in compared:
+                    continue
+                compared.add(other_key)
+                other = self._fingerprints[other_key]
+                matches = sum(map(operator.eq, signature, other.signature))
+                estimate = matches / self.num_perm
+                if estimate >= self.similarity:
+                    self._pairs[(other_key, key)] = estimate
+            if len(bucket) < self.bucket_size:
+                bucket.append(key)
+
+    def exact_groups(self):
+        """Return DuplicateGroup objects for blocks seen more than once, by savings."""
+        groups = [
+            DuplicateGroup(f.declarations, f.size, f.locations, f.count, (f.count - 1) * f.size)
+            for f in self._fingerprints.values() if f.count > 1
+        ]
+        groups.sort(key=lambda g: (-g.savings, g.declarations))
+        return groups
+
+    def near_duplicates(self):
+        """
+        Return NearDuplicate pairs of distinct blocks, by savings. The savings
+        estimate is the similarity times the smaller block size: roughly the
+        shared declarations that could move to one combined rule.
+        """
+        pairs = []
+        for (first_key, second_key), similarity in self._pairs.items():
+            first = self._fingerprints[first_key]
+            second = self._fingerprints[second_key]
+            savings = int(similarity * min(first.size, second.size))
+            pairs.append(NearDuplicate(
+                DuplicateGroup(first.declarations, first.size, first.locations, first.count, 0),
+                DuplicateGroup(second.declarations, second.size, second.locations, second.count, 0),
+                similarity,
+                savings,
+            ))
+        pairs.sort(key=lambda p: (-p.savings, -p.similarity, p.first.declarations))
+        return pairs
+
+    def repeated_declarations(self):
+        """Return RepeatedDeclaration entries, by savings."""
+        return sorted(self._repeated, key=lambda r: (-r.savings, r.location))
+
+    @property
+    def unique_blocks(self):
+        return len(self._fingerprints)
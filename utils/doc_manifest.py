@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Incremental build manifest for the documentation extractors.
+
+The manifest lives in the output directory and records, for every source
+file of one project, its modification time, size and content hash, the
+extraction result (documented or skipped) and the hash of each Markdown file
+generated from it. On the next run:
+
+- sources whose mtime and size, or failing that content hash, are unchanged
+  are not parsed again (a fresh CI checkout changes every mtime but not the
+  content);
+- Markdown files whose new content is byte-identical to the recorded one
+  are not rewritten;
+- Markdown files of removed sources, or of sources that lost their
+  documentation, are deleted.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+
+def content_hash(data):
+    """Return the hex digest used for source and output contents."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class DocManifest:
+    """
+    Per-project record of the sources an extractor processed and the
+    Markdown files it generated from them.
+    """
+
+    def __init__(self, output_dir, root, name, version=1, full=False):
+        """
+        Args:
+            output_dir (str): Directory the Markdown files are written to
+            root (str): Scanned project folder; each project gets its own
+                        manifest file, so projects can share an output folder
+            name (str): Extractor name (e.g. 'ts'), part of the file name
+            version (int): Format version of the generated Markdown. A
+                           manifest written with another version is ignored,
+                           so every source is processed again.
+            full (bool): Process every source even if unchanged. Stale
+                         outputs of the previous run are still deleted.
+        """
+        self.output_dir = output_dir
+        self.root = os.path.abspath(root)
+        self.version = version
+        self.full = full
+        root_hash = content_hash(self.root)[:12]
+        self.manifest_path = os.path.join(output_dir, f".doc-manifest-{name}-{root_hash}.json")
+        self._previous = {}
+        self._entries = {}
+        self._hashes = {}
+        self._old_outputs = {}
+        self._new_outputs = {}
+        self._shared = set()
+
+    def load(self):
+        """
+        Load the manifest of the previous run. Missing, unreadable or outdated
+        manifests leave it empty.
+
+        Returns:
+            DocManifest: self, to allow chaining
+        """
+        if not os.path.exists(self.manifest_path):
+            return self
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable manifest {self.manifest_path}: {e}", file=sys.stderr)
+            return self
+        if data.get('version') != self.version or data.get('root') != self.root:
+            return self
+
+        self._previous = data.get('sources', {})
+        for entry in self._previous.values():
+            for output, digest in entry['outputs'].items():
+                if output in self._old_outputs:
+                    self._shared.add(output)
+                self._old_outputs[output] = digest
+        return self
+
+    def _key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root)
+
+    def lookup(self, path):
+        """
+        Return the recorded result of an unchanged source.
+
+        A source is unchanged if its mtime and size match the manifest, or if
+        its content hash does. Sources sharing an output file with another
+        source, or whose outputs were deleted, are always processed again.
+
+        Args:
+            path (str): Source file path
+
+        Returns:
+            str: The recorded status of the source, or None if it must be
+                 processed
+        """
+        key = self._key(path)
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        signature = [stat_result.st_mtime_ns, stat_result.st_size]
+        entry = self._previous.get(key)
+
+        if entry is not None and not self.full and entry['sig'] == signature:
+            digest = entry['hash']
+        else:
+            try:
+                with open(path, 'rb') as f:
+                    digest = content_hash(f.read())
+            except OSError:
+                return None
+        self._hashes[key] = (signature, digest)
+
+        if entry is None or self.full or entry['hash'] != digest:
+            return None
+        outputs = entry['outputs']
+        if any(output in self._shared for output in outputs):
+            return None
+        if not all(os.path.exists(os.path.join(self.output_dir, output)) for output in outputs):
+            return None
+
+        self._entries[key] = dict(entry, sig=signature)
+        self._new_outputs.update(outputs)
+        return entry['status']
+
+    def write(self, md_file_path, md_content):
+        """
+        Write a Markdown file unless the same content is already on disk
+        (and no other source wrote the same file earlier in this run).
+
+        Args:
+            md_file_path (str): Target path (inside the output directory)
+            md_content (str): Markdown text
+
+        Returns:
+            bool: True if the file was written, False if it was up to date
+        """
+        output = os.path.relpath(md_file_path, self.output_dir)
+        digest = content_hash(md_content)
+        if (self._old_outputs.get(output) == digest and output not in self._new_outputs
+                and os.path.exists(md_file_path)):
+            self._new_outputs[output] = digest
+            return False
+        os.makedirs(os.path.dirname(md_file_path) or '.', exist_ok=True)
+        with open(md_file_path, 'w', encoding='utf-8') as md_file:
+            md_file.write(md_content)
+        self._new_outputs[output] = digest
+        return True
+
+    def record(self, path, status, md_file_paths=()):
+        """
+        Record the result of processing a source. The Markdown files may still
+        be being written (by write(), possibly on another thread); a source
+        whose files were not all written is left out of the saved manifest so
+        it is processed again next time.
+
+        Args:
+            path (str): Source file path
+            status (str): Extractor-defined result (e.g. 'ok', 'skipped')
+            md_file_paths (list): Markdown files generated from the source
+        """
+        key = self._key(path)
+        signature, digest = self._hashes.pop(key, (None, None))
+        if digest is None:
+            return
+        outputs = [os.path.relpath(md_file_path, self.output_dir) for md_file_path in md_file_paths]
+        self._entries[key] = {'sig': signature, 'hash': digest, 'status': status, 'outputs': outputs}
+
+    def finish(self):
+        """
+        Delete the outputs no source produces any more and save the manifest.
+        Call it after every write() has finished.
+
+        Returns:
+            list: Paths of the deleted Markdown files
+        """
+        for key, entry in list(self._entries.items()):
+            if all(output in self._new_outputs for output in entry['outputs']):
+                entry['outputs'] = {output: self._new_outputs[output] for output in entry['outputs']}
+            else:
+                del self._entries[key]
+
+        removed = []
+        for output in sorted(set(self._old_outputs) - set(self._new_outputs)):
+            md_file_path = os.path.join(self.output_dir, output)
+            try:
+                os.remove(md_file_path)
+                removed.append(md_file_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[WARN] Could not delete {md_file_path}: {e}", file=sys.stderr)
+        self.save()
+        return removed
+
+    def save(self):
+        """Write the manifest to disk."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': self.version, 'root': self.root, 'sources': self._entries},
+                    f,
+                    separators=(',', ':'),
+                )
+            os.replace(tmp_path, self.manifest_path)
+        except Exception as e:
+            print(f"[WARN] Failed to write manifest {self.manifest_path}: {e}", file=sys.stderr)
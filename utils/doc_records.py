@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Structured documentation records shared by the doc extractors.
+
+The extractors hand DocRecord tuples straight to their Markdown renderers
+(and to the symbol index) instead of serialising them into
+`KIND:name:text` strings and splitting those again, which broke whenever
+the documentation itself contained a blank line or a line starting with a
+kind prefix. Records are plain namedtuples, so they pickle cheaply across
+worker processes and map one-to-one onto JSON lists for caches.
+"""
+
+from collections import namedtuple
+
+# One documented declaration
+#   kind:     'MODULE', 'CLASS', 'FUNCTION', 'INTERFACE', 'COMMENT', ...
+#   name:     plain name ('module' for module documentation, the first
+#             words of the text for COMMENT records)
+#   qualname: qualified name where known (e.g. 'Class.method'), else name
+#   line:     1-based line of the documentation or definition
+#   doc:      cleaned documentation text (stripped, never empty)
+DocRecord = namedtuple('DocRecord', ['kind', 'name', 'qualname', 'line', 'doc'])
+
+
+def make_record(kind, name, line, doc, qualname=None):
+    """
+    Build a DocRecord.
+
+    Args:
+        kind (str): Record kind (e.g. 'FUNCTION')
+        name (str): Plain name
+        line (int): 1-based line number
+        doc (str): Cleaned documentation text
+        qualname (str): Qualified name (defaults to name)
+
+    Returns:
+        DocRecord: The record
+    """
+    return DocRecord(kind, name, qualname or name, line, doc)
+
+
+def records_line_count(records):
+    """
+    Count the lines of the records in the legacy `KIND:name:text` text form
+    (blocks separated by blank lines), without building the text.
+
+    The extractors skip files whose documentation is three lines or shorter.
+
+    Args:
+        records (list): DocRecord objects
+
+    Returns:
+        int: Number of lines (0 if there are no records)
+    """
+    if not records:
+        return 0
+    return sum(record.doc.count('\n') + 1 for record in records) + len(records) - 1
+
+
+def records_to_json(records):
+    """Return records as JSON-serialisable lists."""
+    return [list(record) for record in records]
+
+
+def records_from_json(rows):
+    """Rebuild records from the lists written by records_to_json()."""
+    return [DocRecord(*row) for row in rows]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Endpoint graph files shared by extract-endpoints.py and list-unused-endpoints.py.
+
+A graph file is JSON Lines: one edge per line linking an endpoint to the
+place that references or defines it:
+
+    {"endpoint": "Orders/Save", "file": "src/app/orders.ts", "line": 12, "method": "string"}
+
+`method` says how the edge was found: 'string' or 'regex' for TypeScript
+references, the HTTP verb (e.g. 'POST') for controller actions. Reports join
+the two sides on the lower-cased endpoint instead of scraping Markdown.
+"""
+
+import json
+from collections import namedtuple
+
+# One endpoint reference or definition
+#   endpoint: normalized endpoint ('Controller/Action')
+#   file:     source file, relative to the scanned root, '/' separated
+#   line:     1-based line number
+#   method:   'string' / 'regex' (TypeScript) or the HTTP verb (C#)
+EndpointEdge = namedtuple('EndpointEdge', ['endpoint', 'file', 'line', 'method'])
+
+
+def write_graph(path, edges):
+    """
+    Write edges to a JSON Lines graph file, sorted by endpoint, file and line.
+
+    Args:
+        path (str): Target file path
+        edges (iterable): EndpointEdge objects
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for edge in sorted(edges):
+            f.write(json.dumps(edge._asdict(), ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def read_graph(path):
+    """
+    Read a graph file written by write_graph().
+
+    Args:
+        path (str): Graph file path
+
+    Returns:
+        list: EndpointEdge objects (blank lines are ignored)
+    """
+    edges = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                edges.append(EndpointEdge(data['endpoint'], data['file'], data.get('line'), data.get('method', '')))
+    return edges
+
+
+def index_by_endpoint(edges):
+    """
+    Group edges by lower-cased endpoint.
+
+    Args:
+        edges (iterable): EndpointEdge objects
+
+    Returns:
+        dict: lower-cased endpoint -> list of edges
+    """
+    index = {}
+    for edge in edges:
+        index.setdefault(edge.endpoint.lower(), []).append(edge)
+    return index
+
+
+def edge_location(edge):
+    """Return 'file:line' for an edge (just the file if the line is unknown)."""
+    return f"{edge.file}:{edge.line}" if edge.line else edge.file
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Persistent per-file result cache shared by scripts that rescan large trees.
+
+Each entry stores a script-defined result for one source file together with
+the file's modification time and size. On the next run a file whose mtime and
+size are unchanged can reuse its cached result instead of being parsed again.
+"""
+
+import json
+import os
+import sys
+
+
+class FileResultCache:
+    """
+    JSON-backed cache of per-file results keyed by path + mtime + size.
+
+    The cache also carries an `extra` dict that scripts can use to persist
+    derived data (for example aggregated totals) next to the file entries.
+    """
+
+    def __init__(self, cache_path, version=1):
+        """
+        Args:
+            cache_path (str): Path of the JSON file backing the cache, or None
+                              for an in-memory cache
+            version (int): Format version of the stored results. A cache file
+                           written with another version is ignored.
+        """
+        self.cache_path = cache_path
+        self.version = version
+        self.entries = {}
+        self.extra = {}
+        self.dirty = False
+
+    def load(self):
+        """
+        Load the cache file from disk. Missing, unreadable or outdated cache
+        files leave the cache empty.
+
+        Returns:
+            FileResultCache: self, to allow chaining
+        """
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return self
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable cache {self.cache_path}: {e}", file=sys.stderr)
+            return self
+
+        if data.get('version') != self.version:
+            return self
+        self.entries = data.get('files', {})
+        self.extra = data.get('extra', {})
+        return self
+
+    def save(self):
+        """Write the cache back to disk if anything changed since loading."""
+        if self.cache_path is None or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': self.version, 'files': self.entries, 'extra': self.extra},
+                    f,
+                    separators=(',', ':'),
+                )
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"[WARN] Failed to write cache {self.cache_path}: {e}", file=sys.stderr)
+
+    @staticmethod
+    def signature(stat_result):
+        """Return the (mtime_ns, size) pair used to detect changed files."""
+        return [stat_result.st_mtime_ns, stat_result.st_size]
+
+    def get(self, path, stat_result):
+        """
+        Return the cached result for `path` if the file is unchanged.
+
+        Args:
+            path (str): Source file path (used as the cache key)
+            stat_result (os.stat_result): Current stat of the file
+
+        Returns:
+            The cached result, or None if missing or stale
+        """
+        entry = self.entries.get(path)
+        if entry is None or entry['sig'] != self.signature(stat_result):
+            return None
+        return entry['result']
+
+    def peek(self, path):
+        """Return the cached result for `path` without checking freshness."""
+        entry = self.entries.get(path)
+        return entry['result'] if entry is not None else None
+
+    def put(self, path, result, stat_result):
+        """Store the result computed for `path` at the given stat."""
+        self.entries[path] = {'sig': self.signature(stat_result), 'result': result}
+        self.dirty = True
+
+    def discard(self, path):
+        """
+        Drop the entry for `path`.
+
+        Returns:
+            The result that was stored, or None
+        """
+        entry = self.entries.pop(path, None)
+        if entry is None:
+            return None
+        self.dirty = True
+        return entry['result']
+
+    def prune(self, keep_paths):
+        """
+        Remove entries for files that no longer exist in the scanned tree.
+
+        Args:
+            keep_paths (set): Paths seen during the current scan
+
+        Returns:
+            dict: path -> result for every removed entry
+        """
+        removed = {}
+        for path in [p for p in self.entries if p not in keep_paths]:
+            removed[path] = self.discard(path)
+        return removed
+
+    def results(self):
+        """Iterate over (path, result) pairs for every cached file."""
+        for path, entry in self.entries.items():
+            yield path, entry['result']
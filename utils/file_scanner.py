@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Shared source tree scanner.
+
+Walks a directory tree once with os.scandir, pruning skipped directories
+before descending into them, and hands typed SourceFile records to one or
+more registered extractors. Several extractors can share a single walk, so
+a full documentation refresh reads the directory tree only once.
+"""
+
+import os
+from collections import namedtuple
+
+# Directories that never contain project sources: version control,
+# dependencies, caches and build output
+DEFAULT_SKIP_DIRS = frozenset({
+    '.git', '.svn', '.hg',
+    'node_modules', 'site-packages',
+    '__pycache__', '.pytest_cache', '.mypy_cache', '.tox', '.eggs',
+    'dist', 'build',
+})
+
+# One file found by the scanner.
+#   path:     full path (root joined with the relative path)
+#   rel_path: path relative to the scanned root, with os.sep separators
+#   dirs:     tuple of directory names between the root and the file
+#   name:     file name
+#   ext:      lower-case extension including the dot ('' if none)
+#   stat:     os.stat_result of the file (from the directory scan)
+SourceFile = namedtuple('SourceFile', ['path', 'rel_path', 'dirs', 'name', 'ext', 'stat'])
+
+
+def walk_files(root, skip_dirs=DEFAULT_SKIP_DIRS):
+    """
+    Yield a SourceFile for every file under `root`.
+
+    Directories whose name is in `skip_dirs` are not entered. Symbolic links
+    to directories are not followed (like os.walk). Unreadable directories
+    and files that cannot be stat'ed are skipped.
+
+    Args:
+        root (str): Directory to scan
+        skip_dirs (set): Directory names to prune
+
+    Yields:
+        SourceFile: One record per file, directories in scandir order
+    """
+    stack = [(root, ())]
+    while stack:
+        dirpath, dirs = stack.pop()
+        try:
+            entries = list(os.scandir(dirpath))
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if entry.name not in skip_dirs and not entry.is_symlink():
+                        subdirs.append((entry.path, dirs + (entry.name,)))
+                    continue
+                stat_result = entry.stat()
+            except OSError:
+                continue
+            name = entry.name
+            ext = os.path.splitext(name)[1].lower()
+            rel_path = os.path.join(*dirs, name) if dirs else name
+            yield SourceFile(entry.path, rel_path, dirs, name, ext, stat_result)
+        # Visit subdirectories in order, depth first
+        stack.extend(reversed(subdirs))
+
+
+def scan_files(root, extensions, skip_dirs=DEFAULT_SKIP_DIRS, match=None):
+    """
+    Yield the SourceFile records of one kind of source file.
+
+    Args:
+        root (str): Directory to scan
+        extensions (set): Lower-case extensions to keep (e.g. {'.ts', '.tsx'})
+        skip_dirs (set): Directory names to prune
+        match (callable): Optional extra filter, called with the SourceFile
+
+    Yields:
+        SourceFile: Matching files
+    """
+    for source in walk_files(root, skip_dirs):
+        if source.ext in extensions and (match is None or match(source)):
+            yield source
+
+
+class FileScanner:
+    """
+    Runs several extractors over one walk of a directory tree.
+
+    Each extractor is registered with the extensions it wants and its own
+    skip list. The walk only prunes directories that every extractor skips;
+    files inside a directory that just some extractors skip are only given
+    to the others.
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Directory to scan
+        """
+        self.root = root
+        self._extractors = []
+
+    def register(self, name, extensions, handler=None, skip_dirs=DEFAULT_SKIP_DIRS, match=None):
+        """
+        Register an extractor.
+
+        Args:
+            name (str): Extractor name, used as key in the run() result
+            extensions (set): Lower-case extensions the extractor handles
+            handler (callable): Called with each matching SourceFile during
+                                the walk. Without a handler the files are
+                                collected and returned by run().
+            skip_dirs (set): Directory names this extractor ignores
+            match (callable): Optional extra filter on the SourceFile
+        """
+        self._extractors.append((name, frozenset(extensions), handler, frozenset(skip_dirs), match))
+
+    def run(self):
+        """
+        Walk the tree once and dispatch every file.
+
+        Returns:
+            dict: name -> list of SourceFile for extractors without a handler
+        """
+        collected = {name: [] for name, _, handler, _, _ in self._extractors if handler is None}
+        if not self._extractors:
+            return collected
+        prune = frozenset.intersection(*(skip for _, _, _, skip, _ in self._extractors))
+        by_ext = {}
+        for extractor in self._extractors:
+            for ext in extractor[1]:
+                by_ext.setdefault(ext, []).append(extractor)
+
+        for source in walk_files(self.root, prune):
+            for name, _, handler, skip_dirs, match in by_ext.get(source.ext, ()):
+                if source.dirs and not skip_dirs.isdisjoint(source.dirs):
+                    continue
+                if match is not None and not match(source):
+                    continue
+                if handler is None:
+                    collected[name].append(source)
+                else:
+                    handler(source)
+        return collected
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Linear-time Markdown building for the documentation extractors.
+
+MarkdownBuilder collects the pieces of a document in a list and joins them
+once, instead of growing one string with `+=` for every line, which copies
+the whole document each time CPython cannot resize it in place.
+member_section() renders the "one member / list of members" layout every
+extractor uses for functions, classes, interfaces, ...
+write_markdown_file() and report_written() are the task and callback the
+extractors hand to utils.parallel.OrderedWriter.
+"""
+
+import os
+from collections import defaultdict
+
+
+def group_records(records):
+    """
+    Group records by kind in a single pass, keeping their order.
+
+    Args:
+        records (list): DocRecord objects
+
+    Returns:
+        dict: kind -> list of records
+    """
+    groups = defaultdict(list)
+    for record in records:
+        groups[record.kind].append(record)
+    return groups
+
+
+class MarkdownBuilder:
+    """Accumulates Markdown text and joins it once."""
+
+    def __init__(self):
+        self._parts = []
+
+    def add(self, *parts):
+        """
+        Append text to the document.
+
+        Args:
+            *parts (str): Pieces of text, appended in order
+        """
+        self._parts.extend(parts)
+
+    def member_section(self, label, plural, members, summary, detail):
+        """
+        Render a group of documented members.
+
+        A single member is written as "**Label**: `name`" followed by its
+        documentation. Several members get a "**Plural**:" bullet list with
+        one summary line each, then a "### `name`" section per member.
+
+        Args:
+            label (str): Singular label (e.g. 'Function')
+            plural (str): Plural label (e.g. 'Functions')
+            members (list): (name, doc) pairs
+            summary (callable): Returns the bullet summary line of a doc
+            detail (callable): Returns the full Markdown body of a doc
+        """
+        if len(members) == 1:
+            name, doc = members[0]
+            self.add(f"**{label}**: `{name}`\n\n", detail(doc), "\n\n")
+            return
+        self.add(f"**{plural}**:\n")
+        for name, doc in members:
+            self.add(f"- `{name}`: ", summary(doc), "\n")
+        self.add("\n")
+        for name, doc in members:
+            self.add(f"### `{name}`\n\n", detail(doc), "\n\n")
+
+    def getvalue(self):
+        """Return the document text."""
+        return ''.join(self._parts)
+
+
+def first_line(doc):
+    """Return the first line of a documentation text, stripped."""
+    return doc.split('\n', 1)[0].strip()
+
+
+def as_is(doc):
+    """Return a documentation text unchanged (the default section body)."""
+    return doc
+
+
+def write_markdown_file(md_file_path, md_content, manifest=None, make_dirs=True):
+    """
+    Write a rendered markdown file.
+
+    Args:
+        md_file_path (str): Target path
+        md_content (str): Markdown text
+        manifest (DocManifest): Optional manifest; unchanged files are not rewritten
+        make_dirs (bool): Create the file's folder if needed (False when the
+                          caller already created it)
+
+    Returns:
+        tuple: (md_file_path, error message or None, whether the file was written)
+    """
+    try:
+        if manifest is not None:
+            return md_file_path, None, manifest.write(md_file_path, md_content)
+        if make_dirs:
+            os.makedirs(os.path.dirname(md_file_path), exist_ok=True)
+        with open(md_file_path, 'w', encoding='utf-8') as md_file:
+            md_file.write(md_content)
+    except Exception as e:
+        return md_file_path, str(e), False
+    return md_file_path, None, True
+
+
+def report_written(result):
+    """Print the outcome of write_markdown_file()."""
+    md_file_path, error, written = result
+    if error is not None:
+        print(f"Error writing {md_file_path}: {error}")
+    elif written:
+        print(f"Created: {md_file_path}")
+    else:
+        print(f"Unchanged: {md_file_path}")
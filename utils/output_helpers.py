@@ -114,3 +114,34 @@ def get_root_dir(start_dir=None):
         str: Absolute path to the project root directory
     """
     return find_root(start_dir)
+
+
+class DirectoryCache:
+    """
+    Creates output directories, each one only once.
+    
+    Scripts that mirror a source tree into an output folder write many files
+    into the same few directories. ensure() remembers every directory it
+    created (and its parents), so os.makedirs() runs once per directory
+    instead of once per written file.
+    """
+    
+    def __init__(self):
+        self._known = set()
+    
+    def ensure(self, directory):
+        """
+        Create a directory (and its parents) unless it was already created.
+        
+        Args:
+            directory (str): Directory path
+        """
+        if not directory or directory in self._known:
+            return
+        os.makedirs(directory, exist_ok=True)
+        while directory and directory not in self._known:
+            self._known.add(directory)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Helpers for spreading per-file work over several CPU cores.
+
+ordered_map() runs a CPU-bound function in a process pool and yields the
+results in input order. OrderedWriter runs I/O-bound tasks (writing output
+files) on a thread pool while still reporting their results in the order
+they were submitted, so console output looks the same as a sequential run.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def resolve_jobs(jobs):
+    """
+    Turn a --jobs value into a worker count.
+
+    Args:
+        jobs (int): Requested workers; 0 or less means one per CPU
+
+    Returns:
+        int: Number of workers (at least 1)
+    """
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def ordered_map(func, items, jobs=1, chunksize=None):
+    """
+    Yield func(item) for every item, in input order.
+
+    With more than one job the calls run in a process pool, so `func` and
+    its results must be picklable (a module-level function, or a
+    functools.partial of one). With one job everything runs in-process.
+
+    Args:
+        func (callable): Function called with each item
+        items (list): Items to process
+        jobs (int): Number of worker processes
+        chunksize (int): Items sent to a worker at a time (default: chosen
+                         from the number of items and jobs)
+
+    Yields:
+        object: The result of each call
+    """
+    if jobs <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(item)
+        return
+    if chunksize is None:
+        chunksize = max(1, min(64, len(items) // (jobs * 8)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(func, items, chunksize=chunksize)
+
+
+class OrderedWriter:
+    """
+    Runs tasks on a thread pool and reports their results in submission order.
+
+    Each task has an optional callback that receives its result. Callbacks run
+    on the calling thread, in the order the tasks were submitted, as soon as
+    every earlier task has finished. With one worker tasks run immediately.
+    """
+
+    def __init__(self, workers):
+        """
+        Args:
+            workers (int): Number of writer threads
+        """
+        self._pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._pending = deque()
+
+    def submit(self, func, *args, on_done=None):
+        """
+        Run func(*args), then call on_done(result) in submission order.
+
+        Args:
+            func (callable): Task to run
+            *args: Arguments of the task
+            on_done (callable): Optional callback receiving the task's result
+        """
+        if self._pool is None:
+            result = func(*args)
+            if on_done is not None:
+                on_done(result)
+            return
+        self._pending.append((self._pool.submit(func, *args), on_done))
+        self._drain(block=False)
+
+    def report(self, on_done):
+        """
+        Queue a callback without a task (for example a 'skipped' message), so it
+        runs in order with the results of the tasks around it.
+
+        Args:
+            on_done (callable): Callback, called without arguments
+        """
+        if self._pool is None:
+            on_done()
+            return
+        self._pending.append((None, on_done))
+        self._drain(block=False)
+
+    def _drain(self, block):
+        while self._pending:
+            future, on_done = self._pending[0]
+            if future is not None and not block and not future.done():
+                return
+            self._pending.popleft()
+            if future is None:
+                on_done()
+            else:
+                result = future.result()
+                if on_done is not None:
+                    on_done(result)
+
+    def close(self):
+        """Wait for every task and run the remaining callbacks."""
+        self._drain(block=True)
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        return False
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Docstring collection for Python sources, shared by the Python doc extractors.
+
+Instead of ast.walk(), which visits every node of the tree including every
+expression, the collector only descends through statement bodies: the
+module, classes, functions and the blocks of compound statements (if, for,
+while, with, try, match), where definitions can appear. Each docstring is
+recorded with its qualified name (e.g. `Class.method`) and line number.
+
+Results are cached per file content hash, so unchanged files are not parsed
+again on the next run, even if their modification time changed.
+
+The file discovery, cache location and Markdown section helpers used by
+both extract-docs.py and extract-docs-py.py live here too.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sys
+
+from .doc_records import DocRecord, records_from_json, records_to_json
+from .file_scanner import DEFAULT_SKIP_DIRS, scan_files
+from .markdown_builder import as_is, first_line, group_records
+from .output_helpers import get_output_base_dir
+
+# Statement fields that hold nested statement lists
+_BODY_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+_DEFINITIONS = {
+    ast.FunctionDef: 'FUNCTION',
+    ast.AsyncFunctionDef: 'FUNCTION',
+    ast.ClassDef: 'CLASS',
+}
+
+
+def _docstring(body):
+    """Return the stripped docstring of a statement list, or ''."""
+    if (body and
+            isinstance(body[0], ast.Expr) and
+            isinstance(body[0].value, ast.Constant) and
+            isinstance(body[0].value.value, str)):
+        return body[0].value.value.strip()
+    return ''
+
+
+def collect_docstrings(tree):
+    """
+    Collect the docstrings of a module tree in source order.
+
+    Records are named 'module' for the module docstring; functions and
+    classes get the dotted path of their enclosing classes/functions as
+    qualname and the line of their definition.
+
+    Args:
+        tree (ast.Module): Parsed module
+
+    Returns:
+        list: DocRecord objects, module docstring first
+    """
+    entries = []
+    module_doc = _docstring(tree.body)
+    if module_doc:
+        entries.append(DocRecord('MODULE', 'module', 'module', 1, module_doc))
+
+    # Depth-first over statements only; each item is (statements, qualname prefix)
+    stack = [(tree.body, '')]
+    while stack:
+        statements, prefix = stack.pop()
+        nested = []
+        for node in statements:
+            kind = _DEFINITIONS.get(type(node))
+            if kind is not None:
+                qualname = prefix + node.name
+                doc = _docstring(node.body)
+                if doc:
+                    entries.append(DocRecord(kind, node.name, qualname, node.lineno, doc))
+                nested.append((node.body, qualname + '.'))
+                continue
+            for field in _BODY_FIELDS:
+                block = getattr(node, field, None)
+                if block:
+                    nested.append((block, prefix))
+        stack.extend(reversed(nested))
+    entries.sort(key=lambda entry: entry.line)
+    return entries
+
+
+def parse_docstrings(source, filename='<unknown>'):
+    """
+    Parse Python source and collect its docstrings.
+
+    Args:
+        source (str): Python source code
+        filename (str): File name used in syntax error messages
+
+    Returns:
+        list: DocRecord objects (see collect_docstrings)
+    """
+    return collect_docstrings(ast.parse(source, filename))
+
+
+class DocstringCache:
+    """
+    Persistent cache of collected docstrings keyed by file content hash.
+
+    Entries that were not used during a run are dropped when the cache is
+    saved, so the cache only holds the files of the last scanned tree.
+    """
+
+    def __init__(self, cache_path, version=1):
+        """
+        Args:
+            cache_path (str): Path of the JSON file backing the cache, or None
+                              for an in-memory cache
+            version (int): Format version of the stored entries. A cache
+                           file written with another version is ignored.
+        """
+        self.cache_path = cache_path
+        self.version = version
+        self._previous = {}
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        """
+        Load the cache file from disk. Missing, unreadable or outdated cache
+        files leave the cache empty.
+
+        Returns:
+            DocstringCache: self, to allow chaining
+        """
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return self
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable cache {self.cache_path}: {e}", file=sys.stderr)
+            return self
+        if data.get('version') == self.version:
+            self._previous = data.get('files', {})
+        return self
+
+    def save(self):
+        """Write the entries used during this run back to disk."""
+        if self.cache_path is None:
+            return
+        if not self.misses and len(self._entries) == len(self._previous):
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'files': self._entries}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"[WARN] Failed to write cache {self.cache_path}: {e}", file=sys.stderr)
+
+    def extract(self, file_path):
+        """
+        Return the docstrings of a file, parsing it only if its content is
+        not cached.
+
+        Args:
+            file_path (str): Path to the Python file
+
+        Returns:
+            list: DocRecord objects
+
+        Raises:
+            OSError, UnicodeDecodeError, SyntaxError: If the file cannot be
+            read or parsed
+        """
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+        cached = self._entries.get(digest)
+        if cached is None:
+            cached = self._previous.get(digest)
+        if cached is not None:
+            self.hits += 1
+            self._entries[digest] = cached
+            return records_from_json(cached)
+
+        self.misses += 1
+        entries = parse_docstrings(data.decode('utf-8'), file_path)
+        self._entries[digest] = records_to_json(entries)
+        return entries
+
+
+# File extensions to include
+PYTHON_EXTENSIONS = {'.py'}
+
+# Directories to skip
+SKIP_DIRS = DEFAULT_SKIP_DIRS | {'venv', 'env', '.venv', '.env', 'lib', 'lib64'}
+
+
+def find_python_files(directory):
+    """
+    Recursively find all Python files in a directory.
+
+    Args:
+        directory (str): Directory to search in
+
+    Returns:
+        list: List of Python file paths
+    """
+    return [source.path for source in scan_files(directory, PYTHON_EXTENSIONS, SKIP_DIRS)]
+
+
+def default_cache_path(root, script_file):
+    """
+    Return the parse cache file used for a scanned root under _outputs/.../cache.
+
+    Both Python extractors use the same file: entries are keyed by content
+    hash and hold the same records, so either script reuses the other's work.
+
+    Args:
+        root (str): Scanned root
+        script_file (str): `__file__` of the calling script, whose _outputs
+                           folder holds the cache
+    """
+    root_hash = hashlib.sha1(str(root).encode("utf-8")).hexdigest()[:12]
+    cache_dir = get_output_base_dir(script_file=script_file, subdirectory="cache")
+    return os.path.join(cache_dir, f"py-docstrings-{root_hash}.json")
+
+
+def extract_docstring_records(file_path, cache=None):
+    """
+    Collect the docstrings of a Python file (module, functions, and classes).
+
+    Functions and classes are listed in source order under their qualified
+    names (e.g. `Class.method`).
+
+    Args:
+        file_path (str): Path to the Python file
+        cache (DocstringCache): Optional parse cache keyed by file content hash
+
+    Returns:
+        list: DocRecord objects in source order (empty if the file cannot be parsed)
+    """
+    try:
+        if cache is not None:
+            return cache.extract(file_path)
+        with open(file_path, 'r', encoding='utf-8') as file:
+            content = file.read()
+        return parse_docstrings(content, file_path)
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return []
+
+
+def add_docstring_sections(md, records):
+    """
+    Add the Info section (module docstring, functions, classes) to a document.
+
+    Args:
+        md (MarkdownBuilder): Document being built
+        records (list): DocRecord objects (at least one)
+    """
+    groups = group_records(records)
+    md.add("## Info\n\n")
+
+    # Add module documentation
+    if groups['MODULE']:
+        md.add(groups['MODULE'][-1].doc, "\n\n")
+
+    # Add functions and classes sections, listed under their qualified names
+    if groups['FUNCTION']:
+        md.member_section('Function', 'Functions', [(record.qualname, record.doc) for record in groups['FUNCTION']],
+                          first_line, as_is)
+    if groups['CLASS']:
+        md.member_section('Class', 'Classes', [(record.qualname, record.doc) for record in groups['CLASS']],
+                          first_line, as_is)
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+ASP.NET route templates and a trie for matching request paths against them.
+
+parse_template() splits a template such as `api/orders/{id:int:min(1)}/{*rest}`
+into segments: literals (compared case-insensitively), parameters (with
+their constraints, optional marker, default value or catch-all) and complex
+segments mixing both (`{name}.{ext}`). RouteTrie stores many templates in
+one tree, so matching a path costs one walk over its segments instead of
+one comparison per template.
+"""
+
+import re
+from collections import namedtuple
+
+# One route parameter
+#   name:        parameter name
+#   constraints: tuple of (constraint name, argument or None), e.g. (('int', None),)
+#   optional:    `{id?}` or `{id=5}`
+#   catch_all:   `{*path}` / `{**path}`
+RouteParameter = namedtuple('RouteParameter', ['name', 'constraints', 'optional', 'catch_all'])
+
+_INT_RE = re.compile(r'-?\d+\Z')
+_NUMBER_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\Z')
+_GUID_RE = re.compile(r'\{?[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}\}?\Z')
+_ALPHA_RE = re.compile(r'[A-Za-z]+\Z')
+_DATETIME_RE = re.compile(r'\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}(?:[T ]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?\Z')
+
+
+def _parse_parameter(text):
+    """Parse the inside of `{...}` into a RouteParameter."""
+    catch_all = text.startswith('*')
+    text = text.lstrip('*')
+    i = 0
+    while i < len(text) and text[i] not in ':=?':
+        i += 1
+    name = text[:i].strip()
+    constraints = []
+    optional = False
+    while i < len(text):
+        char = text[i]
+        if char == '?':
+            optional = True
+            i += 1
+        elif char == '=':
+            # A default value makes the parameter optional; the rest is the value
+            optional = True
+            break
+        elif char == ':':
+            start = i + 1
+            i = start
+            while i < len(text) and (text[i].isalnum() or text[i] == '_'):
+                i += 1
+            constraint = text[start:i]
+            argument = None
+            if i < len(text) and text[i] == '(':
+                depth = 0
+                arg_start = i + 1
+                while i < len(text):
+                    if text[i] == '(':
+                        depth += 1
+                    elif text[i] == ')':
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    i += 1
+                argument = text[arg_start:i]
+                i += 1
+            if constraint:
+                constraints.append((constraint.lower(), argument))
+        else:
+            i += 1
+    return RouteParameter(name, tuple(constraints), optional, catch_all)
+
+
+def _check_constraint(constraint, argument, value):
+    """Return True if value satisfies one route constraint (unknown ones always pass)."""
+    if constraint in ('int', 'long'):
+        return _INT_RE.match(value) is not None
+    if constraint in ('decimal', 'double', 'float'):
+        return _NUMBER_RE.match(value) is not None
+    if constraint == 'bool':
+        return value.lower() in ('true', 'false')
+    if constraint == 'guid':
+        return _GUID_RE.match(value) is not None
+    if constraint == 'alpha':
+        return _ALPHA_RE.match(value) is not None
+    if constraint == 'datetime':
+        return _DATETIME_RE.match(value) is not None
+    if constraint == 'required':
+        return bool(value)
+    try:
+        if constraint in ('min', 'max', 'range'):
+            number = int(value)
+            bounds = [int(part) for part in argument.split(',')]
+            if constraint == 'min':
+                return number >= bounds[0]
+            if constraint == 'max':
+                return number <= bounds[0]
+            return bounds[0] <= number <= bounds[1]
+        if constraint in ('minlength', 'maxlength', 'length'):
+            bounds = [int(part) for part in argument.split(',')]
+            if constraint == 'minlength':
+                return len(value) >= bounds[0]
+            if constraint == 'maxlength':
+                return len(value) <= bounds[0]
+            if len(bounds) == 1:
+                return len(value) == bounds[0]
+            return bounds[0] <= len(value) <= bounds[1]
+        if constraint == 'regex':
+            return re.search(argument.replace('{{', '{').replace('}}', '}'), value) is not None
+    except (AttributeError, IndexError, ValueError, re.error):
+        # Malformed or non-integer arguments (and .NET-only regex syntax) do not reject a value
+        return True
+    return True
+
+
+class Segment:
+    """One '/'-separated part of a route template."""
+
+    __slots__ = ('text', 'literal', 'parameter', 'pattern', 'parameters')
+
+    def __init__(self, text):
+        """
+        Args:
+            text (str): Segment text, e.g. 'orders', '{id:int}' or '{name}.{ext}'
+        """
+        self.text = text
+        self.literal = None
+        self.parameter = None
+        self.pattern = None
+        self.parameters = ()
+        parts = _split_segment(text)
+        if len(parts) == 1 and isinstance(parts[0], str):
+            self.literal = parts[0].lower()
+        elif len(parts) == 1:
+            self.parameter = parts[0]
+        else:
+            # Complex segment: literals and parameters matched by one regex
+            regex = []
+            parameters = []
+            for part in parts:
+                if isinstance(part, str):
+                    regex.append(re.escape(part))
+                else:
+                    regex.append('(.*?)' if part.optional else '(.+?)')
+                    parameters.append(part)
+            self.pattern = re.compile(''.join(regex) + r'\Z', re.IGNORECASE)
+            self.parameters = tuple(parameters)
+
+    @property
+    def key(self):
+        """Hashable description used to share trie nodes between templates."""
+        if self.literal is not None:
+            return ('literal', self.literal)
+        if self.parameter is not None:
+            return ('parameter', self.parameter.constraints, self.parameter.optional, self.parameter.catch_all)
+        return ('complex', self.pattern.pattern, tuple(p.constraints for p in self.parameters))
+
+    def accepts(self, value):
+        """
+        Return True if a path segment matches this (non-literal) segment.
+
+        Args:
+            value (str): Path segment
+        """
+        if self.parameter is not None:
+            return all(_check_constraint(name, argument, value) for name, argument in self.parameter.constraints)
+        match = self.pattern.match(value)
+        if match is None:
+            return False
+        return all(
+            _check_constraint(name, argument, group)
+            for parameter, group in zip(self.parameters, match.groups())
+            for name, argument in parameter.constraints
+        )
+
+
+def _split_segment(text):
+    """Split a segment into literal strings and RouteParameter objects ('{{' / '}}' are literal braces)."""
+    parts = []
+    literal = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in '{}' and text[i + 1:i + 2] == char:
+            literal.append(char)
+            i += 2
+        elif char == '{':
+            depth = 0
+            start = i + 1
+            while i < len(text):
+                if text[i] == '{' and text[i + 1:i + 2] == '{':
+                    i += 2
+                    continue
+                if text[i] == '}' and text[i + 1:i + 2] == '}':
+                    i += 2
+                    continue
+                if text[i] == '{':
+                    depth += 1
+                elif text[i] == '}':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            if literal:
+                parts.append(''.join(literal))
+                literal = []
+            parts.append(_parse_parameter(text[start:i]))
+            i += 1
+        else:
+            literal.append(char)
+            i += 1
+    if literal:
+        parts.append(''.join(literal))
+    return parts or ['']
+
+
+def split_path(path):
+    """
+    Split a route template or request path into its non-empty segments.
+
+    A leading '~/' or '/' and a query string are ignored.
+
+    Args:
+        path (str): Template or path
+
+    Returns:
+        list: Segment strings
+    """
+    if path.startswith('~'):
+        path = path[1:]
+    segments = []
+    depth = 0
+    current = []
+    # '/' inside braces belongs to the parameter (e.g. a regex constraint)
+    for char in path:
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth = max(0, depth - 1)
+        elif char == '?' and depth == 0:
+            break
+        if char == '/' and depth == 0:
+            if current:
+                segments.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        segments.append(''.join(current))
+    return segments
+
+
+def parse_template(template):
+    """
+    Parse a route template.
+
+    Args:
+        template (str): Template such as 'api/orders/{id:int}'
+
+    Returns:
+        list: Segment objects
+    """
+    return [Segment(text) for text in split_path(template)]
+
+
+class _Node:
+    __slots__ = ('literals', 'patterns', 'catch_alls', 'values')
+
+    def __init__(self):
+        self.literals = {}
+        self.patterns = {}
+        self.catch_alls = []
+        self.values = []
+
+
+class RouteTrie:
+    """
+    Route templates stored by segment; match() returns the values of every
+    template a path satisfies.
+
+    Literal segments are looked up in a dict per node, so only parameter
+    branches are tried one by one. Templates ending in optional parameters
+    also match the shorter paths; catch-all parameters match the rest of the
+    path (including nothing).
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, template, value):
+        """
+        Add a route template.
+
+        Args:
+            template (str): Route template
+            value: Hashable value returned by match() for paths matching the template
+        """
+        self._count += 1
+        node = self._root
+        segments = parse_template(template)
+        for i, segment in enumerate(segments):
+            if segment.parameter is not None and segment.parameter.catch_all:
+                node.catch_alls.append(value)
+                return
+            if all(s.parameter is not None and s.parameter.optional for s in segments[i:]):
+                node.values.append(value)
+            if segment.literal is not None:
+                node = node.literals.setdefault(segment.literal, _Node())
+            else:
+                key = segment.key
+                if key not in node.patterns:
+                    node.patterns[key] = (segment, _Node())
+                node = node.patterns[key][1]
+        node.values.append(value)
+
+    def match(self, path, wildcard=None):
+        """
+        Find the templates matching a path.
+
+        Args:
+            path (str): Request path such as 'orders/5/items'
+            wildcard (callable): Optional predicate marking path segments that
+                                 stand for an unknown value (e.g. a `${id}`
+                                 placeholder); they match any parameter
+                                 segment, whatever its constraints, but no
+                                 literal one
+
+        Returns:
+            list: Values of the matching templates, without duplicates
+        """
+        segments = split_path(path)
+        found = []
+        seen = set()
+        stack = [(self._root, 0)]
+        while stack:
+            node, i = stack.pop()
+            for value in node.catch_alls:
+                if value not in seen:
+                    seen.add(value)
+                    found.append(value)
+            if i == len(segments):
+                for value in node.values:
+                    if value not in seen:
+                        seen.add(value)
+                        found.append(value)
+                continue
+            value = segments[i]
+            if wildcard is not None and wildcard(value):
+                stack.extend((child, i + 1) for _, child in node.patterns.values())
+                continue
+            child = node.literals.get(value.lower())
+            if child is not None:
+                stack.append((child, i + 1))
+            for segment, child in node.patterns.values():
+                if segment.accepts(value):
+                    stack.append((child, i + 1))
+        return found
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Project-wide SCSS symbol index: variables, maps, mixins and the
+@use/@forward/@import graph.
+
+Symbols are extracted per file from the tokenizer records (see
+scss_tokenizer.py) into small JSON-serializable tables, so they can be cached
+next to other per-file results. SymbolIndex links the tables of every file
+and resolves property values such as `$primary`, `v.$primary` or
+`map-get($colors, brand)` to their literal values. Lookups are memoized per
+file and name, so each imported partial is visited once no matter how many
+files import it.
+"""
+
+import os
+import re
+from collections import Counter, defaultdict
+
+# Variable references: `$name` or `namespace.$name`
+_VAR_RE = re.compile(r'(?<![-\w$])(?:([-\w]+)\.)?\$([-\w]+)')
+
+# map-get($map, key) / map.get($map, key) with a single key
+_MAP_GET_RE = re.compile(
+    r'(?<![-\w])map(?:-get|\.get)\(\s*((?:[-\w]+\.)?\$[-\w]+)\s*,\s*([^(),]+?)\s*\)'
+)
+
+# #{...} interpolation left after substitution
+_INTERP_RE = re.compile(r'#\{([^{}$]*)\}')
+
+# Module reference in @use/@forward: quoted URL and optional `as namespace`
+_USE_RE = re.compile(r'''^(["'])(.*?)\1(?:\s+as\s+([-\w]+\*?|\*))?''')
+_QUOTED_RE = re.compile(r'''(["'])(.*?)\1''')
+
+_FLAGS_RE = re.compile(r'\s*!(?:default|global)\b')
+
+_MODULE_EXTENSIONS = ('.scss', '.sass', '.css')
+
+
+def _name(name):
+    """Sass treats `-` and `_` in identifiers as the same character."""
+    return name.replace('_', '-')
+
+
+def extract_symbols(records):
+    """
+    Build the symbol table of one stylesheet from its tokenizer records.
+
+    Args:
+        records (iterable): Declaration records from tokenize_scss()
+
+    Returns:
+        dict: JSON-serializable table with
+          - "vars": name -> [value, line] for top-level variables
+          - "mixins": name -> line
+          - "uses": list of [kind, url, namespace] for @use/@forward/@import
+          - "includes": mixin reference -> number of @include statements
+          - "refs": property -> value -> count, for values that reference
+            variables
+    """
+    variables = {}
+    mixins = {}
+    uses = []
+    includes = Counter()
+    refs = defaultdict(Counter)
+
+    for decl in records:
+        prop = decl.prop
+        # Mixin bodies use their own arguments, which only exist per @include
+        in_mixin = bool(decl.selectors) and decl.selectors[0].startswith(('@mixin', '@function'))
+        if in_mixin and decl.selectors[0].startswith('@mixin'):
+            header = decl.selectors[0][len('@mixin'):].strip()
+            name = _name(re.split(r'[\s(]', header, 1)[0])
+            mixins.setdefault(name, decl.line)
+
+        if prop[0] == '$':
+            if decl.selectors:
+                continue  # local variable
+            name = _name(prop[1:])
+            is_default = '!default' in decl.value
+            value = _FLAGS_RE.sub('', decl.value).strip()
+            if name not in variables or not is_default:
+                variables[name] = [value, decl.line]
+        elif prop == '@include':
+            name = re.split(r'[\s(;]', decl.value, 1)[0]
+            if name:
+                includes[_name(name)] += 1
+        elif prop in ('@use', '@forward'):
+            m = _USE_RE.match(decl.value)
+            if m:
+                uses.append([prop[1:], m.group(2), m.group(3)])
+        elif prop == '@import':
+            for m in _QUOTED_RE.finditer(decl.value):
+                uses.append(['import', m.group(2), None])
+        elif '$' in decl.value and '#{' not in prop and not in_mixin:
+            refs[prop][decl.value] += 1
+
+    return {
+        'vars': variables,
+        'mixins': mixins,
+        'uses': uses,
+        'includes': dict(includes),
+        'refs': {p: dict(v) for p, v in refs.items()},
+    }
+
+
+def split_top_level(text, separator):
+    """Split text on `separator` outside parentheses and quotes."""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_map(value):
+    """
+    Parse a Sass map literal such as `(primary: #fff, 'brand': $x)`.
+
+    Returns:
+        dict: key (unquoted) -> value, or None if the value is not a map
+    """
+    value = value.strip()
+    if not (value.startswith('(') and value.endswith(')')):
+        return None
+    result = {}
+    for item in split_top_level(value[1:-1], ','):
+        if not item.strip():
+            continue
+        pair = split_top_level(item, ':')
+        if len(pair) < 2:
+            return None
+        result[pair[0].strip().strip('"\'')] = ':'.join(pair[1:]).strip()
+    return result or None
+
+
+class SymbolIndex:
+    """
+    Links the per-file symbol tables of a project and resolves references.
+    """
+
+    def __init__(self, file_symbols, root):
+        """
+        Args:
+            file_symbols (dict): path -> table from extract_symbols()
+            root (str): Scanned root folder, also used as a load path
+        """
+        self.files = {os.path.normpath(p): s for p, s in file_symbols.items()}
+        self.root = os.path.normpath(root)
+        self._graph = {}
+        self._lookups = {}
+        self._resolved = {}
+        self._maps = {}
+        self._scopes = {}
+        self._values = None
+        self._active = set()
+
+        # name -> [(path, value)] for the last-resort project-wide lookup
+        self._globals = defaultdict(list)
+        for path, symbols in self.files.items():
+            for name, (value, _) in symbols['vars'].items():
+                self._globals[name].append((path, value))
+
+        # Reverse @import edges: partials see the variables of their importers
+        self._importers = defaultdict(list)
+        for path in self.files:
+            for kind, target, _ in self.graph(path):
+                if kind == 'import':
+                    self._importers[target].append(path)
+
+    def graph(self, path):
+        """
+        Return the resolved module edges of a file as a list of
+        (kind, target path, namespace). Unresolvable modules (built-ins such
+        as `sass:math`, packages outside the scanned tree) are left out.
+        """
+        edges = self._graph.get(path)
+        if edges is not None:
+            return edges
+        edges = []
+        for kind, url, namespace in self.files[path]['uses']:
+            target = self._find_module(path, url)
+            if target is None:
+                continue
+            if kind == 'use' and namespace is None:
+                namespace = os.path.splitext(os.path.basename(url))[0].lstrip('_')
+            edges.append((kind, target, namespace))
+        self._graph[path] = edges
+        return edges
+
+    def _scope(self, path):
+        """
+        Memoization key for lookups made from `path`. Files without own
+        variables that nobody imports see exactly what their module edges
+        give them, so files with the same imports share their results.
+        """
+        scope = self._scopes.get(path)
+        if scope is None:
+            if self.files[path]['vars'] or self.files[path]['mixins'] or path in self._importers:
+                scope = path
+            else:
+                scope = tuple(self.graph(path))
+            self._scopes[path] = scope
+        return scope
+
+    def _find_module(self, from_path, url):
+        if ':' in url or url.startswith(('http', 'url(')):
+            return None
+        url = url.lstrip('~')
+        head, tail = os.path.split(url)
+        for base_dir in (os.path.dirname(from_path), self.root):
+            base = os.path.normpath(os.path.join(base_dir, head, tail))
+            partial = os.path.normpath(os.path.join(base_dir, head, '_' + tail))
+            candidates = [base, partial] if os.path.splitext(tail)[1] in _MODULE_EXTENSIONS else []
+            for ext in _MODULE_EXTENSIONS:
+                candidates += [base + ext, partial + ext]
+            candidates += [os.path.join(base, '_index.scss'), os.path.join(base, 'index.scss')]
+            for candidate in candidates:
+                if candidate in self.files:
+                    return candidate
+        return None
+
+    def lookup(self, path, kind, name, namespace=None):
+        """
+        Find the definition of a variable (kind "vars") or mixin (kind
+        "mixins") as seen from a file.
+
+        Returns:
+            tuple: (defining path, value or line), or None
+        """
+        key = (self._scope(path), kind, name, namespace)
+        if key in self._lookups:
+            return self._lookups[key]
+        if namespace is not None:
+            found = None
+            for edge_kind, target, edge_ns in self.graph(path):
+                if edge_kind == 'use' and edge_ns == namespace:
+                    found = self._lookup_exported(target, kind, name, set())
+                    break
+        else:
+            found = self._lookup_visible(path, kind, name, set())
+            if found is None and kind == 'vars':
+                definitions = self._globals.get(name, [])
+                if len({value for _, value in definitions}) == 1:
+                    found = definitions[0]
+        self._lookups[key] = found
+        return found
+
+    def _lookup_exported(self, path, kind, name, visiting):
+        """Members a module exposes to @use: its own plus @forward-ed ones."""
+        if path in visiting:
+            return None
+        visiting.add(path)
+        table = self.files[path][kind]
+        if name in table:
+            return path, table[name][0] if kind == 'vars' else table[name]
+        for edge_kind, target, _ in self.graph(path):
+            if edge_kind in ('forward', 'import'):
+                found = self._lookup_exported(target, kind, name, visiting)
+                if found is not None:
+                    return found
+        return None
+
+    def _lookup_visible(self, path, kind, name, visiting):
+        """Members visible without a namespace inside a file."""
+        if path in visiting:
+            return None
+        visiting.add(path)
+        table = self.files[path][kind]
+        if name in table:
+            return path, table[name][0] if kind == 'vars' else table[name]
+        # Later imports win, as they would when the files are concatenated
+        for edge_kind, target, namespace in reversed(self.graph(path)):
+            if edge_kind == 'import' or (edge_kind == 'use' and namespace == '*'):
+                found = self._lookup_exported(target, kind, name, set(visiting))
+                if found is not None:
+                    return found
+        for importer in self._importers.get(path, ()):
+            found = self._lookup_visible(importer, kind, name, visiting)
+            if found is not None:
+                return found
+        return None
+
+    def resolve(self, path, value):
+        """
+        Replace variable references and map lookups in a value by their
+        literal values, as seen from `path`. References that cannot be
+        resolved are kept as written.
+
+        Returns:
+            tuple: (resolved value, tuple of (defining path, name) for every
+                    resolved variable, tuple of unresolved references)
+        """
+        key = (self._scope(path), value)
+        cached = self._resolved.get(key)
+        if cached is not None:
+            return cached
+        if key in self._active:
+            return value, (), ()
+        self._active.add(key)
+
+        used = []
+        missing = []
+
+        def map_get(m):
+            reference, map_key = m.group(1), m.group(2).strip().strip('"\'')
+            namespace, _, var = reference.rpartition('.')
+            found = self.lookup(path, 'vars', _name(var[1:]), namespace or None)
+            if found is None:
+                missing.append(reference)
+                return m.group(0)
+            def_path, map_value = found
+            entries = self._maps.get(found)
+            if entries is None:
+                entries = self._maps[found] = parse_map(map_value) or {}
+            if map_key not in entries:
+                missing.append(f"{reference}.{map_key}")
+                return m.group(0)
+            used.append((def_path, _name(var[1:])))
+            resolved, inner_used, inner_missing = self.resolve(def_path, entries[map_key])
+            used.extend(inner_used)
+            missing.extend(inner_missing)
+            return resolved
+
+        def variable(m):
+            namespace, var = m.group(1), _name(m.group(2))
+            found = self.lookup(path, 'vars', var, namespace)
+            if found is None:
+                missing.append(m.group(0))
+                return m.group(0)
+            def_path, var_value = found
+            used.append((def_path, var))
+            resolved, inner_used, inner_missing = self.resolve(def_path, var_value)
+            used.extend(inner_used)
+            missing.extend(inner_missing)
+            return resolved
+
+        result = _MAP_GET_RE.sub(map_get, value)
+        result = _VAR_RE.sub(variable, result)
+        result = _INTERP_RE.sub(lambda m: m.group(1).strip().strip('"\''), result)
+
+        self._active.discard(key)
+        resolved = (result, tuple(used), tuple(missing))
+        self._resolved[key] = resolved
+        return resolved
+
+    def resolve_values(self):
+        """
+        Resolve every variable-referencing property value of the project.
+
+        Returns:
+            dict: property -> raw value -> Counter of resolved values, for
+                  values whose resolution differs from the raw text
+        """
+        if self._values is not None:
+            return self._values
+        self._values = defaultdict(lambda: defaultdict(Counter))
+        for path, symbols in self.files.items():
+            self._count_refs(path, symbols, 1)
+        return self._values
+
+    def update_refs(self, path, symbols):
+        """
+        Replace the table of a file whose definitions and module edges did
+        not change (only its property values or @include statements did),
+        updating the resolve_values() counters in place instead of rebuilding
+        the index. Files without definitions can also be added this way, or
+        removed by passing None.
+        """
+        path = os.path.normpath(path)
+        self.resolve_values()
+        if path in self.files:
+            self._count_refs(path, self.files[path], -1)
+        if symbols is None:
+            self.files.pop(path, None)
+            self._graph.pop(path, None)
+            self._scopes.pop(path, None)
+            return
+        self.files[path] = symbols
+        self._count_refs(path, symbols, 1)
+
+    def _count_refs(self, path, symbols, sign):
+        values = self._values
+        for prop, value_counts in symbols['refs'].items():
+            for value, count in value_counts.items():
+                result = self.resolve(path, value)[0]
+                if result == value:
+                    continue
+                counter = values[prop][value]
+                counter[result] += sign * count
+                if counter[result] <= 0:
+                    del counter[result]
+                    if not counter:
+                        del values[prop][value]
+                        if not values[prop]:
+                            del values[prop]
+
+    def usage(self):
+        """
+        Count how symbols are used across the project.
+
+        Returns:
+            tuple:
+              - Counter: (defining path, variable) -> references in property
+                values (direct and through other variables)
+              - Counter: (defining path, mixin) -> @include statements
+              - Counter: unresolved reference -> uses
+        """
+        var_uses = Counter()
+        mixin_uses = Counter()
+        missing = Counter()
+        for path, symbols in self.files.items():
+            for value_counts in symbols['refs'].values():
+                for value, count in value_counts.items():
+                    _, used, unresolved = self.resolve(path, value)
+                    for ref in used:
+                        var_uses[ref] += count
+                    for ref in unresolved:
+                        missing[ref] += count
+            for reference, count in symbols['includes'].items():
+                namespace, _, name = reference.rpartition('.')
+                found = self.lookup(path, 'mixins', name, namespace or None)
+                if found is None:
+                    missing[f"@include {reference}"] += count
+                else:
+                    mixin_uses[(found[0], name)] += count
+        return var_uses, mixin_uses, missing
+
+    def definitions(self, kind):
+        """Iterate over (path, name, value or line) for every definition."""
+        for path, symbols in self.files.items():
+            for name, data in symbols[kind].items():
+                yield path, name, data[0] if kind == 'vars' else data
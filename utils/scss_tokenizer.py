@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Streaming single-pass tokenizer for CSS and SCSS stylesheets.
+
+The tokenizer walks the source once, consuming whole statements up to the
+next structural character (brace, semicolon or comment start) instead of
+matching each line on its own. It understands nesting, so every declaration
+is reported together with the selectors and @media queries it lives in.
+"""
+
+import re
+from collections import namedtuple
+
+# One record per declaration or block-less at-rule statement.
+#   selectors: tuple of enclosing selector / at-rule headers, outermost first
+#   media:     combined @media condition, or None outside media blocks
+#   prop:      property name ("$name" for SCSS variables, "@include" etc.
+#              for at-rule statements)
+#   value:     declaration value (at-rule arguments for at-rule statements)
+#   line:      1-based line where the statement starts
+Declaration = namedtuple('Declaration', ['selectors', 'media', 'prop', 'value', 'line'])
+
+# Statement text up to the next structural character. Strings and (nested)
+# parentheses are consumed whole, so ';' or '{' inside url(...), quoted
+# values or function arguments never end a statement. The patterns are
+# written as "unrolled loops" (plain run, then special construct, then plain
+# run...) so ordinary text is consumed in long runs without backtracking.
+_DQ = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"?'
+_SQ = r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'?"
+_PARENS_INNER = r'\([^()"\']*(?:(?:' + _DQ + '|' + _SQ + r'|\([^()]*\))[^()"\']*)*\)'
+_PARENS = r'\([^()"\']*(?:(?:' + _DQ + '|' + _SQ + '|' + _PARENS_INNER + r')[^()"\']*)*\)'
+_PLAIN = r'[^{};"\'/#(]*'
+_BODY_RE = re.compile(
+    _PLAIN + r'(?:(?:#(?!\{)|' + _PARENS + r'|/(?![*/])|' + _DQ + '|' + _SQ + ')' + _PLAIN + ')*',
+    re.DOTALL,
+)
+
+# Whitespace and comments in front of a statement
+_LEADING = r'\s*(?:(?:/\*.*?(?:\*/|\Z)|//[^\n]*)\s*)*'
+
+# A whole statement in one match: leading whitespace/comments, an optional
+# "property:" head, the statement text and its terminator. The terminator is
+# empty when the statement continues past a comment, an #{} interpolation or
+# an unbalanced parenthesis, or at the end of the input.
+_STATEMENT_RE = re.compile(
+    '(' + _LEADING + r')(?:(\$?[-\w]+)\s*:)?(' + _BODY_RE.pattern + r')([{};]?)',
+    re.DOTALL,
+)
+
+# Property names: plain identifiers, custom properties, SCSS variables and
+# names built with #{} interpolation
+_PROP_NAME_RE = re.compile(r'^\$?(?:[-\w]|#\{[^}]*\})+$')
+
+_AT_NAME_RE = re.compile(r'@[-\w]+')
+
+
+def tokenize_scss(text):
+    """
+    Tokenize a stylesheet and yield Declaration records in source order.
+
+    Handles several declarations per line, declarations spanning lines,
+    values containing ';' inside parentheses or strings (e.g. url(data:...)),
+    // and /* */ comments, #{} interpolation, nested rules, nested property
+    namespaces (`font: { family: x; }`) and @media nesting.
+
+    Args:
+        text (str): Stylesheet source
+
+    Yields:
+        Declaration: One record per declaration or at-rule statement
+    """
+    stack = []
+    selectors = ()
+    media = None
+    prefix = ''
+
+    line = 1
+    line_pos = 0
+
+    count = text.count
+    new_record = tuple.__new__
+    n = len(text)
+    pos = 0
+
+    while pos < n:
+        for m in _STATEMENT_RE.finditer(text, pos):
+            _, prop, value, term = m.groups()
+
+            if term == ';' or term == '}':
+                # Fast path: one declaration or block-less at-rule statement
+                value = value.strip()
+                if prop is not None or value:
+                    start = m.end(1)
+                    line += count('\n', line_pos, start)
+                    line_pos = start
+                    if prop is not None:
+                        if '\n' in value:
+                            value = ' '.join(value.split())
+                        if prefix and prop[0] != '$':
+                            prop = prefix + prop
+                        yield new_record(Declaration, (selectors, media, prop, value, line))
+                    else:
+                        record = _make_record(value, selectors, media, prefix, line)
+                        if record is not None:
+                            yield record
+                if term == '}' and stack:
+                    selectors, media, prefix = stack.pop()
+                continue
+
+            start = m.end(1)
+            slow = not term
+            if slow:
+                header, term, end = _read_slow_statement(text, start, m.end())
+            else:
+                header = text[start:m.end(3)]
+            header = ' '.join(header.split())
+            if header:
+                line += count('\n', line_pos, start)
+                line_pos = start
+
+            if term == '{':
+                stack.append((selectors, media, prefix))
+                if header.startswith('@media'):
+                    condition = header[len('@media'):].strip()
+                    media = f"{media} and {condition}" if media else condition
+                elif header.endswith(':') and _PROP_NAME_RE.match(header[:-1].strip()):
+                    prefix = f"{prefix}{header[:-1].strip()}-"
+                elif header:
+                    selectors = selectors + (header,)
+            else:
+                if header:
+                    record = _make_record(header, selectors, media, prefix, line)
+                    if record is not None:
+                        yield record
+                if term == '}' and stack:
+                    selectors, media, prefix = stack.pop()
+
+            if slow:
+                # Restart the statement scan after the slow-path statement
+                pos = end
+                break
+        else:
+            break
+
+
+def _read_slow_statement(text, start, i):
+    """
+    Read a statement that the fast pattern could not finish in one match.
+
+    Comments are replaced by a space, #{} interpolations and unbalanced
+    parentheses are copied through.
+
+    Returns:
+        tuple: (statement text, terminator or '', position after terminator)
+    """
+    n = len(text)
+    body = _BODY_RE.match
+    pieces = []
+    seg_start = start
+    ch = text[i] if i < n else ''
+    while ch and ch not in '{};':
+        if ch == '/':
+            if text[i + 1] == '*':
+                end = text.find('*/', i + 2)
+                end = n if end == -1 else end + 2
+            else:
+                end = text.find('\n', i)
+                end = n if end == -1 else end
+            pieces.append(text[seg_start:i])
+            pieces.append(' ')
+            seg_start = pos = end
+        elif ch == '#':
+            end = text.find('}', i + 2)
+            pos = n if end == -1 else end + 1
+        else:
+            pos = i + 1
+        i = body(text, pos).end()
+        ch = text[i] if i < n else ''
+    pieces.append(text[seg_start:i])
+    return ''.join(pieces), ch, i + 1
+
+
+def _make_record(statement, selectors, media, prefix, line):
+    """Turn one terminated statement into a Declaration, or None."""
+    if statement[0] == '@':
+        m = _AT_NAME_RE.match(statement)
+        if not m:
+            return None
+        value = statement[m.end():].strip()
+        if '\n' in value:
+            value = ' '.join(value.split())
+        return Declaration(selectors, media, m.group(0), value, line)
+
+    colon = statement.find(':')
+    if colon <= 0:
+        return None
+    prop = statement[:colon].strip()
+    if not _PROP_NAME_RE.match(prop):
+        return None
+    value = statement[colon + 1:].strip()
+    if '\n' in value:
+        value = ' '.join(value.split())
+    if prefix and prop[0] != '$':
+        prop = prefix + prop
+    return Declaration(selectors, media, prop, value, line)
+
+
+def tokenize_scss_file(path):
+    """
+    Read a stylesheet and tokenize it.
+
+    Args:
+        path (str): Path to a .css or .scss file
+
+    Returns:
+        generator: Declaration records (see tokenize_scss)
+    """
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+    return tokenize_scss(text)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Comment and string literal ranges of C# sources scanned with regexes.
+
+csharp_ranges() lexes a file once, in source order, so a comment marker
+inside a string, a quote inside a comment or an apostrophe in a doc
+comment never start the wrong kind of token. It knows `//` and `/* */`
+comments, regular, verbatim (@"..."), interpolated ($"..." with nested
+holes) and raw (three or more quotes) strings, and char literals.
+
+RangeIndex turns the ranges into a sorted list of merged, non-overlapping
+intervals: "is this match inside a comment?" is one binary search, and
+blank() replaces the intervals with spaces while keeping every offset valid.
+"""
+
+import re
+from bisect import bisect_right
+
+# Start of the next comment, string or char literal. String prefixes are
+# any mix of '$' (interpolated, several for raw strings) and one '@' (verbatim).
+_CSHARP_TOKEN_RE = re.compile(r"""//|/\*|'|(?:\$+@?|@\$+|@)?\"""")
+# Inside an interpolation hole: braces and the tokens that may contain them
+_CSHARP_HOLE_RE = re.compile(r"""[{}]|//|/\*|'|(?:\$+@?|@\$+|@)?\"""")
+_CHAR_RE = re.compile(r"'(?:\\[^'\n]+|[^'\\\n])'")
+
+
+def _token_end(content, match):
+    """Return the end of the comment or literal starting with match, or None."""
+    start = match.start()
+    token = match.group()
+    if token == '//':
+        end = content.find('\n', start)
+        return len(content) if end == -1 else end
+    if token == '/*':
+        end = content.find('*/', start + 2)
+        return len(content) if end == -1 else end + 2
+    if token == "'":
+        char = _CHAR_RE.match(content, start)
+        return char.end() if char else None
+    return _string_end(content, start, match.end() - 1)
+
+
+def _string_end(content, start, quote):
+    """Return the end of the string literal whose prefix starts at start and opening quote is at quote."""
+    prefix = content[start:quote]
+    length = len(content)
+    if content.startswith('"""', quote):
+        # Raw string: closed by as many quotes as opened it
+        count = quote
+        while count < length and content[count] == '"':
+            count += 1
+        delimiter = content[quote:count]
+        end = content.find(delimiter, count)
+        return length if end == -1 else end + len(delimiter)
+
+    verbatim = '@' in prefix
+    interpolated = '$' in prefix
+    i = quote + 1
+    while i < length:
+        c = content[i]
+        if c == '"':
+            if verbatim and content.startswith('""', i):
+                i += 2
+                continue
+            return i + 1
+        if c == '\\' and not verbatim:
+            i += 2
+        elif c == '\n' and not verbatim:
+            # Unterminated: stop at the end of the line like the compiler does
+            return i
+        elif c == '{' and interpolated:
+            i = i + 2 if content.startswith('{{', i) else _hole_end(content, i + 1)
+        else:
+            i += 1
+    return length
+
+
+def _hole_end(content, pos):
+    """Return the position after the '}' closing the interpolation hole that starts at pos."""
+    depth = 1
+    while True:
+        match = _CSHARP_HOLE_RE.search(content, pos)
+        if not match:
+            return len(content)
+        token = match.group()
+        if token == '{':
+            depth += 1
+            pos = match.end()
+        elif token == '}':
+            depth -= 1
+            pos = match.end()
+            if depth == 0:
+                return pos
+        else:
+            end = _token_end(content, match)
+            pos = match.end() if end is None else end
+
+
+def csharp_ranges(content):
+    r"""
+    Lex a C# source once and return its comments and its string and char literals.
+
+    Args:
+        content (str): Source text
+
+    Returns:
+        tuple: (comments, literals) as RangeIndex
+
+    >>> source = '// Don\'t "quote"\nvar p = @"C:\\data\\"; // x\nvar q = \'"\';'
+    >>> comments, literals = csharp_ranges(source)
+    >>> [source[s:e] for s, e in zip(comments.starts, comments.ends)]
+    ['// Don\'t "quote"', '// x']
+    >>> [source[s:e] for s, e in zip(literals.starts, literals.ends)]
+    ['@"C:\\data\\"', '\'"\'']
+    >>> source = 'var s = $"{(a ? "}" : "{")}x"; var r = ' + '"' * 3 + 'a "" b' + '"' * 3 + ';'
+    >>> _, literals = csharp_ranges(source)
+    >>> interpolated, raw = [source[s:e] for s, e in zip(literals.starts, literals.ends)]
+    >>> interpolated, raw[3:-3]
+    ('$"{(a ? "}" : "{")}x"', 'a "" b')
+    """
+    comments = []
+    literals = []
+    pos = 0
+    while True:
+        match = _CSHARP_TOKEN_RE.search(content, pos)
+        if not match:
+            break
+        end = _token_end(content, match)
+        if end is None:
+            # A lone apostrophe is not a literal; keep lexing after it
+            pos = match.end()
+            continue
+        (comments if match.group() in ('//', '/*') else literals).append((match.start(), end))
+        pos = end
+    return RangeIndex(comments), RangeIndex(literals)
+
+
+class RangeIndex:
+    """Sorted, merged set of half-open [start, end) intervals."""
+
+    def __init__(self, ranges=()):
+        """
+        Args:
+            ranges (iterable): (start, end) tuples; they may overlap or be unsorted
+        """
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(ranges):
+            if end <= start:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __contains__(self, pos):
+        """Return True if pos lies inside one of the intervals."""
+        i = bisect_right(self.starts, pos) - 1
+        return i >= 0 and pos < self.ends[i]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def blank(self, text):
+        """Return text with every interval replaced by spaces (same length, same offsets)."""
+        parts = []
+        pos = 0
+        for start, end in zip(self.starts, self.ends):
+            parts.extend((text[pos:start], ' ' * (end - start)))
+            pos = end
+        parts.append(text[pos:])
+        return ''.join(parts)
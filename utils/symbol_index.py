@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Shared symbol index for the documentation extractors.
+
+The TypeScript, Python and C# extractors write every documented symbol
+(name, kind, file, line, docstring and parameters) into one SQLite database.
+Exact lookups by name or qualified name use B-tree indexes; full-text search
+over names, docstrings and parameters uses an FTS5 table (with a LIKE
+fallback when SQLite was built without FTS5). Both answer in milliseconds on
+hundreds of thousands of symbols.
+
+Rows are grouped per source file, so incremental extractor runs only replace
+the files they re-parsed and drop the files that disappeared.
+"""
+
+import os
+import re
+import sqlite3
+from collections import namedtuple
+
+# One documented symbol of a source file
+#   name:      plain name (e.g. 'save')
+#   qualname:  qualified name where known (e.g. 'FooService.save')
+#   kind:      'MODULE', 'CLASS', 'FUNCTION', 'METHOD', 'INTERFACE', ...
+#   line:      1-based line of the documentation or declaration
+#   docstring: documentation text
+#   params:    parameter lines ("name (type): description"), newline separated
+Symbol = namedtuple('Symbol', ['name', 'qualname', 'kind', 'line', 'docstring', 'params'])
+
+# Result row of lookup() / search()
+SymbolMatch = namedtuple('SymbolMatch', ['language', 'root', 'file', 'name', 'qualname', 'kind', 'line', 'docstring', 'params'])
+
+_JSDOC_PARAM_RE = re.compile(r'^\s*@param\s+(?:\{([^}]+)\}\s+)?(\S+)(?:\s*-?\s*(.*))?$', re.MULTILINE)
+_XML_PARAM_RE = re.compile(r'<param\s+name\s*=\s*"([^"]+)"\s*>(.*?)</param>', re.DOTALL)
+_ARGS_HEADER_RE = re.compile(r'^\s*(?:Args|Arguments|Parameters|Params):\s*$')
+_ARG_LINE_RE = re.compile(r'^\s*(\*{0,2}[A-Za-z_]\w*)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    language TEXT NOT NULL,
+    root TEXT NOT NULL,
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER,
+    docstring TEXT,
+    params TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS symbols_qualname ON symbols(qualname);
+CREATE INDEX IF NOT EXISTS symbols_file ON symbols(language, root, file);
+CREATE TABLE IF NOT EXISTS files (
+    language TEXT NOT NULL,
+    root TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (language, root, file)
+) WITHOUT ROWID;
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5(
+    qualname, docstring, params, content='symbols', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS symbols_ai AFTER INSERT ON symbols BEGIN
+    INSERT INTO symbols_fts(rowid, qualname, docstring, params)
+    VALUES (new.id, new.qualname, new.docstring, new.params);
+END;
+CREATE TRIGGER IF NOT EXISTS symbols_ad AFTER DELETE ON symbols BEGIN
+    INSERT INTO symbols_fts(symbols_fts, rowid, qualname, docstring, params)
+    VALUES ('delete', old.id, old.qualname, old.docstring, old.params);
+END;
+"""
+
+_COLUMNS = "language, root, file, name, qualname, kind, line, docstring, params"
+
+# File name of the index inside the extractors' output folder
+DEFAULT_INDEX_NAME = 'symbols.db'
+
+
+def extract_params(docstring):
+    """
+    Collect the documented parameters of a docstring.
+
+    Understands JSDoc `@param {type} name - description`, C# XML
+    `<param name="x">description</param>` and Google-style Python
+    `Args:` sections.
+
+    Args:
+        docstring (str): Documentation text
+
+    Returns:
+        str: One "name (type): description" line per parameter ('' if none)
+    """
+    params = []
+    if '@param' in docstring:
+        for param_type, name, description in _JSDOC_PARAM_RE.findall(docstring):
+            params.append((name, param_type, description))
+    if '<param' in docstring:
+        for name, description in _XML_PARAM_RE.findall(docstring):
+            params.append((name, '', ' '.join(description.split())))
+    if ':' in docstring and not params:
+        in_args = False
+        indent = None
+        for line in docstring.split('\n'):
+            if _ARGS_HEADER_RE.match(line):
+                in_args = True
+                indent = None
+                continue
+            if not in_args:
+                continue
+            if not line.strip():
+                continue
+            line_indent = len(line) - len(line.lstrip())
+            if indent is None:
+                indent = line_indent
+            if line_indent < indent:
+                in_args = False
+                continue
+            if line_indent > indent:
+                continue
+            match = _ARG_LINE_RE.match(line)
+            if not match:
+                in_args = False
+                continue
+            params.append(match.groups())
+    lines = []
+    for name, param_type, description in params:
+        label = f"{name} ({param_type})" if param_type else name
+        lines.append(f"{label}: {description}" if description else label)
+    return '\n'.join(lines)
+
+
+def make_symbol(kind, name, line, docstring, qualname=None):
+    """
+    Build a Symbol, extracting its parameters from the docstring.
+
+    Args:
+        kind (str): Symbol kind (e.g. 'FUNCTION')
+        name (str): Plain name
+        line (int): 1-based line number (or None)
+        docstring (str): Documentation text
+        qualname (str): Qualified name (defaults to name)
+
+    Returns:
+        Symbol: The symbol
+    """
+    return Symbol(name, qualname or name, kind, line, docstring, extract_params(docstring))
+
+
+def records_to_symbols(records, module_name):
+    """
+    Convert extractor records into symbols.
+
+    Args:
+        records (list): DocRecord objects (utils/doc_records.py). COMMENT
+                        records (not attached to a declaration) are left out.
+        module_name (str): Name used for the MODULE record (the file stem)
+
+    Returns:
+        list: Symbol objects
+    """
+    symbols = []
+    for record in records:
+        if record.kind == 'COMMENT':
+            continue
+        if record.kind == 'MODULE':
+            symbols.append(make_symbol(record.kind, module_name, record.line, record.doc))
+        else:
+            symbols.append(make_symbol(record.kind, record.name, record.line, record.doc, record.qualname))
+    return symbols
+
+
+class SymbolIndex:
+    """SQLite symbol database shared by the documentation extractors."""
+
+    def __init__(self, db_path):
+        """
+        Open (and create if needed) the index.
+
+        Args:
+            db_path (str): Path of the SQLite database file
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        try:
+            self.conn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+
+    def files(self, language, root):
+        """
+        Return the files of a project recorded in the index (including files
+        without documented symbols).
+
+        Args:
+            language (str): Extractor language ('ts', 'py', 'cs')
+            root (str): Absolute path of the scanned project
+
+        Returns:
+            set: Relative file paths
+        """
+        rows = self.conn.execute(
+            "SELECT file FROM files WHERE language = ? AND root = ?", (language, root)
+        )
+        return {file for (file,) in rows}
+
+    def replace_file(self, language, root, file, symbols):
+        """
+        Replace the symbols of one source file.
+
+        Args:
+            language (str): Extractor language ('ts', 'py', 'cs')
+            root (str): Absolute path of the scanned project
+            file (str): File path relative to root
+            symbols (list): Symbol objects of the file
+        """
+        self.conn.execute(
+            "DELETE FROM symbols WHERE language = ? AND root = ? AND file = ?", (language, root, file)
+        )
+        if symbols:
+            self.conn.executemany(
+                f"INSERT INTO symbols ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(language, root, file, s.name, s.qualname, s.kind, s.line, s.docstring, s.params)
+                 for s in symbols],
+            )
+        self.conn.execute(
+            "INSERT OR IGNORE INTO files (language, root, file) VALUES (?, ?, ?)", (language, root, file)
+        )
+
+    def remove_file(self, language, root, file):
+        """Remove a source file and its symbols from the index."""
+        self.conn.execute(
+            "DELETE FROM symbols WHERE language = ? AND root = ? AND file = ?", (language, root, file)
+        )
+        self.conn.execute(
+            "DELETE FROM files WHERE language = ? AND root = ? AND file = ?", (language, root, file)
+        )
+
+    def prune(self, language, root, keep_files):
+        """
+        Delete the symbols of files that are no longer part of a project.
+
+        Args:
+            language (str): Extractor language
+            root (str): Absolute path of the scanned project
+            keep_files (set): Relative paths of the files still present
+
+        Returns:
+            int: Number of files removed from the index
+        """
+        stale = self.files(language, root) - set(keep_files)
+        for file in stale:
+            self.remove_file(language, root, file)
+        return len(stale)
+
+    def commit(self):
+        """Commit pending changes."""
+        self.conn.commit()
+
+    def close(self):
+        """Commit and close the database."""
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def lookup(self, name, kind=None, limit=50):
+        """
+        Find symbols by exact name or qualified name.
+
+        Args:
+            name (str): Name ('save') or qualified name ('FooService.save')
+            kind (str): Optional kind filter (e.g. 'CLASS')
+            limit (int): Maximum number of results
+
+        Returns:
+            list: SymbolMatch rows
+        """
+        query = (
+            f"SELECT {_COLUMNS} FROM symbols WHERE id IN ("
+            "SELECT id FROM symbols WHERE qualname = ? UNION SELECT id FROM symbols WHERE name = ?)"
+        )
+        params = [name, name]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind.upper())
+        query += " ORDER BY qualname = ? DESC, root, file, line LIMIT ?"
+        params.extend([name, limit])
+        return [SymbolMatch(*row) for row in self.conn.execute(query, params)]
+
+    def search(self, text, kind=None, limit=20):
+        """
+        Full-text search over names, docstrings and parameters.
+
+        Args:
+            text (str): Words to search for (FTS5 query syntax is accepted)
+            kind (str): Optional kind filter
+            limit (int): Maximum number of results
+
+        Returns:
+            list: SymbolMatch rows, best matches first
+        """
+        kind_filter = " AND s.kind = ?" if kind else ""
+        kind_params = [kind.upper()] if kind else []
+        if self.fts:
+            query = (
+                f"SELECT {', '.join('s.' + c.strip() for c in _COLUMNS.split(','))} "
+                "FROM symbols_fts JOIN symbols AS s ON s.id = symbols_fts.rowid "
+                f"WHERE symbols_fts MATCH ?{kind_filter} ORDER BY bm25(symbols_fts, 10.0, 1.0, 2.0) LIMIT ?"
+            )
+            try:
+                rows = self.conn.execute(query, [text] + kind_params + [limit]).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS syntax: search the words as plain terms
+                terms = ' '.join('"' + word.replace('"', '""') + '"' for word in text.split())
+                rows = self.conn.execute(query, [terms] + kind_params + [limit]).fetchall()
+            return [SymbolMatch(*row) for row in rows]
+
+        like = f"%{text}%"
+        query = (
+            f"SELECT {_COLUMNS} FROM symbols AS s "
+            f"WHERE (qualname LIKE ? OR docstring LIKE ? OR params LIKE ?){kind_filter} LIMIT ?"
+        )
+        return [SymbolMatch(*row) for row in self.conn.execute(query, [like, like, like] + kind_params + [limit])]